@@ -0,0 +1,198 @@
+# api.py
+# 🔌 API JSON somente leitura com os agregados do dashboard (sem Streamlit)
+#
+# Uso:
+#   python api.py                          # http://127.0.0.1:8502
+#   python api.py --host 0.0.0.0 --porta 9000
+#
+# Rotas:
+#   GET /atingimento?ano=2025&meses=Janeiro,Fevereiro&comerciais=Andressa,Rafael
+#   GET /atingimento?ano=2025&periodo=1º Semestre
+#   GET /dimensoes                         # anos, meses com dados, comerciais e períodos
+#   GET /saude                             # versão dos dados e estado dos caches
+#
+# Usa o mesmo cache compartilhado do dashboard (mesma carga, mesmas metas). Cada resposta
+# é guardada já serializada num LRU por (rota, versão dos dados, metas, filtros) e tem
+# ETag: com If-None-Match igual, a resposta é 304 sem corpo.
+
+import argparse
+import hashlib
+import json
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from cache_compartilhado import CacheCompartilhado
+from cubo import MESES
+from memo import CacheLRU, chave_filtros
+from metas import carregar_metas
+from nucleo import PERIODOS, atualizar_dados, calcular_atingimento, carregar_config_fontes
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8502
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+# ----------------------------
+# RESPOSTAS
+# ----------------------------
+def _lista(parametros, nome):
+    valores = [v.strip() for valor in parametros.get(nome, []) for v in valor.split(",")]
+    return [v for v in valores if v] or None
+
+
+def _json_nativo(valor):
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+def resposta_atingimento(cubo, metas, parametros):
+    anos = [int(a) for a in cubo.anos]
+    try:
+        ano = int(parametros["ano"][0]) if "ano" in parametros else anos[-1]
+    except ValueError:
+        raise ParametroInvalido(f"ano inválido: {parametros['ano'][0]!r}")
+
+    periodo = parametros.get("periodo", [None])[0]
+    if periodo is not None and periodo not in PERIODOS:
+        raise ParametroInvalido(f"período inválido: {periodo!r} (use {', '.join(PERIODOS)})")
+    meses = PERIODOS[periodo] if periodo else (_lista(parametros, "meses") or MESES)
+    invalidos = [m for m in meses if m not in MESES]
+    if invalidos:
+        raise ParametroInvalido(f"meses inválidos: {invalidos}")
+    comerciais = _lista(parametros, "comerciais")
+
+    tabela, totais = calcular_atingimento(cubo, metas, ano, meses, comerciais)
+    linhas = [{coluna: _json_nativo(valor) for coluna, valor in linha.items()}
+              for linha in tabela.rename(columns={"Comercial_Padronizado": "Comercial"}).to_dict("records")]
+    return {
+        "ano": ano,
+        "meses": sorted(meses, key=MESES.index),
+        "comerciais": comerciais,
+        "totais": totais,
+        "linhas": linhas,
+    }
+
+
+def resposta_dimensoes(cubo, metas, parametros):
+    return {
+        "anos": [int(a) for a in cubo.anos],
+        "meses_com_dados": cubo.meses_com_dados(),
+        "comerciais": sorted(set(map(str, cubo.comerciais)) | set(map(str, metas.comerciais))),
+        "periodos": PERIODOS,
+    }
+
+
+ROTAS = {
+    "/atingimento": resposta_atingimento,
+    "/dimensoes": resposta_dimensoes,
+}
+
+
+# ----------------------------
+# SERVIDOR
+# ----------------------------
+class ServicoAgregados:
+    """Dados do cache compartilhado + respostas serializadas num LRU com ETag."""
+
+    def __init__(self, fontes=None, cache=None, memo=None):
+        self.fontes = fontes or carregar_config_fontes()
+        self.cache = cache or CacheCompartilhado()
+        self.memo = memo or CacheLRU()
+
+    def atualizar(self):
+        return atualizar_dados(self.fontes)
+
+    def responder(self, caminho, parametros):
+        """(corpo JSON em bytes, ETag) da rota; a chave do LRU inclui versão dos dados e metas."""
+        df, cubo = self.cache.obter(self.atualizar)
+        metas = carregar_metas()
+        versao = df.attrs.get("versao_dados")
+        chave = chave_filtros(("api", caminho, tuple(sorted((k, tuple(v)) for k, v in parametros.items()))),
+                              versao, metas.assinatura)
+
+        def calcular():
+            dados = ROTAS[caminho](cubo, metas, parametros)
+            dados = {"versao_dados": versao, "buscado_em": df.attrs.get("buscado_em"),
+                     "assinatura_metas": metas.assinatura, **dados}
+            corpo = json.dumps(dados, ensure_ascii=False, allow_nan=False, default=str).encode("utf-8")
+            return corpo, f'"{hashlib.sha256(corpo).hexdigest()[:32]}"'
+
+        return self.memo.obter_ou_calcular(chave, calcular)
+
+    def saude(self):
+        return json.dumps({"cache_compartilhado": self.cache.estatisticas(), "memo": self.memo.estatisticas()},
+                          ensure_ascii=False, default=str).encode("utf-8")
+
+    def criar_servidor(self, host=HOST_PADRAO, porta=PORTA_PADRAO):
+        servico = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                caminho = url.path.rstrip("/") or "/"
+                if caminho == "/saude":
+                    return self._enviar(HTTPStatus.OK, servico.saude())
+                if caminho not in ROTAS:
+                    return self._erro(HTTPStatus.NOT_FOUND, f"rota desconhecida: {caminho}")
+                try:
+                    corpo, etag = servico.responder(caminho, parse_qs(url.query))
+                except ParametroInvalido as e:
+                    return self._erro(HTTPStatus.BAD_REQUEST, str(e))
+                except Exception as e:
+                    return self._erro(HTTPStatus.SERVICE_UNAVAILABLE, f"dados indisponíveis: {e}")
+                if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                    return self._enviar(HTTPStatus.NOT_MODIFIED, None, etag)
+                return self._enviar(HTTPStatus.OK, corpo, etag)
+
+            def _erro(self, status, mensagem):
+                self._enviar(status, json.dumps({"erro": mensagem}, ensure_ascii=False).encode("utf-8"))
+
+            def _enviar(self, status, corpo, etag=None):
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                    # Sempre revalida: a versão dos dados pode mudar a cada TTL
+                    self.send_header("Cache-Control", "no-cache")
+                if corpo is not None:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                if corpo is not None:
+                    self.wfile.write(corpo)
+
+            def log_message(self, formato, *args):
+                pass  # sem uma linha no stderr por requisição
+
+        return ThreadingHTTPServer((host, porta), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON com os agregados do dashboard")
+    parser.add_argument("--host", default=HOST_PADRAO)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    args = parser.parse_args(argv)
+
+    servico = ServicoAgregados()
+    # Renova os dados antes de vencerem, como no dashboard
+    servico.cache.iniciar_atualizador(servico.atualizar)
+    servidor = servico.criar_servidor(args.host, args.porta)
+    print(f"🔌 API em http://{args.host}:{args.porta} (rotas: {', '.join([*ROTAS, '/saude'])})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
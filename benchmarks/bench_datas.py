@@ -0,0 +1,68 @@
+# bench_datas.py
+# ⏱️ pd.to_datetime(dayfirst=True) + strftime('%B') vs. conversão por formatos conhecidos
+#
+# Uso: python benchmarks/bench_datas.py --linhas 1000000
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datas import adicionar_periodo, converter_datas  # noqa: E402
+
+MESES_TRAD = {
+    'January': 'Janeiro', 'February': 'Fevereiro', 'March': 'Março', 'April': 'Abril',
+    'May': 'Maio', 'June': 'Junho', 'July': 'Julho', 'August': 'Agosto',
+    'September': 'Setembro', 'October': 'Outubro', 'November': 'Novembro', 'December': 'Dezembro'
+}
+
+
+def gerar_coluna(n_linhas, fracao_iso, rng):
+    dias = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 1000, size=n_linhas), unit="D")
+    texto = pd.Series(dias.strftime("%d/%m/%Y"), dtype=object)
+    iso = rng.random(n_linhas) < fracao_iso
+    texto[iso] = dias[iso].strftime("%Y-%m-%d")
+    texto[rng.random(n_linhas) < 0.001] = "sem data"
+    return texto
+
+
+def caminho_original(serie):
+    datas = pd.to_datetime(serie, dayfirst=True, errors="coerce")
+    datas = datas.dropna()
+    mes = datas.dt.strftime("%B").map(MESES_TRAD)
+    return datas, mes
+
+
+def caminho_novo(serie):
+    datas, _ = converter_datas(serie)
+    df = adicionar_periodo(pd.DataFrame({"Data de Conclusão": datas[datas.notna()]}))
+    return df["Data de Conclusão"], df["Mês"]
+
+
+def medir(nome, funcao, serie):
+    inicio = time.perf_counter()
+    datas, mes = funcao(serie)
+    print(f"{nome:<32} {time.perf_counter() - inicio:8.3f} s | {len(datas):,} datas válidas | Mês: {mes.dtype}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da conversão de datas")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    for fracao_iso in (0.0, 0.3):
+        serie = gerar_coluna(args.linhas, fracao_iso, rng)
+        print(f"\n{args.linhas:,} linhas | {fracao_iso:.0%} no formato ISO | {serie.nunique():,} strings distintas")
+        medir("original (inferência + strftime)", caminho_original, serie)
+        medir("formatos conhecidos + únicos", caminho_novo, serie)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# bench_ingestao.py
+# 📥 Leitura completa (todas as colunas em objeto) × leitura enxuta × ingestão em blocos
+#
+# Uso:
+#   python benchmarks/bench_ingestao.py                          # 100k, 1M e 3M linhas
+#   python benchmarks/bench_ingestao.py --escalas 10000000 --bloco 500000
+#   python benchmarks/bench_ingestao.py --saida ingestao.json
+#
+# O pico de memória da ingestão em blocos deve ficar praticamente constante entre as escalas.
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nucleo import TAMANHO_BLOCO, montar_cubo, processar_csv, processar_dados, processar_em_blocos  # noqa: E402
+from sintetico import gerar_csv  # noqa: E402
+
+
+def medir(funcao, *args):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao(*args)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"segundos": segundos, "pico_mb": pico / 2**20}
+
+
+def completa(caminho):
+    # Caminho antigo: todas as colunas como objeto, frame inteiro em memória
+    return montar_cubo(processar_dados(pd.read_csv(caminho)))
+
+
+def enxuta(caminho):
+    with open(caminho, "rb") as f:
+        return montar_cubo(processar_csv(f.read()))
+
+
+def em_blocos(caminho, tamanho_bloco):
+    return processar_em_blocos(caminho, tamanho_bloco)
+
+
+def rodar(n_linhas, tamanho_bloco, diretorio):
+    caminho = os.path.join(diretorio, f"planilha_{n_linhas}.csv")
+    with open(caminho, "wb") as f:
+        f.write(gerar_csv(n_linhas, seed=n_linhas))
+    modos = {
+        "completa": medir(completa, caminho),
+        "enxuta": medir(enxuta, caminho),
+        "em_blocos": medir(em_blocos, caminho, tamanho_bloco),
+    }
+    return {"linhas": n_linhas, "csv_mb": os.path.getsize(caminho) / 2**20, "modos": modos}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos modos de ingestão do CSV")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco")
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    execucoes = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        for n_linhas in args.escalas:
+            execucao = rodar(n_linhas, args.bloco, diretorio)
+            execucoes.append(execucao)
+            print(f"\n{n_linhas:,} linhas (CSV {execucao['csv_mb']:.1f} MB, blocos de {args.bloco:,})")
+            print(f"  {'modo':<12} {'tempo':>10} {'pico mem.':>12}")
+            for modo, r in execucao["modos"].items():
+                print(f"  {modo:<12} {r['segundos'] * 1000:8.1f} ms {r['pico_mb']:9.1f} MB")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump({"gerado_em": time.time(), "bloco": args.bloco, "execucoes": execucoes}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench_normalizacao.py
+# ⏱️ Laço original de str.contains vs. resolvedor vetorizado de aliases (o mesmo do dashboard)
+#
+# Uso: python benchmarks/bench_normalizacao.py --linhas 1000000 --aliases 300
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalizacao import resolver_nomes  # noqa: E402
+
+CANONICOS = ["Werbet", "Pamela", "Ana Clara", "Danilo", "Natalie", "Andressa", "Rafael", "Thaís"]
+SOBRENOMES = ["Alencar", "Souza", "Neder", "Lopes", "Miguel", "Mendonca", "Cristina", "Silva", "Costa", "Lima"]
+
+
+def gerar_mapeamento(n_aliases, rng):
+    mapeamento = {nome: nome for nome in CANONICOS}
+    while len(mapeamento) < n_aliases:
+        nome = CANONICOS[rng.integers(len(CANONICOS))]
+        sobrenome = SOBRENOMES[rng.integers(len(SOBRENOMES))]
+        mapeamento[f"{nome} {sobrenome} {len(mapeamento)}"] = nome
+    return mapeamento
+
+
+def gerar_coluna(n_linhas, mapeamento, rng):
+    # Aliases com ruído de caixa/sufixo + alguns nomes desconhecidos e nulos
+    aliases = list(mapeamento.keys())
+    base = [a for a in aliases] + [a.upper() for a in aliases[:50]] + [f"{a} - Squad" for a in aliases[:50]]
+    base += ["Fulano", "Ciclano", "Beltrano"]
+    valores = np.array(base, dtype=object)[rng.integers(len(base), size=n_linhas)]
+    valores[rng.random(n_linhas) < 0.001] = np.nan
+    return pd.Series(valores, name="Comercial/Capitão")
+
+
+def laco_original(serie, mapeamento):
+    resultado = serie.astype(str)
+    for nome_ori, nome_pad in mapeamento.items():
+        resultado.loc[serie.str.contains(nome_ori, case=False, na=False)] = nome_pad
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da padronização de nomes")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--aliases", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sem-original", action="store_true", help="não roda o laço original (lento)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    mapeamento = gerar_mapeamento(args.aliases, rng)
+    serie = gerar_coluna(args.linhas, mapeamento, rng)
+    print(f"{args.linhas:,} linhas | {len(mapeamento)} aliases | {serie.nunique():,} valores distintos")
+
+    inicio = time.perf_counter()
+    novo, por_metodo, aproximados = resolver_nomes(serie, mapeamento)
+    t_novo = time.perf_counter() - inicio
+    print(f"resolvedor vetorizado: {t_novo:8.3f} s  {por_metodo}")
+
+    if not args.sem_original:
+        inicio = time.perf_counter()
+        original = laco_original(serie, mapeamento)
+        t_original = time.perf_counter() - inicio
+        print(f"laço str.contains:     {t_original:8.3f} s")
+        print(f"speedup:               {t_original / t_novo:8.1f}x")
+        # O laço não tem distância de edição: nomes aproximados ficam de fora da comparação
+        iguais = ~serie.isin(list(aproximados))
+        assert original[iguais].equals(novo[iguais]), "resultados divergentes!"
+        print(f"resultados idênticos ✅ ({len(aproximados)} nome(s) aproximado(s) fora da comparação)")
+
+
+if __name__ == "__main__":
+    main()
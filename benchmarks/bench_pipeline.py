@@ -0,0 +1,81 @@
+# bench_pipeline.py
+# ⏱️ Tempo e pico de memória por etapa do pipeline, em várias escalas de planilha sintética
+#
+# Uso:
+#   python benchmarks/bench_pipeline.py                          # 10k, 100k e 1M linhas
+#   python benchmarks/bench_pipeline.py --escalas 10000000       # 10M linhas
+#   python benchmarks/bench_pipeline.py --saida bench.json       # salva para comparar com execuções anteriores
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cubo import MESES  # noqa: E402
+from metas import carregar_metas  # noqa: E402
+from nucleo import PERIODOS, calcular_atingimento, etapa_datas, etapa_nomes, mapear_colunas, montar_cubo  # noqa: E402
+from sintetico import gerar_csv  # noqa: E402
+
+PERIODOS = {**PERIODOS, **{mes: [mes] for mes in MESES}}
+
+
+def medir(resultados, etapa, funcao, *args):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    valor = funcao(*args)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultados.append({"etapa": etapa, "segundos": segundos, "pico_mb": pico / 2**20})
+    return valor
+
+
+def atingimento_todos_periodos(cubo, metas):
+    return [calcular_atingimento(cubo, metas, ano, meses) for ano in cubo.anos for meses in PERIODOS.values()]
+
+
+def rodar(n_linhas, metas):
+    conteudo = gerar_csv(n_linhas, seed=n_linhas)
+    resultados = []
+    avisos = []
+    df = medir(resultados, "leitura_csv", lambda: pd.read_csv(io.BytesIO(conteudo)))
+    df = medir(resultados, "colunas", mapear_colunas, df, avisos)
+    df = medir(resultados, "datas", etapa_datas, df, avisos)
+    df = medir(resultados, "nomes", etapa_nomes, df)
+    cubo = medir(resultados, "cubo", montar_cubo, df)
+    medir(resultados, "atingimento", atingimento_todos_periodos, cubo, metas)
+    return {"linhas": n_linhas, "linhas_validas": len(df), "csv_mb": len(conteudo) / 2**20, "etapas": resultados}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline por etapa")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    metas = carregar_metas()
+    execucoes = []
+    for n_linhas in args.escalas:
+        execucao = rodar(n_linhas, metas)
+        execucoes.append(execucao)
+        print(f"\n{n_linhas:,} linhas ({execucao['linhas_validas']:,} válidas, CSV {execucao['csv_mb']:.1f} MB)")
+        print(f"  {'etapa':<14} {'tempo':>10} {'pico mem.':>12}")
+        for r in execucao["etapas"]:
+            print(f"  {r['etapa']:<14} {r['segundos'] * 1000:8.1f} ms {r['pico_mb']:9.1f} MB")
+        total = sum(r["segundos"] for r in execucao["etapas"])
+        print(f"  {'total':<14} {total * 1000:8.1f} ms")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump({"gerado_em": time.time(), "execucoes": execucoes}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# carga_sessoes.py
+# 👥 Teste de carga: várias sessões simultâneas fazendo reruns da aba Performance Mensal
+#
+# Uso:
+#   python benchmarks/carga_sessoes.py                                   # 20 sessões, 10 reruns cada, 1 worker
+#   python benchmarks/carga_sessoes.py --sessoes 100 --reruns 20 --workers 2 --linhas 500000
+#   python benchmarks/carga_sessoes.py --saida carga.json
+#
+# Sobe um servidor local no lugar de SHEET_URL (CSV sintético com ETag), inicia os workers
+# com `streamlit run` em modo headless e conecta as sessões pelo mesmo websocket que o
+# navegador usa. Cada rerun envia ano, meses e comerciais sorteados; a latência vai do
+# envio até o `script_finished` do servidor. Reruns em que o app exibiu uma exceção, um
+# st.error ou caiu nos dados de exemplo contam como falha (relatadas à parte) e ficam fora
+# dos percentis. CPU e RSS de cada worker vêm de /proc.
+# (O Streamlit 1.27 ainda não tem o AppTest; este é o caminho que exercita o app real.)
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from sintetico import gerar_csv  # noqa: E402
+
+SCRIPT = os.path.join(RAIZ, "cards concluidos 5.py")
+ROTULO_ANO = "**Selecione o Ano:**"
+ROTULO_MESES = "**Selecione os Meses:**"
+ROTULO_COMERCIAIS = "**Filtrar Comerciais:**"
+# Rodapé de quando load_data caiu nos dados de exemplo (nem sempre há st.error antes)
+MARCA_DADOS_EXEMPLO = "Última atualização: dados de exemplo"
+_MB = 2**20
+
+
+# ----------------------------
+# PLANILHA LOCAL (no lugar de SHEET_URL)
+# ----------------------------
+def servir_planilha(conteudo):
+    """CSV fixo com ETag, em thread daemon; retorna (servidor, url)."""
+    etag = f'"{hash(conteudo) & 0xFFFFFFFF:x}"'
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+            self.send_header("Content-Length", str(len(conteudo)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(conteudo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}/planilha.csv"
+
+
+# ----------------------------
+# WORKERS (streamlit run)
+# ----------------------------
+def porta_livre():
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def iniciar_worker(url_planilha, diretorio_cache):
+    porta = porta_livre()
+    ambiente = {**os.environ, "DASHBOARD_SHEET_URL": url_planilha, "DASHBOARD_CACHE_DIR": diretorio_cache,
+                "DASHBOARD_FONTES": os.path.join(diretorio_cache, "sem_fontes.json")}
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", SCRIPT, "--server.headless", "true",
+         "--server.port", str(porta), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1):
+                return processo, porta
+        except OSError:
+            time.sleep(0.2)
+    processo.kill()
+    raise RuntimeError("o worker do Streamlit não respondeu em 60 s")
+
+
+def cpu_segundos(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        campos = f.read().rsplit(")", 1)[1].split()
+    return (int(campos[11]) + int(campos[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rss(pid):
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class Amostrador(threading.Thread):
+    """RSS de cada worker a cada `intervalo` segundos (pico e último valor)."""
+
+    def __init__(self, pids, intervalo=0.25):
+        super().__init__(daemon=True)
+        self.pids = pids
+        self.intervalo = intervalo
+        self.pico = {pid: 0 for pid in pids}
+        self.ultimo = dict(self.pico)
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            for pid in self.pids:
+                try:
+                    self.ultimo[pid] = rss(pid)
+                except OSError:
+                    continue
+                self.pico[pid] = max(self.pico[pid], self.ultimo[pid])
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+
+# ----------------------------
+# SESSÃO SIMULADA
+# ----------------------------
+class Sessao:
+    """Uma aba de navegador: websocket + estado dos widgets da aba mensal."""
+
+    def __init__(self, porta, sorteio):
+        self.porta = porta
+        self.sorteio = sorteio
+        self.widgets = {}   # rótulo -> proto do widget (primeira ocorrência)
+        self.ws = None
+
+    async def conectar(self):
+        self.ws = await websocket_connect(f"ws://127.0.0.1:{self.porta}/_stcore/stream")
+
+    async def rerun(self, estados=()):
+        """
+        Envia um rerun e espera o script terminar; retorna (segundos até o `script_finished`,
+        falha ou None). A falha é ("erro", mensagem) para exceção exibida pelo app ou
+        ("alerta", mensagem) para st.error / dados de exemplo no lugar da planilha.
+        """
+        mensagem = BackMsg()
+        mensagem.rerun_script.query_string = ""
+        mensagem.rerun_script.widget_states.widgets.extend(estados)
+        erro = alerta = None
+        inicio = time.perf_counter()
+        await self.ws.write_message(mensagem.SerializeToString(), binary=True)
+        while True:
+            bruto = await self.ws.read_message()
+            if bruto is None:
+                raise ConnectionError("websocket fechado pelo worker")
+            resposta = ForwardMsg()
+            resposta.ParseFromString(bruto)
+            tipo = resposta.WhichOneof("type")
+            if tipo == "delta" and resposta.delta.WhichOneof("type") == "new_element":
+                elemento = resposta.delta.new_element
+                widget = elemento.WhichOneof("type")
+                if widget == "exception" and erro is None:
+                    erro = f"{elemento.exception.type}: {elemento.exception.message}"
+                elif widget == "alert" and elemento.alert.format == Alert.ERROR and alerta is None:
+                    alerta = elemento.alert.body
+                elif widget == "markdown" and MARCA_DADOS_EXEMPLO in elemento.markdown.body and alerta is None:
+                    alerta = "dados de exemplo no lugar da planilha"
+                elif widget in ("selectbox", "multiselect"):
+                    proto = getattr(elemento, widget)
+                    self.widgets.setdefault(proto.label, proto)
+            elif tipo == "script_finished":
+                segundos = time.perf_counter() - inicio
+                if erro is not None:
+                    return segundos, ("erro", erro)
+                return segundos, ("alerta", alerta) if alerta is not None else None
+
+    def sortear_filtros(self):
+        """WidgetStates com ano, meses e comerciais sorteados entre as opções da aba mensal."""
+        estados = []
+        ano = self.widgets.get(ROTULO_ANO)
+        if ano is not None and ano.options:
+            estado = estado_widget(ano.id)
+            estado.int_value = self.sorteio.randrange(len(ano.options))
+            estados.append(estado)
+        for rotulo in (ROTULO_MESES, ROTULO_COMERCIAIS):
+            widget = self.widgets.get(rotulo)
+            if widget is not None and widget.options:
+                estado = estado_widget(widget.id)
+                quantidade = self.sorteio.randint(1, len(widget.options))
+                estado.int_array_value.data.extend(sorted(self.sorteio.sample(range(len(widget.options)), quantidade)))
+                estados.append(estado)
+        return estados
+
+    def fechar(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+def estado_widget(widget_id):
+    estado = WidgetState()
+    estado.id = widget_id
+    return estado
+
+
+async def rodar_sessao(porta, reruns, pausa, semente):
+    sorteio = random.Random(semente)
+    sessao = Sessao(porta, sorteio)
+    await sessao.conectar()
+    try:
+        falhas = {"erro": [], "alerta": []}
+        primeira, falha = await sessao.rerun()
+        if falha is not None:   # primeira carga com falha: fora dos percentis
+            primeira = None
+            falhas[falha[0]].append(falha[1])
+        latencias = []
+        for _ in range(reruns):
+            await asyncio.sleep(sorteio.uniform(0, 2 * pausa))   # tempo de "leitura" do usuário
+            segundos, falha = await sessao.rerun(sessao.sortear_filtros())
+            if falha is None:
+                latencias.append(segundos)
+            else:
+                falhas[falha[0]].append(falha[1])
+        return {"porta": porta, "primeira": primeira, "latencias": latencias,
+                "erros": falhas["erro"], "alertas": falhas["alerta"]}
+    finally:
+        sessao.fechar()
+
+
+async def rodar_sessoes(portas, sessoes, reruns, pausa, semente):
+    tarefas = [rodar_sessao(portas[i % len(portas)], reruns, pausa, semente + i) for i in range(sessoes)]
+    return await asyncio.gather(*tarefas, return_exceptions=True)
+
+
+# ----------------------------
+# RELATÓRIO
+# ----------------------------
+def percentis(valores):
+    if not valores:
+        return {"n": 0}
+    ms = np.asarray(valores) * 1000
+    return {"n": len(ms), "p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)), "max_ms": float(ms.max())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga das reruns da aba Performance Mensal")
+    parser.add_argument("--sessoes", type=int, default=20, help="sessões simultâneas")
+    parser.add_argument("--reruns", type=int, default=10, help="reruns por sessão (após a primeira carga)")
+    parser.add_argument("--workers", type=int, default=1, help="processos `streamlit run`")
+    parser.add_argument("--linhas", type=int, default=100_000, help="linhas da planilha sintética")
+    parser.add_argument("--pausa", type=float, default=0.5, help="pausa média entre reruns de uma sessão (s)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    servidor, url = servir_planilha(gerar_csv(args.linhas, seed=args.semente))
+    workers = []
+    with tempfile.TemporaryDirectory() as diretorio_cache:
+        try:
+            for _ in range(args.workers):
+                workers.append(iniciar_worker(url, diretorio_cache))
+            # Aquece cada worker (primeira carga da planilha) antes de medir
+            asyncio.run(rodar_sessoes([porta for _, porta in workers], args.workers, 0, 0, args.semente))
+
+            pids = [processo.pid for processo, _ in workers]
+            cpu_inicio = {pid: cpu_segundos(pid) for pid in pids}
+            amostrador = Amostrador(pids)
+            amostrador.start()
+            inicio = time.perf_counter()
+            resultados = asyncio.run(rodar_sessoes([porta for _, porta in workers], args.sessoes, args.reruns,
+                                                   args.pausa, args.semente + 1))
+            duracao = time.perf_counter() - inicio
+            amostrador.parar()
+            cpu_fim = {pid: cpu_segundos(pid) for pid in pids}
+        finally:
+            for processo, _ in workers:
+                processo.terminate()
+                processo.wait(timeout=30)
+            servidor.shutdown()
+
+    falhas = [r for r in resultados if isinstance(r, BaseException)]
+    sessoes = [r for r in resultados if not isinstance(r, BaseException)]
+    por_worker = []
+    for processo, porta in workers:
+        pid = processo.pid
+        do_worker = [r for r in sessoes if r["porta"] == porta]
+        por_worker.append({
+            "porta": porta,
+            "sessoes": len(do_worker),
+            "reruns": percentis([x for r in do_worker for x in r["latencias"]]),
+            "reruns_com_erro": sum(len(r["erros"]) for r in do_worker),
+            "reruns_com_alerta": sum(len(r["alertas"]) for r in do_worker),
+            "cpu_segundos": cpu_fim[pid] - cpu_inicio[pid],
+            "cpu_medio": (cpu_fim[pid] - cpu_inicio[pid]) / duracao,
+            "rss_pico_mb": amostrador.pico[pid] / _MB,
+            "rss_final_mb": amostrador.ultimo[pid] / _MB,
+        })
+    erros = [erro for r in sessoes for erro in r["erros"]]
+    alertas = [alerta for r in sessoes for alerta in r["alertas"]]
+    relatorio = {
+        "gerado_em": time.time(),
+        "parametros": vars(args),
+        "duracao_s": duracao,
+        "falhas": [repr(f) for f in falhas],
+        "primeira_carga": percentis([r["primeira"] for r in sessoes if r["primeira"] is not None]),
+        "reruns": percentis([x for r in sessoes for x in r["latencias"]]),
+        "reruns_com_erro": len(erros),
+        "erros": {erro: erros.count(erro) for erro in dict.fromkeys(erros)},
+        "reruns_com_alerta": len(alertas),
+        "alertas": {alerta: alertas.count(alerta) for alerta in dict.fromkeys(alertas)},
+        "reruns_por_segundo": sum(len(r["latencias"]) for r in sessoes) / duracao,
+        "workers": por_worker,
+    }
+
+    r = relatorio["reruns"]
+    print(f"\n{args.sessoes} sessões × {args.reruns} reruns em {args.workers} worker(s), "
+          f"{args.linhas:,} linhas, {duracao:.1f} s ({relatorio['reruns_por_segundo']:.1f} reruns/s)")
+    if r["n"]:
+        print(f"  rerun: p50 {r['p50_ms']:.0f} ms · p95 {r['p95_ms']:.0f} ms · p99 {r['p99_ms']:.0f} ms · máx {r['max_ms']:.0f} ms")
+    for w in por_worker:
+        print(f"  worker :{w['porta']}  {w['sessoes']} sessões · CPU {w['cpu_medio']:.2f} núcleo(s) "
+              f"({w['cpu_segundos']:.1f} s) · RSS pico {w['rss_pico_mb']:.0f} MB, final {w['rss_final_mb']:.0f} MB")
+    if erros:
+        print(f"  ⚠ {len(erros)} rerun(s) terminaram com exceção no app (fora dos percentis): {erros[0]}")
+    if alertas:
+        print(f"  ⚠ {len(alertas)} rerun(s) exibiram erro ou dados de exemplo (fora dos percentis): {alertas[0]}")
+    if falhas:
+        print(f"  ⚠ {len(falhas)} sessão(ões) falharam: {falhas[0]!r}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
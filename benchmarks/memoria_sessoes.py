@@ -0,0 +1,117 @@
+# memoria_sessoes.py
+# 🧮 Memória por sessão: cópia desserializada por rerun (como o st.cache_data entregava) × frame compartilhado
+#
+# Uso:
+#   python benchmarks/memoria_sessoes.py                       # 1M linhas, 20 sessões
+#   python benchmarks/memoria_sessoes.py --linhas 3000000 --sessoes 50 --saida memoria.json
+#
+# Cada modo roda num processo novo e mede o RSS depois de carregar os dados e depois de
+# abrir as sessões:
+#   copia         frame completo (todas as colunas da planilha, texto em objeto) e uma
+#                 cópia via pickle por sessão, como o st.cache_data faz a cada leitura
+#   compartilhado frame compacto do cache compartilhado (Arrow em memory map), a mesma
+#                 referência para todas as sessões
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentacao import memoria_rss  # noqa: E402
+
+_MB = 2**20
+
+
+def medir_copia(caminho, sessoes):
+    from nucleo import processar_dados
+
+    df = processar_dados(pd.read_csv(caminho))
+    dados = pickle.dumps(df)
+    base = memoria_rss()
+    abertas = [pickle.loads(dados) for _ in range(sessoes)]
+    return base, memoria_rss(), abertas
+
+
+def medir_compartilhado(caminho, sessoes):
+    from cache_compartilhado import CacheCompartilhado
+    from nucleo import compactar_frame, montar_cubo, processar_csv
+
+    def atualizar():
+        with open(caminho, "rb") as f:
+            df = compactar_frame(processar_csv(f.read()))
+        return df, montar_cubo(df)
+
+    cache = CacheCompartilhado(os.path.join(os.path.dirname(caminho), "compartilhado"), ttl=3600)
+    cache.obter(atualizar)
+    cache._atual = None   # como outra réplica: lê do arquivo mapeado
+    cache.obter(atualizar)
+    base = memoria_rss()
+    abertas = [cache.obter(atualizar)[0] for _ in range(sessoes)]
+    return base, memoria_rss(), abertas
+
+
+MODOS = {"copia": medir_copia, "compartilhado": medir_compartilhado}
+
+
+def rodar_modo(modo, caminho, sessoes):
+    inicio = memoria_rss()
+    base, fim, abertas = MODOS[modo](caminho, sessoes)
+    frame = abertas[0]
+    print(json.dumps({
+        "modo": modo,
+        "frame_mb": frame.memory_usage(deep=True).sum() / _MB,
+        "colunas": len(frame.columns),
+        "dados_carregados_mb": (base - inicio) / _MB,
+        "por_sessao_mb": (fim - base) / _MB / sessoes,
+        "total_mb": (fim - inicio) / _MB,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por sessão: cópia por rerun × frame compartilhado")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--sessoes", type=int, default=20)
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    parser.add_argument("--modo", choices=list(MODOS), help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        rodar_modo(args.modo, args.csv, args.sessoes)
+        return
+
+    from sintetico import gerar_csv
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "planilha.csv")
+        with open(caminho, "wb") as f:
+            f.write(gerar_csv(args.linhas, seed=args.linhas))
+        for modo in MODOS:
+            saida = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--modo", modo, "--csv", caminho, "--sessoes", str(args.sessoes)],
+                check=True, capture_output=True, text=True, env={**os.environ, "DASHBOARD_CACHE_DIR": diretorio})
+            resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+
+    print(f"\n{args.linhas:,} linhas, {args.sessoes} sessões")
+    print(f"  {'modo':<14} {'frame':>10} {'colunas':>8} {'carga':>10} {'por sessão':>12} {'total':>10}")
+    for r in resultados:
+        print(f"  {r['modo']:<14} {r['frame_mb']:7.1f} MB {r['colunas']:>8} {r['dados_carregados_mb']:7.1f} MB "
+              f"{r['por_sessao_mb']:9.2f} MB {r['total_mb']:7.1f} MB")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump({"gerado_em": time.time(), "linhas": args.linhas, "sessoes": args.sessoes,
+                       "resultados": resultados}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
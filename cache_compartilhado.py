@@ -0,0 +1,304 @@
+# cache_compartilhado.py
+# 🔒 Cache em disco compartilhado entre processos (réplicas do Streamlit) com atualização única
+#
+# O frame processado (Arrow IPC sem compressão) e o cubo de contagens (npz) ficam num
+# diretório comum, com um manifest.json que carimba a versão. O frame é lido por memory map:
+# as colunas apontam para as páginas do arquivo (somente leitura, sem cópia), compartilhadas
+# pelo sistema operacional entre todas as réplicas. Quando a versão vence o TTL, só o processo
+# que conseguir a trava em arquivo atualiza; os demais continuam servindo a versão atual.
+# Com `iniciar_atualizador`, uma thread renova os dados um pouco antes de vencerem, e
+# nenhum rerun precisa esperar a busca.
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from cubo import CuboContagens
+from fonte_dados import DIRETORIO_CACHE
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DIRETORIO_COMPARTILHADO = os.environ.get("DASHBOARD_CACHE_COMPARTILHADO", os.path.join(DIRETORIO_CACHE, "compartilhado"))
+TTL_PADRAO = int(os.environ.get("DASHBOARD_TTL", "300"))
+ESPERA_MAXIMA = 120          # segundos esperando a trava quando ainda não existe nenhuma versão
+NOVA_TENTATIVA = 15          # segundos até tentar de novo quando a primeira carga falhou (sem versão)
+VERSOES_MANTIDAS = 3         # versões antigas ficam um pouco para leitores que ainda as estejam abrindo
+ANTECEDENCIA = int(os.environ.get("DASHBOARD_ANTECEDENCIA", "30"))   # segundos antes do TTL para renovar
+
+logger = logging.getLogger("dashboard.cache_compartilhado")
+
+
+# ----------------------------
+# TRAVA EM ARQUIVO
+# ----------------------------
+class TravaArquivo:
+    """Trava exclusiva entre processos (flock; msvcrt.locking no Windows)."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = None
+
+    def _tentar_travar(self):
+        if fcntl is not None:
+            fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            self._arquivo.seek(0)
+            msvcrt.locking(self._arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def adquirir(self, bloquear=False, espera_maxima=ESPERA_MAXIMA):
+        """True se conseguiu a trava; com `bloquear`, tenta até `espera_maxima` segundos."""
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        self._arquivo = open(self.caminho, "a+b")
+        limite = time.monotonic() + espera_maxima
+        while True:
+            try:
+                self._tentar_travar()
+                return True
+            except OSError:
+                if not bloquear or time.monotonic() >= limite:
+                    self._arquivo.close()
+                    self._arquivo = None
+                    return False
+                time.sleep(0.1)
+
+    def liberar(self):
+        if self._arquivo is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_UN)
+            else:
+                self._arquivo.seek(0)
+                msvcrt.locking(self._arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+# ----------------------------
+# FRAME EM ARROW
+# ----------------------------
+def gravar_frame(df, caminho):
+    tabela = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+    with pa.OSFile(caminho, "wb") as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+
+
+def ler_frame(caminho):
+    """
+    DataFrame sobre o arquivo mapeado em memória: números, datas e códigos das categorias
+    apontam para os buffers Arrow (arrays somente leitura); só os dicionários são copiados.
+    """
+    tabela = pa.ipc.open_file(pa.memory_map(caminho)).read_all()
+    return tabela.to_pandas(split_blocks=True)
+
+
+# ----------------------------
+# CACHE COMPARTILHADO
+# ----------------------------
+class CacheCompartilhado:
+    """
+    `obter(atualizar)` devolve (df, cubo) da versão atual. `atualizar()` só é chamado
+    quando a versão venceu e este processo ganhou a trava; se falhar, a versão atual
+    continua valendo (inclusive para quem tentou) e a próxima tentativa espera outro TTL.
+    Sem nenhuma versão ainda, a nova tentativa vem após NOVA_TENTATIVA segundos.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_COMPARTILHADO, ttl=TTL_PADRAO):
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self.caminho_manifest = os.path.join(diretorio, "manifest.json")
+        self.trava = os.path.join(diretorio, "atualizacao.lock")
+        self._atual = None   # (versão, df, cubo) já lidos neste processo
+        self._lock = threading.Lock()
+        self._atualizador = None
+        self.atualizando = False
+        self.atualizacoes = 0
+        self.leituras = 0
+
+    def manifest(self):
+        try:
+            with open(self.caminho_manifest, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def vencimento(self, manifest):
+        """Momento (epoch) em que a versão vence; 0 se não há versão."""
+        if manifest is None:
+            return 0
+        if manifest.get("versao") is None:
+            return manifest.get("tentativa_em", 0) + min(self.ttl, NOVA_TENTATIVA)
+        return max(manifest.get("atualizado_em", 0), manifest.get("tentativa_em", 0)) + self.ttl
+
+    def vencido(self, manifest, agora=None):
+        return (agora or time.time()) >= self.vencimento(manifest)
+
+    def obter(self, atualizar):
+        """
+        (df, cubo) da versão atual. A exceção de `atualizar` só sobe para o processo que
+        tentou, e só quando não há versão anterior para servir.
+        """
+        manifest = self.manifest()
+        if self.vencido(manifest):
+            trava = TravaArquivo(self.trava)
+            sem_versao = manifest is None or manifest.get("versao") is None
+            # Sem nenhuma versão ainda, espera quem estiver atualizando em vez de buscar junto
+            if trava.adquirir(bloquear=sem_versao):
+                try:
+                    manifest = self.manifest()   # outro processo pode ter acabado de atualizar
+                    if self.vencido(manifest):
+                        try:
+                            manifest = self._atualizar(atualizar, manifest)
+                        except Exception:
+                            if (manifest or {}).get("versao") is None:
+                                raise
+                            logger.exception("Falha ao atualizar os dados; servindo a versão %s", manifest["versao"])
+                finally:
+                    trava.liberar()
+            elif manifest is None:
+                raise TimeoutError(f"Nenhuma versão em {self.diretorio} e a trava não foi liberada")
+        if manifest.get("versao") is None:
+            raise RuntimeError(f"A última atualização dos dados falhou: {manifest.get('erro')}")
+        return self._ler(manifest)
+
+    def renovar(self, atualizar, antecedencia=0):
+        """
+        Atualiza se a versão vence em até `antecedencia` segundos, sem bloquear: False quando
+        outro processo está com a trava ou já renovou. Leitores seguem na versão atual até a troca.
+        """
+        trava = TravaArquivo(self.trava)
+        if not trava.adquirir():
+            return False
+        try:
+            manifest = self.manifest()
+            if not self.vencido(manifest, time.time() + antecedencia):
+                return False
+            self._atualizar(atualizar, manifest)
+            return True
+        finally:
+            trava.liberar()
+
+    def _atualizar(self, atualizar, manifest):
+        self.atualizando = True
+        try:
+            df, cubo = atualizar()
+        except Exception as e:
+            # Mantém a versão atual (se houver) e só tenta de novo depois de outro TTL (ou NOVA_TENTATIVA)
+            self._gravar_manifest(dict(manifest or {"versao": None}, tentativa_em=time.time(), erro=str(e)))
+            raise
+        finally:
+            self.atualizando = False
+
+        versao = ((manifest or {}).get("versao") or 0) + 1
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho_frame = os.path.join(self.diretorio, f"frame_{versao}.arrow")
+        caminho_cubo = os.path.join(self.diretorio, f"cubo_{versao}.npz")
+        tmp = f"{caminho_frame}.{os.getpid()}.tmp"
+        gravar_frame(df, tmp)
+        os.replace(tmp, caminho_frame)
+        tmp = f"{caminho_cubo}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, anos=cubo.anos, comerciais=cubo.comerciais.astype(str), contagens=cubo.contagens)
+        os.replace(tmp, caminho_cubo)
+
+        agora = time.time()
+        manifest = {
+            "versao": versao,
+            "versao_dados": df.attrs.get("versao_dados"),
+            "atualizado_em": agora,
+            "tentativa_em": agora,
+            "pid": os.getpid(),
+            "attrs": df.attrs,
+        }
+        self._gravar_manifest(manifest)   # por último: só aponta para arquivos completos
+        self._limpar_antigas(versao)
+        self.atualizacoes += 1
+        # Sem guardar o `df` recém-montado: a próxima leitura já usa o arquivo mapeado
+        return manifest
+
+    # ----------------------------
+    # ATUALIZAÇÃO EM SEGUNDO PLANO
+    # ----------------------------
+    def iniciar_atualizador(self, atualizar, antecedencia=ANTECEDENCIA):
+        """
+        Thread daemon que chama `renovar` pouco antes de cada vencimento (uma por instância);
+        vive enquanto o processo viver.
+        """
+        with self._lock:
+            if self._atualizador is not None and self._atualizador.is_alive():
+                return self._atualizador
+            antecedencia = min(antecedencia, self.ttl / 2)
+            self._atualizador = threading.Thread(
+                target=self._laco_atualizador, args=(atualizar, antecedencia), name="atualizador-dados", daemon=True)
+            self._atualizador.start()
+            return self._atualizador
+
+    def _laco_atualizador(self, atualizar, antecedencia):
+        while True:
+            espera = self.vencimento(self.manifest()) - antecedencia - time.time()
+            if espera > 0:
+                time.sleep(espera)
+                continue
+            try:
+                if not self.renovar(atualizar, antecedencia):
+                    time.sleep(1)   # outro processo está atualizando: confere o manifest de novo
+            except Exception:
+                # A falha já ficou no manifest (tentativa_em): a próxima tentativa é depois de outro TTL
+                # (ou de NOVA_TENTATIVA, se ainda não há versão)
+                logger.exception("Falha ao atualizar os dados em segundo plano")
+
+    def _gravar_manifest(self, manifest):
+        tmp = f"{self.caminho_manifest}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, default=str)
+        os.replace(tmp, self.caminho_manifest)
+
+    def _limpar_antigas(self, versao):
+        for caminho in glob.glob(os.path.join(self.diretorio, "frame_*.arrow")) + \
+                glob.glob(os.path.join(self.diretorio, "cubo_*.npz")):
+            numero = os.path.basename(caminho).split("_", 1)[1].split(".", 1)[0]
+            if numero.isdigit() and int(numero) <= versao - VERSOES_MANTIDAS:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+
+    def _ler(self, manifest):
+        versao = manifest["versao"]
+        with self._lock:
+            if self._atual is not None and self._atual[0] == versao:
+                return self._atual[1], self._atual[2]
+
+        df = ler_frame(os.path.join(self.diretorio, f"frame_{versao}.arrow"))
+        df.attrs.update(manifest.get("attrs", {}))
+        df.attrs["avisos"] = [tuple(aviso) for aviso in df.attrs.get("avisos", [])]
+        with np.load(os.path.join(self.diretorio, f"cubo_{versao}.npz"), allow_pickle=False) as arquivo:
+            cubo = CuboContagens(arquivo["anos"], arquivo["comerciais"].astype(object), arquivo["contagens"])
+        self.leituras += 1
+        with self._lock:
+            self._atual = (versao, df, cubo)
+        return df, cubo
+
+    def estatisticas(self):
+        manifest = self.manifest() or {}
+        return {
+            "versao": manifest.get("versao"),
+            "atualizado_em": manifest.get("atualizado_em"),
+            "atualizado_pelo_pid": manifest.get("pid"),
+            "vence_em": self.vencimento(manifest) if manifest else None,
+            "ultimo_erro": manifest.get("erro"),
+            "atualizando_neste_processo": self.atualizando,
+            "atualizador_ativo": self._atualizador is not None and self._atualizador.is_alive(),
+            "atualizacoes_neste_processo": self.atualizacoes,
+            "leituras_neste_processo": self.leituras,
+        }
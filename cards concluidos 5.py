@@ -1,27 +1,29 @@
 # dashboard_google_sheets_completo.py
 # 📊 Dashboard de Metas - Streamlit + Google Sheets
 
-import sys
-import subprocess
+# Dependências: pip install -r requirements.txt (nada é instalado em tempo de execução)
+# Plotly é importado só no primeiro gráfico; gspread, só por fontes do tipo "gspread" (fonte_gspread.py).
 
-# ----------------------------
-# Instalação automática de pacotes se não estiverem presentes
-# ----------------------------
-def install(package):
-    subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+from inicializacao import concluir_primeira_renderizacao, importar, marcar
+from instrumentacao import concluir_execucao, etapa, execucoes_recentes, iniciar_execucao, totais_por_etapa
 
-for pkg in ["streamlit==1.27.0", "pandas==2.1.1", "plotly==5.16.1", "gspread==5.11.0", "google-auth==2.27.0"]:
-    try:
-        __import__(pkg.split("==")[0])
-    except ImportError:
-        install(pkg)
+import os
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import gspread
-from google.oauth2.service_account import Credentials
+
+from cache_compartilhado import CacheCompartilhado
+from cubo import MESES
+from memo import CacheLRU, chave_filtros, restaurar_figura, serializar_figura
+from metas import carregar_metas
+from intervalos import ATALHOS, intervalo_do_atalho
+from nucleo import PERIODOS, PlanilhaInvalida, atualizar_dados, calcular_atingimento, calcular_atingimento_intervalo, carregar_config_fontes, compactar_frame, create_sample_data, montar_comparativo, montar_cubo, montar_indice_datas, montar_ritmo, projetar_atingimento, semanas_iso, totais_atingimento
+from relatorio_batch import carregar_relatorio, tabela_pre_calculada
+from ritmo import hoje
+from tabelas import TAMANHOS_PAGINA, estilos_atingimento, fatiar_pagina, numero_paginas, ordem_linhas
+
+marcar("imports")
+execucao = iniciar_execucao()  # cada rerun é uma execução; as etapas medidas ficam agrupadas nela
 
 # ----------------------------
 # CONFIGURAÇÃO DA PÁGINA
@@ -33,141 +35,86 @@ st.set_page_config(
 )
 
 # ----------------------------
-# CONFIGURAÇÃO GOOGLE SHEETS
-# ----------------------------
-SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSlQ9u5x09qR0dAKJsMC-fXTvJWRWPzMrXpaGaojOPblRrJYbx4Q-xalzh2hmf2WtwHRoLVIBOdL_HC/pub?output=csv"
-
-# ----------------------------
-# MAPEAMENTO DE NOMES (baseado na planilha)
+# CONFIGURAÇÃO GOOGLE SHEETS (SHEET_URL / fontes.json, ver nucleo.py)
 # ----------------------------
-NOME_MAPPING = {
-    'Werbet': 'Werbet', 'Werker Alencar': 'Werbet', 'Werbet Alencar': 'Werbet',
-    'Pamela': 'Pamela', 'Pamela Crédita': 'Pamela', 'Pamela Cri': 'Pamela', 'Pamela Cristina': 'Pamela',
-    'Ana Clara': 'Ana Clara', 'Ana Clara Souza': 'Ana Clara',
-    'Danilo': 'Danilo', 'Danilo Neder': 'Danilo',
-    'Natalie': 'Natalie', 'Natalie Lopes': 'Natalie',
-    'Andressa': 'Andressa',
-    'Rafael': 'Rafael', 'Rafael Miguel': 'Rafael',
-    'Thaís': 'Thaís', 'Thais Mendonca': 'Thaís', 'Thais': 'Thaís', 'Thaki': 'Thaís'
-}
+FONTES = carregar_config_fontes()
 
-# ----------------------------
-# METAS MENSAIS (baseado na estrutura da planilha)
-# ----------------------------
-META_MENSAL_POR_COMERCIAL = {
-    "Janeiro": { "Andressa": 22, "Rafael": 22, "Thaís": 22, "Ana Clara": 44, "Danilo": 44, "Pamela": 44, "Natalie": 44, "Werbet": 44 },
-    "Fevereiro": { "Andressa": 20, "Rafael": 20, "Thaís": 20, "Ana Clara": 40, "Danilo": 40, "Pamela": 40, "Natalie": 40, "Werbet": 40 },
-    "Março": { "Andressa": 21, "Rafael": 21, "Thaís": 21, "Ana Clara": 42, "Danilo": 42, "Pamela": 42, "Natalie": 42, "Werbet": 42 },
-    "Abril": { "Andressa": 22, "Rafael": 22, "Thaís": 22, "Ana Clara": 44, "Danilo": 44, "Pamela": 44, "Natalie": 44, "Werbet": 44 },
-    "Maio": { "Andressa": 22, "Rafael": 22, "Thaís": 22, "Ana Clara": 44, "Danilo": 44, "Pamela": 44, "Natalie": 44, "Werbet": 44 },
-    "Junho": { "Andressa": 21, "Rafael": 21, "Thaís": 21, "Ana Clara": 42, "Danilo": 42, "Pamela": 42, "Natalie": 42, "Werbet": 42 },
-    "Julho": { "Andressa": 23, "Rafael": 23, "Thaís": 23, "Ana Clara": 46, "Danilo": 46, "Pamela": 46, "Natalie": 46, "Werbet": 46 },
-    "Agosto": { "Andressa": 21, "Rafael": 21, "Thaís": 21, "Ana Clara": 42, "Danilo": 42, "Pamela": 42, "Natalie": 42, "Werbet": 42 },
-    "Setembro": { "Andressa": 22, "Rafael": 22, "Thaís": 22, "Ana Clara": 44, "Danilo": 44, "Pamela": 44, "Natalie": 44, "Werbet": 44 },
-    "Outubro": { "Andressa": 23, "Rafael": 23, "Thaís": 23, "Ana Clara": 46, "Danilo": 46, "Pamela": 46, "Natalie": 46, "Werbet": 46 },
-    "Novembro": { "Andressa": 21, "Rafael": 21, "Thaís": 21, "Ana Clara": 42, "Danilo": 42, "Pamela": 42, "Natalie": 42, "Werbet": 42 },
-    "Dezembro": { "Andressa": 22, "Rafael": 22, "Thaís": 22, "Ana Clara": 44, "Danilo": 44, "Pamela": 44, "Natalie": 44, "Werbet": 44 }
-}
+# Aba de diagnóstico escondida: ?admin=1 na URL ou DASHBOARD_ADMIN=1
+ADMIN = os.environ.get("DASHBOARD_ADMIN") == "1" or st.experimental_get_query_params().get("admin") == ["1"]
 
 # ----------------------------
-# FUNÇÃO DE META TOTAL
+# METAS MENSAIS (metas.json, por ano × mês × comercial)
 # ----------------------------
-def meta_mensal_total(nome, meses):
-    return sum(META_MENSAL_POR_COMERCIAL[m].get(nome, 0) for m in meses)
+metas = carregar_metas()
 
 # ----------------------------
 # CARREGAR DADOS DO GOOGLE SHEETS
 # ----------------------------
-@st.cache_data(ttl=300)  # Cache de 5 minutos
+@st.cache_resource
+def dados_compartilhados():
+    # Frame + cubo + versão ficam em disco, comuns a todas as réplicas; a cada 5 minutos
+    # (DASHBOARD_TTL) só o processo que pegar a trava busca de novo, os outros seguem servindo.
+    # A renovação roda numa thread pouco antes de vencer: nenhum rerun espera a busca
+    cache = CacheCompartilhado()
+    cache.iniciar_atualizador(atualizar_fontes)
+    return cache
+
+def atualizar_fontes():
+    # Mesma carga da API (nucleo.atualizar_dados): frame + cubo + avisos de status por fonte
+    return atualizar_dados(FONTES)
+
+def rotulo_fonte(fonte):
+    # CSV publicado vira link; planilha privada (gspread) aparece pelo nome e ID, sem link
+    if fonte.get("url"):
+        return f"[{fonte['nome']}]({fonte['url']})"
+    return f"{fonte['nome']} (planilha privada `{fonte.get('planilha')}`)"
+
+def momento(segundos):
+    return pd.Timestamp.fromtimestamp(segundos).strftime("%d/%m/%Y %H:%M") if segundos else "—"
+
 def load_data():
     try:
-        # Carregar dados diretamente do CSV público
-        df = pd.read_csv(SHEET_URL)
-        
-        if df.empty:
-            st.warning("⚠ A planilha está vazia ou não foi possível carregar os dados.")
-            return create_sample_data()
-        
-        # Verificar e mapear colunas baseado na estrutura da planilha
-        required_columns = ['Data de Conclusão', 'Comercial/Capitão']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            st.warning(f"⚠ Colunas faltantes na planilha: {missing_columns}")
-            st.info("Tentando identificar colunas similares...")
-            
-            # Tentar encontrar colunas similares
-            column_mapping = {}
-            for required in required_columns:
-                for actual in df.columns:
-                    if required.lower() in actual.lower() or actual.lower() in required.lower():
-                        column_mapping[required] = actual
-                        break
-            
-            if len(column_mapping) == len(required_columns):
-                df = df.rename(columns=column_mapping)
-                st.success("✅ Colunas mapeadas com sucesso!")
-            else:
-                st.error("❌ Não foi possível mapear todas as colunas necessárias.")
-                return create_sample_data()
-        
-        # Processar datas
-        df['Data de Conclusão'] = pd.to_datetime(df['Data de Conclusão'], dayfirst=True, errors='coerce')
-        df.dropna(subset=['Data de Conclusão'], inplace=True)
-        
-        if df.empty:
-            st.warning("⚠ Nenhuma data válida encontrada após processamento.")
-            return create_sample_data()
-        
-        # Extrair ano e mês
-        df['Ano'] = df['Data de Conclusão'].dt.year
-        df['Mês'] = df['Data de Conclusão'].dt.strftime('%B')
-        
-        # Traduzir meses para português
-        meses_trad = {
-            'January': 'Janeiro', 'February': 'Fevereiro', 'March': 'Março', 'April': 'Abril',
-            'May': 'Maio', 'June': 'Junho', 'July': 'Julho', 'August': 'Agosto',
-            'September': 'Setembro', 'October': 'Outubro', 'November': 'Novembro', 'December': 'Dezembro'
-        }
-        df['Mês'] = df['Mês'].map(meses_trad).fillna(df['Mês'])
+        df, cubo = dados_compartilhados().obter(atualizar_fontes)
 
-        # Padronizar nomes dos comerciais
-        df['Comercial_Padronizado'] = df['Comercial/Capitão'].astype(str)
-        for nome_ori, nome_pad in NOME_MAPPING.items():
-            df.loc[df['Comercial/Capitão'].str.contains(nome_ori, case=False, na=False), 'Comercial_Padronizado'] = nome_pad
-
-        # Filtrar apenas nomes válidos
-        nomes_validos = list(NOME_MAPPING.values())
-        df = df[df['Comercial_Padronizado'].isin(nomes_validos)]
-        
-        st.success(f"✅ Dados carregados com sucesso! {len(df)} registros encontrados.")
-        return df
+    except PlanilhaInvalida as e:
+        getattr(st, e.nivel)(str(e))
+        df = compactar_frame(create_sample_data())
+        return df, montar_cubo(df)
 
     except Exception as e:
         st.error(f"❌ Erro ao carregar dados da planilha: {str(e)}")
         st.info("📋 Usando dados de exemplo para demonstração.")
-        return create_sample_data()
-
-def create_sample_data():
-    """Criar dados de exemplo baseado na estrutura da planilha real"""
-    sample_data = {
-        'Data de Conclusão': pd.to_datetime([
-            '2025-01-15', '2025-01-20', '2025-02-10', '2025-02-25', '2025-03-05',
-            '2025-03-15', '2025-04-10', '2025-04-20', '2025-05-05', '2025-05-25'
-        ]),
-        'Comercial/Capitão': [
-            'Andressa', 'Rafael', 'Thaís', 'Ana Clara', 'Danilo',
-            'Pamela', 'Natalie', 'Werbet', 'Andressa', 'Rafael'
-        ]
-    }
-    df_exemplo = pd.DataFrame(sample_data)
-    df_exemplo['Ano'] = df_exemplo['Data de Conclusão'].dt.year
-    df_exemplo['Mês'] = df_exemplo['Data de Conclusão'].dt.strftime('%B').map({
-        'January':'Janeiro','February':'Fevereiro','March':'Março',
-        'April':'Abril','May':'Maio'
-    }).fillna('Janeiro')
-    df_exemplo['Comercial_Padronizado'] = df_exemplo['Comercial/Capitão']
-    return df_exemplo
+        df = compactar_frame(create_sample_data())
+        return df, montar_cubo(df)
+
+    for nivel, mensagem in df.attrs.get('avisos', []):
+        getattr(st, nivel)(mensagem)
+    return df, cubo
+
+@st.cache_resource
+def memo_visoes():
+    # Um LRU por processo, compartilhado por todas as sessões (tabelas + figuras em JSON)
+    return CacheLRU()
+
+@st.cache_resource(max_entries=2)
+def ritmo_diario(versao_dados, _df):
+    # Contagens diárias por comercial, uma vez por versão dos dados (o frame não entra no hash)
+    return montar_ritmo(_df)
+
+@st.cache_resource(max_entries=2)
+def indice_datas(versao_dados, _df):
+    # Datas ordenadas + códigos dos comerciais: qualquer intervalo vira uma busca binária
+    return montar_indice_datas(_df)
+
+@st.cache_resource(max_entries=2)
+def comparativo_mensal(versao_dados, assinatura_metas, _cubo, _metas):
+    # Deltas, posições e percentis de todos os meses de uma vez, por versão dos dados e das metas
+    return montar_comparativo(_cubo, _metas)
+
+@st.cache_data(ttl=300)
+def load_relatorio(versao_dados, assinatura_metas):
+    # Artefatos do modo batch (relatorio_batch.py), só se gerados com os mesmos dados e metas
+    return carregar_relatorio(versao_dados, assinatura_metas)
 
 # ----------------------------
 # ESTILO CSS
@@ -211,13 +158,30 @@ st.markdown("""
 # ----------------------------
 # FUNÇÃO DE COR PARA KPI
 # ----------------------------
-def color_atingimento(val):
-    if val >= 100:
-        return 'background-color: #28a745; color: white; font-weight: bold'
-    elif val >= 80:
-        return 'background-color: #ffc107; color: black; font-weight: bold'
-    else:
-        return 'background-color: #dc3545; color: white; font-weight: bold'
+def estilizar_atingimento(tabela):
+    # Cores das faixas calculadas de uma vez para a coluna inteira (não célula a célula)
+    formatos = {
+        'Atingimento (%)': '{:.2f}%',
+        'Atingimento Projetado (%)': '{:.2f}%',
+        'Meta': '{:.0f}',
+        'Realizado': '{:.0f}',
+        'Projeção': '{:.0f}',
+        'Diferença': '{:.0f}'
+    }
+    percentuais = [c for c in ('Atingimento (%)', 'Atingimento Projetado (%)') if c in tabela]
+    return tabela.style.format({c: f for c, f in formatos.items() if c in tabela}, na_rep='—').apply(
+        estilos_atingimento, subset=percentuais, axis=0)
+
+def tabela_atingimento_estilizada(tabela):
+    with etapa("styler", linhas=len(tabela)):
+        st.dataframe(estilizar_atingimento(tabela), use_container_width=True)
+
+# ----------------------------
+# FUNÇÃO PARA EXIBIR GRÁFICOS (figuras memoizadas em JSON)
+# ----------------------------
+def grafico(fig_json):
+    with etapa("plotly"):
+        st.plotly_chart(restaurar_figura(fig_json), use_container_width=True)
 
 # ----------------------------
 # FUNÇÃO PARA CRIAR CARDS DE MÉTRICA
@@ -236,7 +200,218 @@ def metric_card(title, value, delta=None, delta_color="normal"):
 # ----------------------------
 # CARREGAR DADOS
 # ----------------------------
-df = load_data()
+df, cubo = load_data()
+if df.attrs.get('buscado_em'):
+    # Durante uma renovação continua valendo a versão anterior, com o carimbo dela
+    status = " · 🔄 atualizando em segundo plano…" if dados_compartilhados().atualizando else ""
+    st.caption(f"🕒 Dados de {momento(df.attrs['buscado_em'])}{status}")
+relatorio = load_relatorio(df.attrs.get('versao_dados'), metas.assinatura)
+ritmo = ritmo_diario(df.attrs.get('versao_dados'), df)
+indice = indice_datas(df.attrs.get('versao_dados'), df)
+comparativo = comparativo_mensal(df.attrs.get('versao_dados'), metas.assinatura, cubo, metas)
+marcar("dados_carregados")
+
+# ----------------------------
+# VISÕES MEMOIZADAS (tabelas + figuras por estado dos filtros)
+# ----------------------------
+# Reruns com os mesmos filtros (troca de aba, reseleção) reaproveitam tabelas e figuras
+memo = memo_visoes()
+
+def chave_visao(visao, ano=None, meses=None, comerciais=None):
+    return chave_filtros(visao, df.attrs.get('versao_dados'), metas.assinatura, ano, meses, comerciais)
+
+@etapa("visao_mensal")
+def visao_mensal(ano, meses, comerciais, data_referencia):
+    # Aplicar filtros (fatia do cubo) e calcular meta/atingimento, ordenado por atingimento
+    tabela, totais = calcular_atingimento(cubo, metas, ano, meses, comerciais)
+    if tabela.empty or not meses:
+        return {"tabela": tabela, "totais": totais, "figuras": {}}
+    # Projeção do fechamento pelo ritmo em dias úteis até a data de referência
+    tabela = projetar_atingimento(tabela, ritmo, ano, meses, data_referencia)
+
+    px = importar("plotly.express")
+
+    # Gráfico de barras comparativo
+    fig_barras = px.bar(
+        tabela, 
+        x='Comercial_Padronizado', 
+        y=['Realizado', 'Meta'],
+        barmode='group',
+        title=f'Realizado vs Meta - {ano}',
+        labels={'value': 'Quantidade', 'variable': 'Tipo'},
+        text_auto=True
+    )
+    fig_barras.update_layout(xaxis_title="Comercial", yaxis_title="Quantidade")
+
+    # Gráfico de pizza do atingimento geral
+    fig_pie = px.pie(
+        names=['Atingido', 'Falta Atingir'],
+        values=[totais['realizado'], max(0, totais['meta'] - totais['realizado'])],
+        title=f"Atingimento Geral: {totais['atingimento']:.1f}%",
+        color=['Atingido', 'Falta Atingir'],
+        color_discrete_map={'Atingido': '#28a745', 'Falta Atingir': '#dc3545'}
+    )
+
+    # Gráfico de evolução mensal (o cubo já devolve os meses na ordem do calendário)
+    evolucao_mensal = cubo.realizado_por_mes(ano, meses, comerciais).reset_index()
+    fig_evolucao = px.line(
+        evolucao_mensal,
+        x='Mês',
+        y='Realizado',
+        title='Evolução do Realizado ao Longo dos Meses',
+        markers=True
+    )
+
+    figuras = {"barras": fig_barras, "pizza": fig_pie, "evolucao": fig_evolucao}
+    
+    # Burn-up do último mês selecionado: acumulado de cada comercial em % da meta do mês
+    mes_burnup = max(meses, key=MESES.index)
+    metas_mes = pd.Series(metas.matriz_ano(ano)[MESES.index(mes_burnup)], index=metas.comerciais)
+    burnup = ritmo.burnup(ano, mes_burnup, metas_mes, data_referencia, comerciais)
+    if not burnup.empty:
+        fig_burnup = px.line(
+            burnup,
+            x='Dia',
+            y='Acumulado (%)',
+            color='Comercial',
+            title=f'Burn-up de {mes_burnup}/{ano} (% da meta do mês)'
+        )
+        fig_burnup.update_traces(line_dash='dash', line_color='#6c757d', selector={'name': 'Ritmo ideal'})
+        fig_burnup.add_hline(y=100, line_dash='dot', line_color='#28a745')
+        figuras["burnup"] = fig_burnup
+    
+    return {"tabela": tabela, "totais": totais,
+            "figuras": {nome: serializar_figura(fig) for nome, fig in figuras.items()}}
+
+@etapa("visao_intervalo")
+def visao_intervalo(inicio, fim, comerciais):
+    # Fatia do frame ordenado por data; meta proporcional aos dias úteis do intervalo
+    tabela, totais = calcular_atingimento_intervalo(indice, metas, inicio, fim, comerciais)
+    semanas = semanas_iso(indice, metas, inicio, fim, comerciais)
+    if tabela.empty:
+        return {"tabela": tabela, "totais": totais, "semanas": semanas, "figuras": {}}
+
+    px = importar("plotly.express")
+
+    # Realizado vs meta por semana ISO
+    fig_semanas = px.bar(
+        semanas,
+        x='Semana',
+        y=['Realizado', 'Meta'],
+        barmode='group',
+        title='Realizado vs Meta por Semana (ISO)',
+        labels={'value': 'Quantidade', 'variable': 'Tipo'},
+        text_auto=True
+    )
+
+    figuras = {"semanas": fig_semanas}
+    return {"tabela": tabela, "totais": totais, "semanas": semanas,
+            "figuras": {nome: serializar_figura(fig) for nome, fig in figuras.items()}}
+
+@etapa("visao_anual")
+def visao_anual(ano, periodo, meses):
+    # Tabela consolidada
+    if relatorio is not None and periodo in PERIODOS:
+        # Pré-calculado pelo modo batch para esta mesma versão da planilha
+        tabela = tabela_pre_calculada(relatorio, ano, periodo)
+        totais = totais_atingimento(tabela)
+    else:
+        tabela, totais = calcular_atingimento(cubo, metas, ano, meses)
+    if tabela.empty:
+        return {"tabela": tabela, "totais": totais, "figuras": {}}
+
+    px = importar("plotly.express")
+
+    # Gráfico de barras horizontal
+    fig_bar_h = px.bar(
+        tabela.sort_values('Atingimento (%)'),
+        y='Comercial_Padronizado',
+        x='Atingimento (%)',
+        title='Atingimento por Comercial (%)',
+        orientation='h',
+        color='Atingimento (%)',
+        color_continuous_scale='RdYlGn'
+    )
+
+    # Gráfico de radar (formato longo: um eixo por métrica, uma série por comercial)
+    radar = tabela.assign(Atingimento=tabela['Atingimento (%)'] / 20).melt(  # Escalar o atingimento
+        id_vars='Comercial_Padronizado', value_vars=['Realizado', 'Meta', 'Atingimento'],
+        var_name='Métrica', value_name='Valor')
+    fig_radar = px.line_polar(
+        radar,
+        r='Valor',
+        theta='Métrica',
+        color='Comercial_Padronizado',
+        line_close=True,
+        labels={'Comercial_Padronizado': 'Comercial'}
+    )
+    fig_radar.update_traces(fill='toself')
+
+    fig_radar.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, max(tabela[['Realizado', 'Meta']].max().max(), 50)])
+        ),
+        title="Comparativo por Comercial - Radar"
+    )
+
+    figuras = {"barras_h": fig_bar_h, "radar": fig_radar}
+    return {"tabela": tabela, "totais": totais,
+            "figuras": {nome: serializar_figura(fig) for nome, fig in figuras.items()}}
+
+@etapa("visao_comparativo")
+def visao_comparativo(ano, mes):
+    # Linha do mês no comparativo pré-calculado (MoM, YoY, posição e percentil)
+    tabela = comparativo.tabela(ano, mes)
+    if tabela.empty:
+        return {"tabela": tabela, "figuras": {}}
+
+    px = importar("plotly.express")
+
+    # Variação sobre o mês anterior e sobre o mesmo mês do ano anterior
+    deltas = tabela.melt(id_vars='Comercial_Padronizado', value_vars=['Δ Mês', 'Δ Ano'],
+                         var_name='Comparação', value_name='Variação')
+    fig_deltas = px.bar(
+        deltas,
+        x='Comercial_Padronizado',
+        y='Variação',
+        color='Comparação',
+        barmode='group',
+        title=f'Variação do Realizado - {mes}/{ano}',
+        labels={'Comercial_Padronizado': 'Comercial'},
+        text_auto=True
+    )
+
+    # Posição no ranking ao longo do ano (1 = mais vendas no mês)
+    fig_posicoes = px.line(
+        comparativo.evolucao(ano),
+        x='Mês',
+        y='Posição',
+        color='Comercial',
+        hover_data=['Percentil'],
+        title=f'Posição no Ranking Mensal - {ano}',
+        markers=True
+    )
+    fig_posicoes.update_yaxes(autorange='reversed', dtick=1)
+
+    figuras = {"deltas": fig_deltas, "posicoes": fig_posicoes}
+    return {"tabela": tabela, "figuras": {nome: serializar_figura(fig) for nome, fig in figuras.items()}}
+
+@etapa("visao_totais")
+def visao_totais():
+    px = importar("plotly.express")
+
+    # Análise temporal
+    evolucao_anual = cubo.realizado_por_ano().reset_index()
+    fig_tendencia = px.line(evolucao_anual, x='Ano', y='Vendas', title='Evolução Anual das Vendas', markers=True)
+
+    # Distribuição por comercial
+    dist_comercial = cubo.realizado_por_comercial().sort_values(ascending=False).reset_index()
+    dist_comercial.columns = ['Comercial', 'Vendas']
+    fig_dist = px.pie(dist_comercial, values='Vendas', names='Comercial', title='Distribuição de Vendas por Comercial')
+    fig_bar_dist = px.bar(dist_comercial, x='Vendas', y='Comercial', orientation='h', title='Vendas por Comercial')
+
+    figuras = {"tendencia": fig_tendencia, "distribuicao": fig_dist, "barras": fig_bar_dist}
+    return {"figuras": {nome: serializar_figura(fig) for nome, fig in figuras.items()}}
 
 # ----------------------------
 # DASHBOARD
@@ -244,16 +419,19 @@ df = load_data()
 if df.empty:
     st.error("❌ Nenhum dado disponível para exibição.")
 else:
-    tab_intro, tab_mensal, tab_anual, tab_totais, tab_explicacao = st.tabs([
+    abas = [
         "✨ Apresentação", 
         "📊 Performance Mensal", 
         "📈 Consolidado Anual",
         "🏆 Resultados Totais",
         "📘 Como Usar"
-    ])
+    ]
+    if ADMIN:
+        abas.append("🛠️ Diagnóstico")
+    tab_intro, tab_mensal, tab_anual, tab_totais, tab_explicacao, *tab_admin = st.tabs(abas)
 
     # ABA INTRO
-    with tab_intro:
+    with tab_intro, etapa("aba_apresentacao"):
         st.markdown('<h1 class="big-font">🚀 Dashboard de Performance Comercial</h1>', unsafe_allow_html=True)
         
         col1, col2 = st.columns([2, 1])
@@ -271,60 +449,76 @@ else:
             - 👥 Performance individual por comercial
             - 📱 Visualização responsiva e intuitiva
             
-            **🔗 Fonte dos dados:** [Planilha Google Sheets](""" + SHEET_URL + """)
+            **🔗 Fonte dos dados:** """ + " · ".join(rotulo_fonte(fonte) for fonte in FONTES) + """
             """)
         
         with col2:
             st.image("https://cdn-icons-png.flaticon.com/512/5968/5968344.png", width=150)
-            st.metric("Total de Registros", len(df))
-            st.metric("Período Coberto", f"{df['Ano'].min()} - {df['Ano'].max()}")
-            st.metric("Comerciais Ativos", df['Comercial_Padronizado'].nunique())
+            st.metric("Total de Registros", cubo.total())
+            st.metric("Período Coberto", f"{cubo.anos.min()} - {cubo.anos.max()}")
+            st.metric("Comerciais Ativos", len(cubo.comerciais))
+            if len(FONTES) > 1:
+                st.metric("Planilhas (squads)", len(FONTES))
         
-        # Mostrar prévia dos dados
+        # Navegar pelos dados: ordenação e paginação no servidor, só a página visível vai ao navegador
         with st.expander("🔍 Visualizar Dados Carregados"):
-            st.dataframe(df.head(10), use_container_width=True)
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                coluna_ordem = st.selectbox("**Ordenar por:**", ["(por data)"] + list(df.columns), key="ordem_dados")
+            
+            with col2:
+                crescente = st.radio("**Ordem:**", ["Crescente", "Decrescente"], horizontal=True, key="direcao_dados") == "Crescente"
+            
+            with col3:
+                tamanho_pagina = st.selectbox("**Linhas por página:**", TAMANHOS_PAGINA, key="tamanho_pagina_dados")
+            
+            with col4:
+                total_paginas = numero_paginas(len(df), tamanho_pagina)
+                pagina = st.number_input(f"**Página (de {total_paginas}):**", min_value=1, max_value=total_paginas, value=1, step=1, key="pagina_dados")
+            
+            # A ordenação (posições das linhas) é memoizada por versão dos dados + coluna + direção
+            coluna = None if coluna_ordem == "(por data)" else coluna_ordem
+            ordem = memo.obter_ou_calcular(
+                ("ordem_linhas", df.attrs.get('versao_dados'), coluna, crescente),
+                lambda: ordem_linhas(df, coluna, crescente))
+            recorte, inicio, fim = fatiar_pagina(df, ordem, pagina, tamanho_pagina)
+            st.dataframe(recorte, use_container_width=True)
+            st.caption(f"Linhas {inicio + 1:,}–{fim:,} de {len(df):,}".replace(",", "."))
 
     # ABA PERFORMANCE MENSAL
-    with tab_mensal:
+    with tab_mensal, etapa("aba_mensal"):
         st.header("📊 Performance Mensal")
         
         # Filtros
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            anos_disponiveis = sorted(df['Ano'].unique())
+            anos_disponiveis = list(cubo.anos)
             ano_selecionado = st.selectbox("**Selecione o Ano:**", anos_disponiveis, index=len(anos_disponiveis)-1)
         
         with col2:
-            ordem_meses = list(META_MENSAL_POR_COMERCIAL.keys())
-            meses_disponiveis = sorted(df['Mês'].unique(), key=lambda x: ordem_meses.index(x) if x in ordem_meses else len(ordem_meses))
+            meses_disponiveis = cubo.meses_com_dados()
             meses_selecionados = st.multiselect("**Selecione os Meses:**", meses_disponiveis, default=meses_disponiveis)
         
         with col3:
-            todos_comerciais = sorted(df['Comercial_Padronizado'].unique())
+            # Inclui quem tem meta mas ainda não tem vendas
+            todos_comerciais = sorted(set(cubo.comerciais) | set(metas.comerciais))
             comerciais_selecionados = st.multiselect("**Filtrar Comerciais:**", todos_comerciais, default=todos_comerciais)
         
-        # Aplicar filtros
-        df_filtrado = df[
-            (df['Ano'] == ano_selecionado) & 
-            (df['Mês'].isin(meses_selecionados)) &
-            (df['Comercial_Padronizado'].isin(comerciais_selecionados))
-        ]
-        
-        if not df_filtrado.empty and meses_selecionados:
-            # Tabela de performance
-            tabela_mensal = df_filtrado.groupby('Comercial_Padronizado').size().reset_index(name='Realizado')
-            tabela_mensal['Meta'] = tabela_mensal['Comercial_Padronizado'].apply(lambda x: meta_mensal_total(x, meses_selecionados))
-            tabela_mensal['Atingimento (%)'] = (tabela_mensal['Realizado'] / tabela_mensal['Meta'] * 100).round(2)
-            tabela_mensal['Diferença'] = tabela_mensal['Realizado'] - tabela_mensal['Meta']
-            
-            # Ordenar por atingimento
-            tabela_mensal = tabela_mensal.sort_values('Atingimento (%)', ascending=False)
+        # Tabelas e figuras memoizadas pelo estado dos filtros (e pelo dia, por causa da projeção)
+        data_referencia = hoje()
+        visao = memo.obter_ou_calcular(
+            chave_visao(("mensal", str(data_referencia)), ano_selecionado, meses_selecionados, comerciais_selecionados),
+            lambda: visao_mensal(ano_selecionado, meses_selecionados, comerciais_selecionados, data_referencia))
+        tabela_mensal, totais_mensal = visao["tabela"], visao["totais"]
+        
+        if not tabela_mensal.empty and meses_selecionados:
             
             # Exibir métricas resumidas
-            total_realizado = tabela_mensal['Realizado'].sum()
-            total_meta = tabela_mensal['Meta'].sum()
-            atingimento_geral = (total_realizado / total_meta * 100) if total_meta > 0 else 0
+            total_realizado = totais_mensal['realizado']
+            total_meta = totais_mensal['meta']
+            atingimento_geral = totais_mensal['atingimento']
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -338,64 +532,80 @@ else:
             
             # Tabela detalhada
             st.subheader("📋 Detalhamento por Comercial")
-            styled_table = tabela_mensal.style.format({
-                'Atingimento (%)': '{:.2f}%',
-                'Meta': '{:.0f}',
-                'Realizado': '{:.0f}',
-                'Diferença': '{:.0f}'
-            }).applymap(color_atingimento, subset=['Atingimento (%)'])
-            
-            st.dataframe(styled_table, use_container_width=True)
+            tabela_atingimento_estilizada(tabela_mensal)
             
             # Gráficos
             col1, col2 = st.columns(2)
             
             with col1:
-                # Gráfico de barras comparativo
-                fig_barras = px.bar(
-                    tabela_mensal, 
-                    x='Comercial_Padronizado', 
-                    y=['Realizado', 'Meta'],
-                    barmode='group',
-                    title=f'Realizado vs Meta - {ano_selecionado}',
-                    labels={'value': 'Quantidade', 'variable': 'Tipo'},
-                    text_auto=True
-                )
-                fig_barras.update_layout(xaxis_title="Comercial", yaxis_title="Quantidade")
-                st.plotly_chart(fig_barras, use_container_width=True)
+                grafico(visao["figuras"]["barras"])
             
             with col2:
-                # Gráfico de pizza do atingimento geral
-                fig_pie = px.pie(
-                    names=['Atingido', 'Falta Atingir'],
-                    values=[total_realizado, max(0, total_meta - total_realizado)],
-                    title=f"Atingimento Geral: {atingimento_geral:.1f}%",
-                    color=['Atingido', 'Falta Atingir'],
-                    color_discrete_map={'Atingido': '#28a745', 'Falta Atingir': '#dc3545'}
-                )
-                st.plotly_chart(fig_pie, use_container_width=True)
+                grafico(visao["figuras"]["pizza"])
             
             # Gráfico de evolução mensal
             st.subheader("📈 Evolução Mensal")
-            evolucao_mensal = df_filtrado.groupby('Mês').size().reset_index(name='Realizado')
-            # Ordenar meses corretamente
-            evolucao_mensal['Mês'] = pd.Categorical(evolucao_mensal['Mês'], categories=ordem_meses, ordered=True)
-            evolucao_mensal = evolucao_mensal.sort_values('Mês')
+            grafico(visao["figuras"]["evolucao"])
             
-            fig_evolucao = px.line(
-                evolucao_mensal,
-                x='Mês',
-                y='Realizado',
-                title='Evolução do Realizado ao Longo dos Meses',
-                markers=True
-            )
-            st.plotly_chart(fig_evolucao, use_container_width=True)
+            # Ritmo dentro do mês
+            if "burnup" in visao["figuras"]:
+                st.subheader("🏁 Ritmo do Mês")
+                st.caption("Acima da linha tracejada, o comercial está no ritmo para bater a meta. "
+                           "A projeção da tabela segue o mesmo ritmo: realizado ÷ dias úteis decorridos × dias úteis do mês.")
+                grafico(visao["figuras"]["burnup"])
             
         else:
             st.warning("⚠ Selecione pelo menos um mês para visualizar os dados.")
+        
+        # Intervalo de datas livre (pode cruzar a virada do ano), com os mesmos comerciais
+        st.subheader("📆 Intervalo de Datas")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            atalho = st.selectbox("**Intervalo:**", list(ATALHOS), index=1, key="atalho_intervalo")
+        
+        with col2:
+            intervalo = intervalo_do_atalho(atalho, data_referencia)
+            if intervalo is None:
+                padrao = (pd.Timestamp(data_referencia - 29).date(), pd.Timestamp(data_referencia).date())
+                escolha = st.date_input("**De / até:**", value=padrao, key="datas_intervalo")
+                intervalo = tuple(escolha) if isinstance(escolha, (tuple, list)) and len(escolha) == 2 else None
+            else:
+                st.markdown(f"**{pd.Timestamp(intervalo[0]):%d/%m/%Y} – {pd.Timestamp(intervalo[1]):%d/%m/%Y}**")
+        
+        if intervalo is None:
+            st.info("Escolha a data inicial e a final.")
+        else:
+            inicio_intervalo, fim_intervalo = (pd.Timestamp(d).date() for d in intervalo)
+            visao = memo.obter_ou_calcular(
+                chave_visao(("intervalo", str(inicio_intervalo), str(fim_intervalo)), comerciais=comerciais_selecionados),
+                lambda: visao_intervalo(inicio_intervalo, fim_intervalo, comerciais_selecionados))
+            tabela_intervalo, totais_intervalo = visao["tabela"], visao["totais"]
+            
+            if tabela_intervalo.empty:
+                st.warning("⚠ Nenhum dado ou meta no intervalo selecionado.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    metric_card("Realizado no Intervalo", totais_intervalo['realizado'])
+                with col2:
+                    metric_card("Meta Proporcional", totais_intervalo['meta'])
+                with col3:
+                    metric_card("Atingimento", f"{totais_intervalo['atingimento']:.1f}%")
+                
+                st.caption("A meta de cada mês entra proporcional aos dias úteis dele dentro do intervalo.")
+                tabela_atingimento_estilizada(tabela_intervalo)
+                
+                # Semanas ISO (segunda a domingo), com a variação sobre a semana anterior
+                st.subheader("🗓️ Semanas ISO")
+                grafico(visao["figuras"]["semanas"])
+                st.caption("Semanas cortadas pelo intervalo (coluna Dias < 7) ficam sem variação semanal.")
+                st.dataframe(visao["semanas"].style.format({
+                    'Início': '{:%d/%m/%Y}', 'Meta': '{:.0f}', 'Atingimento (%)': '{:.2f}%', 'Variação Semanal (%)': '{:+.1f}%'
+                }, na_rep='—'), use_container_width=True, hide_index=True)
 
     # ABA CONSOLIDADO ANUAL
-    with tab_anual:
+    with tab_anual, etapa("aba_anual"):
         st.header("📈 Consolidado Anual")
         
         col1, col2 = st.columns(2)
@@ -405,34 +615,27 @@ else:
         
         with col2:
             # Opções de períodos
-            periodo_opcoes = {
-                "Ano Completo": list(META_MENSAL_POR_COMERCIAL.keys()),
-                "1º Semestre": ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho"],
-                "2º Semestre": ["Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"],
-                "Personalizado": None
-            }
+            periodo_opcoes = {**PERIODOS, "Personalizado": None}
             periodo_selecionado = st.selectbox("**Período:**", list(periodo_opcoes.keys()))
             
             if periodo_selecionado == "Personalizado":
-                meses_personalizado = st.multiselect("**Selecione os Meses:**", list(META_MENSAL_POR_COMERCIAL.keys()))
+                meses_personalizado = st.multiselect("**Selecione os Meses:**", MESES)
                 meses_analise = meses_personalizado
             else:
                 meses_analise = periodo_opcoes[periodo_selecionado]
         
         if meses_analise:
-            df_anual = df[(df['Ano'] == ano_anual) & (df['Mês'].isin(meses_analise))]
+            visao = memo.obter_ou_calcular(
+                chave_visao("anual", ano_anual, meses_analise),
+                lambda: visao_anual(ano_anual, periodo_selecionado, meses_analise))
+            tabela_anual, totais_anual = visao["tabela"], visao["totais"]
             
-            if not df_anual.empty:
-                # Tabela consolidada
-                tabela_anual = df_anual.groupby('Comercial_Padronizado').size().reset_index(name='Realizado')
-                tabela_anual['Meta'] = tabela_anual['Comercial_Padronizado'].apply(lambda x: meta_mensal_total(x, meses_analise))
-                tabela_anual['Atingimento (%)'] = (tabela_anual['Realizado'] / tabela_anual['Meta'] * 100).round(2)
-                tabela_anual = tabela_anual.sort_values('Atingimento (%)', ascending=False)
+            if not tabela_anual.empty:
                 
                 # Métricas gerais
-                total_realizado_anual = tabela_anual['Realizado'].sum()
-                total_meta_anual = tabela_anual['Meta'].sum()
-                atingimento_anual = (total_realizado_anual / total_meta_anual * 100) if total_meta_anual > 0 else 0
+                total_realizado_anual = totais_anual['realizado']
+                total_meta_anual = totais_anual['meta']
+                atingimento_anual = totais_anual['atingimento']
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -446,98 +649,87 @@ else:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    # Gráfico de barras horizontal
-                    fig_bar_h = px.bar(
-                        tabela_anual.sort_values('Atingimento (%)'),
-                        y='Comercial_Padronizado',
-                        x='Atingimento (%)',
-                        title='Atingimento por Comercial (%)',
-                        orientation='h',
-                        color='Atingimento (%)',
-                        color_continuous_scale='RdYlGn'
-                    )
-                    st.plotly_chart(fig_bar_h, use_container_width=True)
+                    grafico(visao["figuras"]["barras_h"])
                 
                 with col2:
-                    # Gráfico de radar
-                    fig_radar = go.Figure()
-                    
-                    for _, row in tabela_anual.iterrows():
-                        fig_radar.add_trace(go.Scatterpolar(
-                            r=[row['Realizado'], row['Meta'], row['Atingimento (%)']/20],  # Escalar o atingimento
-                            theta=['Realizado', 'Meta', 'Atingimento'],
-                            fill='toself',
-                            name=row['Comercial_Padronizado']
-                        ))
-                    
-                    fig_radar.update_layout(
-                        polar=dict(
-                            radialaxis=dict(visible=True, range=[0, max(tabela_anual[['Realizado', 'Meta']].max().max(), 50)])
-                        ),
-                        title="Comparativo por Comercial - Radar"
-                    )
-                    st.plotly_chart(fig_radar, use_container_width=True)
+                    grafico(visao["figuras"]["radar"])
                 
                 # Tabela detalhada
                 st.subheader("📊 Tabela Consolidada")
-                st.dataframe(
-                    tabela_anual.style.format({
-                        'Atingimento (%)': '{:.2f}%',
-                        'Meta': '{:.0f}',
-                        'Realizado': '{:.0f}'
-                    }).applymap(color_atingimento, subset=['Atingimento (%)']),
-                    use_container_width=True
-                )
+                tabela_atingimento_estilizada(tabela_anual)
+                
+                # Comparativo de um mês do período com o mês anterior e o mesmo mês do ano anterior
+                st.subheader("🔀 Comparativo do Mês")
+                meses_comparativo = [m for m in MESES if m in meses_analise]
+                mes_comparativo = st.selectbox("**Mês de referência:**", meses_comparativo,
+                                               index=len(meses_comparativo) - 1, key="mes_comparativo")
+                visao = memo.obter_ou_calcular(
+                    chave_visao(("comparativo", mes_comparativo), ano_anual),
+                    lambda: visao_comparativo(ano_anual, mes_comparativo))
+                
+                if visao["tabela"].empty:
+                    st.info(f"Sem vendas nem metas em {mes_comparativo}/{ano_anual}.")
+                else:
+                    st.caption("Δ Mês compara com o mês anterior e Δ Ano, com o mesmo mês do ano anterior. "
+                               "Δ Posição positivo = subiu no ranking. Percentil = % dos comerciais do mês com realizado menor ou igual.")
+                    st.dataframe(visao["tabela"].style.format({
+                        'Realizado': '{:.0f}', 'Mês Anterior': '{:.0f}', 'Δ Mês': '{:+.0f}', 'Δ Mês (%)': '{:+.1f}%',
+                        'Ano Anterior': '{:.0f}', 'Δ Ano': '{:+.0f}', 'Δ Ano (%)': '{:+.1f}%',
+                        'Atingimento (%)': '{:.2f}%', 'Δ Atingimento (p.p.)': '{:+.2f}', 'Posição': '{:.0f}',
+                        'Δ Posição': '{:+.0f}', 'Percentil': '{:.1f}'
+                    }, na_rep='—'), use_container_width=True, hide_index=True)
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        grafico(visao["figuras"]["deltas"])
+                    with col2:
+                        grafico(visao["figuras"]["posicoes"])
                 
             else:
                 st.warning(f"⚠ Nenhum dado encontrado para {ano_anual} no período selecionado.")
 
     # ABA RESULTADOS TOTAIS
-    with tab_totais:
+    with tab_totais, etapa("aba_totais"):
         st.header("🏆 Resultados Totais")
         
         # Estatísticas gerais
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_geral = len(df)
+            total_geral = cubo.total()
             metric_card("Total Geral de Vendas", total_geral)
         
         with col2:
-            comercial_top = df['Comercial_Padronizado'].value_counts().index[0]
+            comercial_top = cubo.top('Comercial')
             metric_card("Top Comercial", comercial_top)
         
         with col3:
-            mes_top = df['Mês'].value_counts().index[0]
+            mes_top = cubo.top('Mês')
             metric_card("Mês com Mais Vendas", mes_top)
         
         with col4:
-            ano_top = df['Ano'].value_counts().index[0]
+            ano_top = cubo.top('Ano')
             metric_card("Ano com Mais Vendas", ano_top)
         
+        visao = memo.obter_ou_calcular(chave_visao("totais"), visao_totais)
+        
         # Análise temporal
         st.subheader("📈 Tendência Temporal")
-        evolucao_anual = df.groupby('Ano').size().reset_index(name='Vendas')
-        fig_tendencia = px.line(evolucao_anual, x='Ano', y='Vendas', title='Evolução Anual das Vendas', markers=True)
-        st.plotly_chart(fig_tendencia, use_container_width=True)
+        grafico(visao["figuras"]["tendencia"])
         
         # Distribuição por comercial
         st.subheader("👥 Distribuição por Comercial")
-        dist_comercial = df['Comercial_Padronizado'].value_counts().reset_index()
-        dist_comercial.columns = ['Comercial', 'Vendas']
         
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_dist = px.pie(dist_comercial, values='Vendas', names='Comercial', title='Distribuição de Vendas por Comercial')
-            st.plotly_chart(fig_dist, use_container_width=True)
+            grafico(visao["figuras"]["distribuicao"])
         
         with col2:
-            fig_bar_dist = px.bar(dist_comercial, x='Vendas', y='Comercial', orientation='h', title='Vendas por Comercial')
-            st.plotly_chart(fig_bar_dist, use_container_width=True)
+            grafico(visao["figuras"]["barras"])
 
     # ABA EXPLICAÇÃO
-    with tab_explicacao:
+    with tab_explicacao, etapa("aba_como_usar"):
         st.header("📘 Como Usar o Dashboard")
         
         st.markdown("""
@@ -602,6 +794,62 @@ else:
         5. **Compare comerciais** usando os gráficos de radar
         """)
 
+    # ABA DIAGNÓSTICO (só com ?admin=1 / DASHBOARD_ADMIN=1)
+    if tab_admin:
+        with tab_admin[0], etapa("aba_diagnostico"):
+            st.header("🛠️ Diagnóstico")
+            
+            recentes = execucoes_recentes()
+            estatisticas_memo = memo.estatisticas()
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Reruns registrados", len(recentes))
+            with col2:
+                st.metric("Último rerun", f"{recentes[-1].segundos * 1000:.0f} ms" if recentes else "—")
+            with col3:
+                st.metric("Cache de visões: acertos", f"{estatisticas_memo['taxa_acerto']:.0%}")
+            with col4:
+                st.metric("Cache de visões: ocupação", f"{estatisticas_memo['itens']} itens · {estatisticas_memo['bytes'] / 2**20:.1f} MB")
+            
+            if recentes:
+                ultima = recentes[-1]
+                st.subheader(f"⏱️ Último rerun concluído (#{ultima.id})")
+                st.caption("Etapas aninhadas: o tempo de cada aba já inclui o das visões, do Styler e do Plotly dentro dela. "
+                           "Memória = variação do RSS do processo durante a etapa.")
+                etapas_ultima = pd.DataFrame(ultima.etapas)
+                if not etapas_ultima.empty:
+                    resumo = etapas_ultima.groupby("etapa", sort=False).agg(
+                        Vezes=("etapa", "size"),
+                        Segundos=("segundos", "sum"),
+                        Linhas=("linhas", "sum"),
+                        Memoria_MB=("memoria_delta_mb", "sum"),
+                    ).sort_values("Segundos", ascending=False)
+                    st.dataframe(resumo, use_container_width=True)
+                
+                st.subheader("📜 Reruns recentes")
+                st.dataframe(pd.DataFrame([{
+                    "Rerun": e.id,
+                    "Início": pd.Timestamp(e.inicio, unit="s"),
+                    "Duração (ms)": round(e.segundos * 1000, 1),
+                    "Etapas": len(e.etapas),
+                } for e in reversed(recentes)]), use_container_width=True)
+            
+            st.subheader("📦 Totais acumulados no processo")
+            st.dataframe(pd.DataFrame.from_dict(totais_por_etapa(), orient="index"), use_container_width=True)
+            
+            st.subheader("🧠 Cache de visões (LRU)")
+            st.json(estatisticas_memo)
+            
+            st.subheader("🔒 Cache compartilhado entre processos")
+            st.json(dados_compartilhados().estatisticas())
+            
+            st.subheader("👥 Resolução de nomes")
+            st.caption("Linhas por método de identificação do comercial. "
+                       "Linhas em `nao_resolvido` ficam fora do dashboard: um aumento costuma indicar um nome novo. "
+                       "Aproximações erradas podem ser rejeitadas em `nomes_aproximados.json` (lista `rejeitados`).")
+            st.json(df.attrs.get('resolucao_nomes', {}))
+
 # ----------------------------
 # RODAPÉ
 # ----------------------------
@@ -609,6 +857,9 @@ st.markdown("---")
 st.markdown("""
 <div style='text-align: center; color: #666;'>
     <p>Dashboard de Performance Comercial • Desenvolvido com Streamlit • Dados carregados de Google Sheets</p>
-    <p>Última atualização: """ + pd.Timestamp.now().strftime("%d/%m/%Y %H:%M") + """</p>
+    <p>Última atualização: """ + (f"{momento(df.attrs['buscado_em'])} (verificada em {momento(df.attrs.get('verificado_em'))})" if df.attrs.get('buscado_em') else "dados de exemplo") + """</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+concluir_primeira_renderizacao()
+concluir_execucao(execucao, {f"memo_{nome}": valor for nome, valor in memo.estatisticas().items()})
@@ -0,0 +1,128 @@
+# comparativo.py
+# 🔀 Comparativo por comercial: mês anterior (MoM), mesmo mês do ano anterior (YoY), posição e percentil
+#
+# Tudo sai de uma passada sobre as matrizes (anos × 12 × comerciais) do cubo e das metas,
+# achatadas numa linha do tempo de meses consecutivos: o mês anterior é um deslocamento
+# de 1 linha e o mesmo mês do ano anterior, de 12. Posição e percentil de todos os meses
+# são calculados de uma vez (rank por linha), sem laço por comercial.
+
+import numpy as np
+import pandas as pd
+
+from cubo import _INDICE_MES, MESES
+from metas import atingimento
+
+COLUNAS = [
+    "Comercial_Padronizado", "Realizado", "Mês Anterior", "Δ Mês", "Δ Mês (%)",
+    "Ano Anterior", "Δ Ano", "Δ Ano (%)", "Atingimento (%)", "Δ Atingimento (p.p.)",
+    "Posição", "Δ Posição", "Percentil",
+]
+
+
+def _deslocar(matriz, passos):
+    """Linha t recebe a linha t − passos (NaN antes do início)."""
+    deslocada = np.full(matriz.shape, np.nan)
+    deslocada[passos:] = matriz[:-passos]
+    return deslocada
+
+
+def _variacao(atual, anterior):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(anterior > 0, (atual / anterior - 1) * 100, np.nan)
+
+
+class ComparativoMensal:
+    """
+    Métricas (meses × comerciais) numa linha do tempo contínua de janeiro do primeiro ano
+    a dezembro do último. Comerciais sem venda nem meta num mês ficam fora da posição e
+    do percentil daquele mês.
+    """
+
+    def __init__(self, primeiro_ano, comerciais, realizado, meta):
+        self.primeiro_ano = int(primeiro_ano)
+        self.comerciais = np.asarray(comerciais, dtype=object)
+        self.realizado = np.asarray(realizado, dtype=float)
+        self.meta = np.asarray(meta, dtype=float)
+        self._indice_comercial = {c: i for i, c in enumerate(self.comerciais)}
+
+        ativo = (self.realizado > 0) | (self.meta > 0)
+        self.atingimento = atingimento(self.realizado, self.meta)
+        self.mes_anterior = _deslocar(self.realizado, 1)
+        self.ano_anterior = _deslocar(self.realizado, 12)
+
+        # Posição 1 = maior realizado do mês (empates dividem a melhor posição);
+        # percentil = % dos comerciais ativos no mês com realizado menor ou igual
+        realizado_ativo = pd.DataFrame(np.where(ativo, self.realizado, np.nan))
+        self.posicao = realizado_ativo.rank(axis=1, method="min", ascending=False).to_numpy()
+        self.percentil = realizado_ativo.rank(axis=1, method="max", pct=True).to_numpy() * 100
+
+    @classmethod
+    def construir(cls, cubo, metas):
+        comerciais = np.union1d(cubo.comerciais.astype(str), metas.comerciais.astype(str))
+        if not len(cubo.anos):
+            return cls(0, comerciais, np.zeros((0, len(comerciais))), np.zeros((0, len(comerciais))))
+        anos = np.arange(int(cubo.anos.min()), int(cubo.anos.max()) + 1)
+
+        # Cubo em anos consecutivos (anos sem dados ficam zerados) e comerciais da união
+        realizado = np.zeros((len(anos), 12, len(comerciais)))
+        posicao_ano = np.searchsorted(anos, cubo.anos.astype(int))
+        posicao_comercial = np.searchsorted(comerciais, cubo.comerciais.astype(str))
+        realizado[np.ix_(posicao_ano, np.arange(12), posicao_comercial)] = cubo.contagens
+
+        meta = np.zeros_like(realizado)
+        meta[:, :, np.searchsorted(comerciais, metas.comerciais.astype(str))] = np.stack(
+            [metas.matriz_ano(ano) for ano in anos])
+        return cls(anos[0], comerciais, realizado.reshape(-1, len(comerciais)), meta.reshape(-1, len(comerciais)))
+
+    def _linha(self, ano, mes):
+        return (int(ano) - self.primeiro_ano) * 12 + _INDICE_MES[mes]
+
+    def tabela(self, ano, mes, comerciais=None):
+        """Uma linha por comercial ativo no mês: deltas MoM / YoY, atingimento, posição e percentil."""
+        t = self._linha(ano, mes)
+        if not 0 <= t < len(self.realizado):
+            return pd.DataFrame(columns=COLUNAS)
+        anterior = t - 1 if t > 0 else None
+
+        def _anterior(matriz):
+            return matriz[anterior] if anterior is not None else np.full(len(self.comerciais), np.nan)
+
+        tabela = pd.DataFrame({
+            "Comercial_Padronizado": self.comerciais,
+            "Realizado": self.realizado[t],
+            "Mês Anterior": self.mes_anterior[t],
+            "Δ Mês": self.realizado[t] - self.mes_anterior[t],
+            "Δ Mês (%)": _variacao(self.realizado[t], self.mes_anterior[t]),
+            "Ano Anterior": self.ano_anterior[t],
+            "Δ Ano": self.realizado[t] - self.ano_anterior[t],
+            "Δ Ano (%)": _variacao(self.realizado[t], self.ano_anterior[t]),
+            "Atingimento (%)": self.atingimento[t],
+            "Δ Atingimento (p.p.)": self.atingimento[t] - _anterior(self.atingimento),
+            "Posição": self.posicao[t],
+            # Positivo = subiu no ranking em relação ao mês anterior
+            "Δ Posição": _anterior(self.posicao) - self.posicao[t],
+            "Percentil": self.percentil[t],
+        })
+        manter = ~np.isnan(self.posicao[t])
+        if comerciais is not None:
+            manter &= np.isin(self.comerciais, list(comerciais))
+        tabela = tabela[manter].round(2)
+        return tabela.sort_values("Posição", kind="stable").reset_index(drop=True)
+
+    def evolucao(self, ano, comerciais=None):
+        """Formato longo (Mês, Comercial, Posição, Percentil) dos meses do ano, para gráficos de linha."""
+        inicio = self._linha(ano, MESES[0])
+        if not 0 <= inicio < len(self.realizado):
+            return pd.DataFrame(columns=["Mês", "Comercial", "Posição", "Percentil"])
+        posicao = self.posicao[inicio:inicio + 12]
+        percentil = self.percentil[inicio:inicio + 12]
+        colunas = np.ones(len(self.comerciais), dtype=bool)
+        if comerciais is not None:
+            colunas = np.isin(self.comerciais, list(comerciais))
+        longo = pd.DataFrame({
+            "Mês": np.repeat(MESES, colunas.sum()),
+            "Comercial": np.tile(self.comerciais[colunas], 12),
+            "Posição": posicao[:, colunas].ravel(),
+            "Percentil": percentil[:, colunas].ravel().round(1),
+        })
+        return longo[longo["Posição"].notna()].reset_index(drop=True)
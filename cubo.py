@@ -0,0 +1,121 @@
+# cubo.py
+# 🧊 Cubo de contagens (Ano × Mês × Comercial) construído uma vez por carga de dados
+
+import numpy as np
+import pandas as pd
+
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+]
+_INDICE_MES = {mes: i for i, mes in enumerate(MESES)}
+
+
+def mascara_meses(meses):
+    """Máscara booleana (12,) dos meses escolhidos; rótulos desconhecidos são ignorados."""
+    mascara = np.zeros(12, dtype=bool)
+    mascara[[_INDICE_MES[m] for m in meses if m in _INDICE_MES]] = True
+    return mascara
+
+
+class CuboContagens:
+    """
+    Contagens densas indexadas por ano, número do mês (0-11) e comercial canônico.
+    Todas as tabelas e gráficos das abas saem de fatias e somas deste array, sem
+    voltar às linhas brutas a cada interação.
+    """
+
+    def __init__(self, anos, comerciais, contagens):
+        self.anos = np.asarray(anos)
+        self.comerciais = np.asarray(comerciais, dtype=object)
+        self.contagens = np.asarray(contagens, dtype=np.int64)
+        self._indice_ano = {int(a): i for i, a in enumerate(self.anos)}
+        self._indice_comercial = {c: i for i, c in enumerate(self.comerciais)}
+
+    @classmethod
+    def construir(cls, df, coluna_comercial="Comercial_Padronizado"):
+        if "Mês_Num" in df:
+            meses = df["Mês_Num"].astype("float64") - 1
+        else:
+            meses = df["Mês"].astype(object).map(_INDICE_MES)
+        validos = meses.notna().to_numpy()
+        codigos_ano, anos = pd.factorize(df["Ano"].to_numpy()[validos], sort=True)
+        codigos_com, comerciais = pd.factorize(df[coluna_comercial].to_numpy()[validos], sort=True)
+        codigos_mes = meses.to_numpy()[validos].astype(np.int64)
+
+        forma = (len(anos), 12, len(comerciais))
+        plano = (codigos_ano * 12 + codigos_mes) * len(comerciais) + codigos_com
+        contagens = np.bincount(plano, minlength=int(np.prod(forma))).reshape(forma)
+        return cls(anos, comerciais, contagens)
+
+    @classmethod
+    def somar(cls, cubos):
+        """Soma cubos com anos e comerciais possivelmente diferentes (ex.: um por bloco lido)."""
+        cubos = list(cubos)
+        anos = np.array(sorted({int(a) for c in cubos for a in c.anos}), dtype=np.int64)
+        comerciais = np.array(sorted({str(n) for c in cubos for n in c.comerciais}), dtype=object)
+        contagens = np.zeros((len(anos), 12, len(comerciais)), dtype=np.int64)
+        for c in cubos:
+            if c.contagens.size:
+                contagens[np.ix_(np.searchsorted(anos, c.anos.astype(np.int64)), np.arange(12),
+                                 np.searchsorted(comerciais, c.comerciais.astype(str)))] += c.contagens
+        return cls(anos, comerciais, contagens)
+
+    # ----------------------------
+    # ÍNDICES
+    # ----------------------------
+    def _indices_anos(self, anos):
+        if anos is None:
+            return slice(None)
+        if np.isscalar(anos):
+            anos = [anos]
+        return [self._indice_ano[int(a)] for a in anos if int(a) in self._indice_ano]
+
+    def _indices_meses(self, meses):
+        if meses is None:
+            return slice(None)
+        return [_INDICE_MES[m] for m in meses if m in _INDICE_MES]
+
+    def _indices_comerciais(self, comerciais):
+        if comerciais is None:
+            return slice(None)
+        return [self._indice_comercial[c] for c in comerciais if c in self._indice_comercial]
+
+    def fatia(self, anos=None, meses=None, comerciais=None):
+        """Sub-array (anos × meses × comerciais) para os filtros dados (None = todos)."""
+        return self.contagens[self._indices_anos(anos)][:, self._indices_meses(meses)][:, :, self._indices_comerciais(comerciais)]
+
+    # ----------------------------
+    # AGREGADOS USADOS NAS ABAS
+    # ----------------------------
+    def total(self):
+        return int(self.contagens.sum())
+
+    def realizado_por_comercial(self, anos=None, meses=None, comerciais=None, incluir_zeros=False):
+        indices = self._indices_comerciais(comerciais)
+        valores = self.fatia(anos, meses, comerciais).sum(axis=(0, 1))
+        serie = pd.Series(valores, index=pd.Index(self.comerciais[indices], name="Comercial_Padronizado"), name="Realizado")
+        return serie if incluir_zeros else serie[serie > 0]
+
+    def realizado_por_mes(self, anos=None, meses=None, comerciais=None, incluir_zeros=False):
+        indices = self._indices_meses(meses)
+        valores = self.fatia(anos, meses, comerciais).sum(axis=(0, 2))
+        ordem = np.arange(12)[indices]
+        serie = pd.Series(valores, index=pd.Index(np.array(MESES)[ordem], name="Mês"), name="Realizado")
+        serie = serie.iloc[np.argsort(ordem, kind="stable")]
+        return serie if incluir_zeros else serie[serie > 0]
+
+    def realizado_por_ano(self, incluir_zeros=False):
+        serie = pd.Series(self.contagens.sum(axis=(1, 2)), index=pd.Index(self.anos, name="Ano"), name="Vendas")
+        return serie if incluir_zeros else serie[serie > 0]
+
+    def meses_com_dados(self):
+        return [MESES[i] for i in np.flatnonzero(self.contagens.sum(axis=(0, 2)))]
+
+    def top(self, eixo):
+        """Rótulo com mais vendas no eixo 'Ano', 'Mês' ou 'Comercial'."""
+        if eixo == "Ano":
+            return self.anos[self.contagens.sum(axis=(1, 2)).argmax()]
+        if eixo == "Mês":
+            return MESES[self.contagens.sum(axis=(0, 2)).argmax()]
+        return self.comerciais[self.contagens.sum(axis=(0, 1)).argmax()]
@@ -0,0 +1,57 @@
+# datas.py
+# 📅 Conversão das datas da planilha e derivação de Ano / Mês (independente de locale)
+
+import numpy as np
+import pandas as pd
+
+from cubo import MESES
+
+# Formatos usados na planilha, em ordem de frequência; o que não casar com nenhum
+# cai na inferência `dayfirst` do pandas (apenas para as strings distintas restantes)
+FORMATOS_CONHECIDOS = (
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%d-%m-%Y",
+)
+TIPO_MES = pd.CategoricalDtype(MESES, ordered=True)
+
+
+def converter_datas(serie, formatos=FORMATOS_CONHECIDOS):
+    """
+    Converte a coluna de datas testando os formatos conhecidos explicitamente sobre
+    as strings distintas e espalhando o resultado pelos códigos.
+    Retorna (datas datetime64, quantidade de linhas que não puderam ser convertidas).
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie, int(serie.isna().sum())
+
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    texto = pd.Series(unicos, dtype=object).astype(str).str.strip()
+    convertidas = pd.Series(pd.NaT, index=texto.index, dtype="datetime64[ns]")
+
+    pendentes = np.ones(len(texto), dtype=bool)
+    for formato in formatos:
+        if not pendentes.any():
+            break
+        tentativa = pd.to_datetime(texto[pendentes], format=formato, errors="coerce")
+        convertidas[pendentes] = tentativa
+        pendentes[pendentes] = tentativa.isna().to_numpy()
+
+    if pendentes.any():
+        convertidas[pendentes] = pd.to_datetime(texto[pendentes], format="mixed", dayfirst=True, errors="coerce")
+
+    valores = np.append(convertidas.to_numpy(), np.datetime64("NaT", "ns"))
+    datas = pd.Series(valores[codigos], index=serie.index, name=serie.name)
+    return datas, int(datas.isna().sum())
+
+
+def adicionar_periodo(df, coluna="Data de Conclusão"):
+    """Adiciona Ano, Mês_Num (1-12) e Mês (categoria em português, ordenada)."""
+    datas = df[coluna].dt
+    df["Ano"] = datas.year
+    df["Mês_Num"] = datas.month.astype(np.int8)
+    df["Mês"] = pd.Categorical.from_codes(df["Mês_Num"].to_numpy() - 1, dtype=TIPO_MES)
+    return df
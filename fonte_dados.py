@@ -0,0 +1,319 @@
+# fonte_dados.py
+# 🔄 Busca condicional da planilha publicada + snapshot local do último processamento
+
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentacao import etapa
+
+# ----------------------------
+# CONFIGURAÇÃO
+# ----------------------------
+DIRETORIO_CACHE = os.environ.get(
+    "DASHBOARD_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".dashboard_cache"),
+)
+TIMEOUT_PADRAO = 30
+TAMANHO_POOL = int(os.environ.get("DASHBOARD_POOL_HTTP", "8"))
+
+# Status possíveis de uma busca
+ALTERADO = "alterado"
+NAO_MODIFICADO = "nao_modificado"   # servidor respondeu 304
+MESMO_CONTEUDO = "mesmo_conteudo"   # 200, mas o hash do conteúdo não mudou
+
+def criar_sessao(tamanho_pool=TAMANHO_POOL):
+    """Sessão HTTP com pool de conexões keep-alive compartilhado entre as threads de busca."""
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool)
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+
+_sessao = criar_sessao()
+_locks_revalidacao = {}
+_lock_registro = threading.Lock()
+_urls_aquecidas = set()
+
+
+@dataclass
+class ResultadoBusca:
+    status: str
+    conteudo: Optional[bytes] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    hash_conteudo: Optional[str] = None
+
+
+@dataclass
+class ResultadoFonte:
+    nome: str
+    df: Optional[pd.DataFrame] = None
+    origem: Optional[str] = None
+    erro: Optional[Exception] = None
+
+
+# ----------------------------
+# SNAPSHOT EM DISCO
+# ----------------------------
+class SnapshotLocal:
+    """
+    Último DataFrame processado com sucesso (Parquet) + estado HTTP da busca (JSON).
+    `assinatura` identifica o processamento que gerou o frame (código + mapeamento de
+    nomes): um snapshot de outra assinatura só serve de reserva quando a rede falha.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_CACHE, nome="planilha", assinatura=None):
+        self.diretorio = diretorio
+        self.caminho_frame = os.path.join(diretorio, f"{nome}.parquet")
+        self.caminho_estado = os.path.join(diretorio, f"{nome}.json")
+        self.assinatura = assinatura
+
+    def existe(self):
+        return os.path.exists(self.caminho_frame) and os.path.exists(self.caminho_estado)
+
+    def compativel(self, estado):
+        """Existe e foi gerado pelo processamento atual (pode ser reaproveitado sem reprocessar)."""
+        return self.existe() and estado.get("assinatura") == self.assinatura
+
+    def carregar_estado(self):
+        try:
+            with open(self.caminho_estado, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def carregar_frame(self):
+        return pd.read_parquet(self.caminho_frame)
+
+    def salvar_estado(self, estado):
+        os.makedirs(self.diretorio, exist_ok=True)
+        tmp = f"{self.caminho_estado}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False)
+        os.replace(tmp, self.caminho_estado)
+
+    def salvar(self, df, estado):
+        # Escrita atômica: frame primeiro, estado depois (o estado só aponta para frames completos)
+        os.makedirs(self.diretorio, exist_ok=True)
+        tmp = f"{self.caminho_frame}.{os.getpid()}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.caminho_frame)
+        estado["assinatura"] = self.assinatura
+        self.salvar_estado(estado)
+
+
+# ----------------------------
+# BUSCA CONDICIONAL (ETag / Last-Modified)
+# ----------------------------
+def buscar_condicional(url, estado=None, timeout=TIMEOUT_PADRAO, sessao=None):
+    estado = estado or {}
+    sessao = sessao or _sessao
+
+    headers = {}
+    if estado.get("etag"):
+        headers["If-None-Match"] = estado["etag"]
+    if estado.get("last_modified"):
+        headers["If-Modified-Since"] = estado["last_modified"]
+
+    resp = sessao.get(url, headers=headers, timeout=timeout)
+    etag = resp.headers.get("ETag", estado.get("etag"))
+    last_modified = resp.headers.get("Last-Modified", estado.get("last_modified"))
+
+    if resp.status_code == 304:
+        return ResultadoBusca(NAO_MODIFICADO, None, etag, last_modified, estado.get("hash"))
+
+    resp.raise_for_status()
+    conteudo = resp.content
+    hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+    status = MESMO_CONTEUDO if hash_conteudo == estado.get("hash") else ALTERADO
+    return ResultadoBusca(status, conteudo, etag, last_modified, hash_conteudo)
+
+
+def abrir_fluxo(url, timeout=TIMEOUT_PADRAO, sessao=None):
+    """Resposta HTTP em streaming (fluxo binário já descomprimido), pela sessão com pool."""
+    resp = (sessao or _sessao).get(url, stream=True, timeout=timeout)
+    resp.raise_for_status()
+    resp.raw.decode_content = True
+    return resp.raw
+
+
+# ----------------------------
+# MARCA D'ÁGUA (planilha que só cresce no fim)
+# ----------------------------
+def marca_dagua(conteudo, linhas):
+    """Até onde o CSV já foi processado: tamanho e hash desse prefixo + linhas de dados lidas."""
+    return {"bytes": len(conteudo), "hash_prefixo": hashlib.sha256(conteudo).hexdigest(), "linhas": linhas}
+
+
+def cauda_nova(conteudo, marca):
+    """
+    Cabeçalho + o que veio depois da marca d'água, ou None quando o prefixo já processado
+    mudou (alguém editou o histórico) e é preciso reprocessar tudo.
+    """
+    if not marca or len(conteudo) < marca["bytes"]:
+        return None
+    fim_cabecalho = conteudo.find(b"\n") + 1
+    if not 0 < fim_cabecalho <= marca["bytes"]:
+        return None
+    # A marca precisa cair numa quebra de linha (senão a última linha antiga foi alterada)
+    if conteudo[marca["bytes"] - 1:marca["bytes"]] != b"\n" and conteudo[marca["bytes"]:marca["bytes"] + 1] not in (b"", b"\r", b"\n"):
+        return None
+    if hashlib.sha256(conteudo[:marca["bytes"]]).hexdigest() != marca["hash_prefixo"]:
+        return None
+    return conteudo[:fim_cabecalho] + conteudo[marca["bytes"]:]
+
+
+def carregar_com_snapshot(url, processar, snapshot=None, timeout=TIMEOUT_PADRAO, sessao=None, anexar=None):
+    """
+    Busca a planilha e só processa quando o conteúdo mudou.
+    `processar(conteudo_bytes)` deve devolver o DataFrame final. Com `anexar(cauda_bytes, df_anterior)`,
+    se o CSV só ganhou linhas no fim, processa apenas a cauda e junta ao snapshot.
+    Retorna (df, origem) com origem em {"rede", "snapshot", "snapshot_offline"}.
+    Snapshot de outro processamento (assinatura diferente) força a busca completa e o reprocessamento.
+    """
+    snapshot = snapshot or SnapshotLocal()
+    estado = snapshot.carregar_estado()
+    tem_snapshot = snapshot.existe()
+    reaproveitavel = snapshot.compativel(estado)
+
+    try:
+        with etapa("busca_http") as registro:
+            # Sem snapshot reaproveitável, nada de If-None-Match: um 304 não traria o conteúdo
+            resultado = buscar_condicional(url, estado if reaproveitavel else None, timeout, sessao)
+            registro["status"] = resultado.status
+    except requests.RequestException:
+        if tem_snapshot:
+            return carregar_snapshot(snapshot, estado), "snapshot_offline"
+        raise
+
+    if resultado.status != ALTERADO and reaproveitavel:
+        estado.update(etag=resultado.etag, last_modified=resultado.last_modified, verificado_em=time.time())
+        snapshot.salvar_estado(estado)
+        return carregar_snapshot(snapshot, estado), "snapshot"
+
+    # Só junta a cauda a um frame do mesmo processamento: com outro código ou mapeamento,
+    # linhas antigas (inclusive as descartadas) precisam passar de novo pelas etapas
+    cauda = cauda_nova(resultado.conteudo, estado.get("marca")) if anexar is not None and reaproveitavel else None
+    if cauda is not None:
+        df = anexar(cauda, carregar_snapshot(snapshot, estado))
+    else:
+        df = processar(resultado.conteudo)
+    agora = time.time()
+    estado = {
+        "url": url,
+        "etag": resultado.etag,
+        "last_modified": resultado.last_modified,
+        "hash": resultado.hash_conteudo,
+        "buscado_em": agora,
+        "verificado_em": agora,
+        "modo": "completo" if cauda is None else "incremental",
+        "marca": marca_dagua(resultado.conteudo, df.attrs.get("linhas_lidas")),
+    }
+    snapshot.salvar(df, estado)
+    marcar_versao(df, estado)
+    return df, "rede"
+
+
+def marcar_versao(df, estado):
+    # Versão dos dados = hash do CSV de origem (+ assinatura do processamento); usada para
+    # invalidar caches e artefatos derivados
+    versao = estado.get("hash")
+    if versao and estado.get("assinatura"):
+        versao = f"{versao}:{estado['assinatura']}"
+    df.attrs["versao_dados"] = versao
+    df.attrs["buscado_em"] = estado.get("buscado_em")
+    df.attrs["verificado_em"] = estado.get("verificado_em")
+    return df
+
+
+def carregar_snapshot(snapshot, estado=None):
+    with etapa("leitura_snapshot") as registro:
+        df = snapshot.carregar_frame()
+        registro["linhas"] = len(df)
+    return marcar_versao(df, estado if estado is not None else snapshot.carregar_estado())
+
+
+# ----------------------------
+# PARTIDA A FRIO
+# ----------------------------
+def revalidar_em_segundo_plano(url, processar, snapshot=None, timeout=TIMEOUT_PADRAO, anexar=None):
+    """Dispara uma revalidação em thread daemon (no máximo uma por URL ao mesmo tempo)."""
+    with _lock_registro:
+        lock = _locks_revalidacao.setdefault(url, threading.Lock())
+    if not lock.acquire(blocking=False):
+        return None
+
+    def _executar():
+        try:
+            carregar_com_snapshot(url, processar, snapshot, timeout, anexar=anexar)
+        except Exception:
+            pass  # o snapshot atual continua valendo; a próxima carga tenta de novo
+        finally:
+            lock.release()
+
+    thread = threading.Thread(target=_executar, name="revalidacao-planilha", daemon=True)
+    thread.start()
+    return thread
+
+
+def carregar_planilha(url, processar, snapshot=None, timeout=TIMEOUT_PADRAO, anexar=None):
+    """
+    Na primeira carga do processo, se houver snapshot, devolve-o imediatamente e
+    revalida em segundo plano; nas seguintes, faz a busca condicional normalmente.
+    """
+    snapshot = snapshot or SnapshotLocal()
+    with _lock_registro:
+        partida_fria = url not in _urls_aquecidas
+        _urls_aquecidas.add(url)
+    if partida_fria:
+        if snapshot.compativel(snapshot.carregar_estado()):
+            revalidar_em_segundo_plano(url, processar, snapshot, timeout, anexar)
+            return carregar_snapshot(snapshot), "snapshot"
+    return carregar_com_snapshot(url, processar, snapshot, timeout, anexar=anexar)
+
+
+# ----------------------------
+# VÁRIAS PLANILHAS EM PARALELO
+# ----------------------------
+def _carregar_fonte(nome, url, processar, snapshot, partida_rapida, timeout, anexar):
+    try:
+        if callable(url):
+            df, origem = url(snapshot)   # fonte com carregador próprio (ex.: API do Sheets)
+        elif partida_rapida:
+            df, origem = carregar_planilha(url, processar, snapshot, timeout, anexar)
+        else:
+            df, origem = carregar_com_snapshot(url, processar, snapshot, timeout, anexar=anexar)
+        return ResultadoFonte(nome, df, origem)
+    except Exception as e:
+        # Falha isolada: esta fonte volta para o próprio snapshot, as demais seguem normais
+        if snapshot.existe():
+            return ResultadoFonte(nome, carregar_snapshot(snapshot), "snapshot_offline", e)
+        return ResultadoFonte(nome, erro=e)
+
+
+def carregar_varias(fontes, processar, partida_rapida=True, timeout=TIMEOUT_PADRAO, max_threads=TAMANHO_POOL, anexar=None):
+    """
+    Busca e processa cada fonte em uma thread (todas compartilham o pool HTTP).
+    `fontes` é uma lista de (nome, url, SnapshotLocal); no lugar da URL pode vir um
+    carregador `f(snapshot) -> (df, origem)`. Retorna [ResultadoFonte] na mesma ordem.
+    """
+    if not fontes:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_threads, len(fontes)), thread_name_prefix="fonte") as pool:
+        # Cada thread herda o contexto atual (a execução em que as etapas são registradas)
+        futuros = [pool.submit(contextvars.copy_context().run, _carregar_fonte,
+                               nome, url, processar, snapshot, partida_rapida, timeout, anexar)
+                   for nome, url, snapshot in fontes]
+        return [f.result() for f in futuros]
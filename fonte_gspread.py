@@ -0,0 +1,186 @@
+# fonte_gspread.py
+# 🔐 Planilha privada pela API do Google Sheets (conta de serviço), lendo só as colunas usadas
+#
+# Alternativa ao CSV publicado, configurada em fontes.json:
+#   {"nome": "Squad C", "tipo": "gspread", "planilha": "<ID>", "aba": "Cards", "credenciais": "conta.json"}
+#
+# O cabeçalho (linha 1) é lido primeiro; depois um único batch_get busca apenas os
+# intervalos A1 das colunas obrigatórias. Com snapshot, busca só as linhas depois da
+# última conhecida (mais ela, para conferir que o histórico não mudou).
+
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from fonte_dados import SnapshotLocal, carregar_snapshot, marcar_versao
+from inicializacao import importar
+from ingestao import TIPOS_COLUNAS, resolver_colunas
+from instrumentacao import etapa
+
+ESCOPOS = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+ARQUIVO_CREDENCIAIS = os.environ.get("DASHBOARD_CREDENCIAIS", "credenciais.json")
+# Mesmo lendo só as linhas novas, relê tudo de vez em quando (edições no meio do histórico)
+RELEITURA_COMPLETA = int(os.environ.get("DASHBOARD_GSPREAD_RELEITURA", "3600"))
+
+
+def cliente_sheets(info_credenciais):
+    """Cliente gspread autenticado por conta de serviço (gspread só é importado aqui)."""
+    gspread = importar("gspread")
+    Credentials = importar("google.oauth2.service_account").Credentials
+    return gspread.authorize(Credentials.from_service_account_info(info_credenciais, scopes=ESCOPOS))
+
+
+def cliente_de_arquivo(caminho=ARQUIVO_CREDENCIAIS):
+    with open(caminho, encoding="utf-8") as f:
+        return cliente_sheets(json.load(f))
+
+
+def letra_coluna(numero):
+    """1 -> A, 27 -> AA."""
+    letras = ""
+    while numero:
+        numero, resto = divmod(numero - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+
+# ----------------------------
+# LEITURA POR COLUNAS
+# ----------------------------
+def ler_colunas_planilha(aba, cabecalho, mapeamento, linha_inicial=2):
+    """
+    Um batch_get com um intervalo por coluna mapeada (ex.: "D2:D"), a partir de
+    `linha_inicial`. Devolve o frame com os nomes obrigatórios, como categorias.
+    """
+    posicoes = {obrigatoria: cabecalho.index(real) + 1 for obrigatoria, real in mapeamento.items()}
+    intervalos = [f"{letra_coluna(p)}{linha_inicial}:{letra_coluna(p)}" for p in posicoes.values()]
+    blocos = aba.batch_get(intervalos, major_dimension="COLUMNS")
+    # Células vazias no fim de uma coluna não vêm na resposta: completa até a maior coluna
+    colunas = [list(bloco[0]) if bloco else [] for bloco in blocos]
+    n_linhas = max((len(c) for c in colunas), default=0)
+    return pd.DataFrame({
+        nome: pd.Series([v if v != "" else None for v in valores] + [None] * (n_linhas - len(valores)),
+                        dtype=TIPOS_COLUNAS[nome])
+        for nome, valores in zip(posicoes, colunas)
+    })
+
+
+def _hash_linhas(bruto, inicio=0, anterior="0"):
+    """
+    Soma (mod 2^64) do hash de cada linha vezes a posição dela na planilha. A leitura
+    incremental continua a soma da anterior a partir da linha `inicio`, então chega ao
+    mesmo valor que a leitura completa das mesmas linhas.
+    """
+    por_linha = pd.util.hash_pandas_object(bruto.astype(object).where(bruto.notna(), None), index=False)
+    posicoes = np.arange(inicio + 1, inicio + len(bruto) + 1, dtype=np.uint64)
+    soma = int(anterior, 16) + int((por_linha.to_numpy() * posicoes).sum(dtype=np.uint64))
+    return f"{soma % 2**64:016x}"
+
+
+def _linha(bruto, posicao):
+    return [None if pd.isna(v) else str(v) for v in bruto.iloc[posicao]] if len(bruto) else None
+
+
+# ----------------------------
+# FONTE
+# ----------------------------
+class FonteGspread:
+    """
+    Uma aba de planilha lida pela API. `cliente` pode ser qualquer objeto com
+    `open_by_key(chave)` -> planilha com `worksheet(nome)` / `sheet1`, cujas abas
+    tenham `row_values(1)` e `batch_get(intervalos, major_dimension=...)`.
+    """
+
+    def __init__(self, planilha, aba=None, credenciais=ARQUIVO_CREDENCIAIS, cliente=None):
+        self.planilha = planilha
+        self.aba = aba
+        self.credenciais = credenciais
+        self._cliente = cliente
+
+    @classmethod
+    def de_config(cls, fonte, cliente=None):
+        return cls(fonte["planilha"], fonte.get("aba"), fonte.get("credenciais", ARQUIVO_CREDENCIAIS), cliente)
+
+    @property
+    def cliente(self):
+        if self._cliente is None:
+            self._cliente = cliente_de_arquivo(self.credenciais)
+        return self._cliente
+
+    def abrir_aba(self):
+        planilha = self.cliente.open_by_key(self.planilha)
+        return planilha.worksheet(self.aba) if self.aba else planilha.sheet1
+
+    def carregar(self, processar, snapshot=None, anexar=None):
+        """
+        Lê a aba e processa; retorna (df, origem) com origem em {"rede", "snapshot"}.
+        `processar(bruto)` recebe o frame com as colunas obrigatórias (avisos da resolução
+        das colunas em `bruto.attrs['avisos']`); `anexar(bruto_novo, df_anterior)` junta
+        só as linhas novas ao snapshot.
+        """
+        snapshot = snapshot or SnapshotLocal()
+        estado = snapshot.carregar_estado()
+        agora = time.time()
+
+        with etapa("busca_gspread") as registro:
+            aba = self.abrir_aba()
+            cabecalho = [str(c) for c in aba.row_values(1)]
+            avisos = []
+            mapeamento = resolver_colunas(cabecalho, avisos)
+
+            reaproveitavel = snapshot.compativel(estado)
+            incremental = (anexar is not None and reaproveitavel and estado.get("tipo") == "gspread"
+                           and estado.get("cabecalho") == cabecalho and estado.get("linhas")
+                           and agora - estado.get("completo_em", 0) < RELEITURA_COMPLETA)
+            bruto = None
+            if incremental:
+                # A última linha conhecida vem junto: se mudou, o histórico foi editado
+                ultima = estado["linhas"] + 1
+                bruto = ler_colunas_planilha(aba, cabecalho, mapeamento, ultima)
+                if _linha(bruto, 0) != estado.get("ultima_linha"):
+                    incremental, bruto = False, None
+            if bruto is None:
+                bruto = ler_colunas_planilha(aba, cabecalho, mapeamento)
+            registro["linhas"] = len(bruto)
+            registro["modo"] = "incremental" if incremental else "completo"
+
+        # Antes de processar: o processamento converte as colunas do frame bruto no lugar
+        ultima_linha = _linha(bruto, -1)
+        if incremental:
+            novas = bruto.iloc[1:].reset_index(drop=True)
+            if novas.empty:
+                estado.update(verificado_em=agora)
+                snapshot.salvar_estado(estado)
+                return carregar_snapshot(snapshot, estado), "snapshot"
+            linhas, hash_dados = estado["linhas"] + len(novas), _hash_linhas(novas, estado["linhas"], estado["hash"])
+            novas.attrs['avisos'] = avisos
+            df = anexar(novas, carregar_snapshot(snapshot, estado))
+            completo_em = estado["completo_em"]
+        else:
+            hash_dados = _hash_linhas(bruto)
+            if reaproveitavel and hash_dados == estado.get("hash"):
+                estado.update(verificado_em=agora, completo_em=agora)
+                snapshot.salvar_estado(estado)
+                return carregar_snapshot(snapshot, estado), "snapshot"
+            bruto.attrs['avisos'] = avisos
+            df = processar(bruto)
+            linhas, completo_em = len(bruto), agora
+
+        estado = {
+            "tipo": "gspread",
+            "planilha": self.planilha,
+            "aba": self.aba,
+            "cabecalho": cabecalho,
+            "linhas": linhas,
+            "ultima_linha": ultima_linha,
+            "hash": hash_dados,
+            "buscado_em": agora,
+            "verificado_em": agora,
+            "completo_em": completo_em,
+            "modo": "incremental" if incremental else "completo",
+        }
+        snapshot.salvar(df, estado)
+        return marcar_versao(df, estado), "rede"
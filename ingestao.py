@@ -0,0 +1,95 @@
+# ingestao.py
+# 📥 Leitura enxuta do CSV: resolve as colunas pelo cabeçalho e lê só elas, tipadas e em blocos
+#
+# O cabeçalho é lido primeiro (uma linha); as colunas obrigatórias são localizadas,
+# inclusive por nome parecido, e o resto do arquivo é lido apenas nessas colunas
+# como categorias. Com `tamanho_bloco`, as linhas chegam em blocos de tamanho fixo.
+
+import csv
+import io
+import os
+
+import pandas as pd
+
+from fonte_dados import TIMEOUT_PADRAO, abrir_fluxo
+
+COLUNAS_OBRIGATORIAS = ['Data de Conclusão', 'Comercial/Capitão']
+# Datas e nomes se repetem muito: como categorias ocupam uma fração do texto em objeto
+TIPOS_COLUNAS = {coluna: "category" for coluna in COLUNAS_OBRIGATORIAS}
+TAMANHO_BLOCO = int(os.environ.get("DASHBOARD_TAMANHO_BLOCO", "200000"))
+
+
+def resolver_colunas(colunas, avisos):
+    """
+    {coluna obrigatória: coluna real}. Quando falta alguma, tenta achar colunas com
+    nome parecido (nunca vazias nem já usadas por outra obrigatória); o dicionário
+    pode voltar incompleto se nem assim encontrar.
+    """
+    colunas = [str(c) for c in colunas]
+    column_mapping = {col: col for col in COLUNAS_OBRIGATORIAS if col in colunas}
+    missing_columns = [col for col in COLUNAS_OBRIGATORIAS if col not in column_mapping]
+    if not missing_columns:
+        return column_mapping
+
+    avisos.append(("warning", f"⚠ Colunas faltantes na planilha: {missing_columns}"))
+    avisos.append(("info", "Tentando identificar colunas similares..."))
+
+    # Tentar encontrar colunas similares (as exatas já foram reservadas acima)
+    usadas = set(column_mapping.values())
+    for required in missing_columns:
+        for actual in colunas:
+            nome = actual.strip().lower()
+            if not nome or actual in usadas:
+                continue
+            if required.lower() in nome or nome in required.lower():
+                column_mapping[required] = actual
+                usadas.add(actual)
+                break
+
+    if len(column_mapping) == len(COLUNAS_OBRIGATORIAS):
+        avisos.append(("success", "✅ Colunas mapeadas com sucesso!"))
+    return {col: column_mapping[col] for col in COLUNAS_OBRIGATORIAS if col in column_mapping}
+
+
+# ----------------------------
+# FLUXO E CABEÇALHO
+# ----------------------------
+def abrir_csv(fonte, timeout=TIMEOUT_PADRAO):
+    """Fluxo binário para bytes, caminho, URL (lida em streaming) ou objeto de arquivo."""
+    if isinstance(fonte, (bytes, bytearray)):
+        return io.BytesIO(fonte)
+    if isinstance(fonte, str) and fonte.startswith(("http://", "https://")):
+        return abrir_fluxo(fonte, timeout)
+    if isinstance(fonte, (str, os.PathLike)):
+        return open(fonte, "rb")
+    return fonte
+
+
+def ler_cabecalho(fluxo):
+    """Consome só a primeira linha do fluxo e devolve os nomes das colunas."""
+    linha = fluxo.readline().decode("utf-8-sig")
+    return next(csv.reader([linha]), [])
+
+
+def ler_colunas(fluxo, cabecalho, mapeamento, tamanho_bloco=None):
+    """
+    Lê o restante do fluxo (após o cabeçalho) apenas nas colunas de `mapeamento`,
+    já renomeadas para os nomes obrigatórios. Com `tamanho_bloco`, devolve um iterador de blocos.
+    """
+    posicoes = {cabecalho.index(real): obrigatoria for obrigatoria, real in mapeamento.items()}
+    try:
+        leitor = pd.read_csv(
+            fluxo,
+            header=None,
+            usecols=sorted(posicoes),
+            dtype={posicao: TIPOS_COLUNAS[nome] for posicao, nome in posicoes.items()},
+            chunksize=tamanho_bloco,
+            encoding="utf-8",
+        )
+    except pd.errors.EmptyDataError:
+        # Só o cabeçalho: nenhuma linha de dados
+        vazio = pd.DataFrame({nome: pd.Series(dtype=TIPOS_COLUNAS[nome]) for nome in posicoes.values()})
+        return vazio if tamanho_bloco is None else iter([vazio])
+    if tamanho_bloco is None:
+        return leitor.rename(columns=posicoes)
+    return (bloco.rename(columns=posicoes) for bloco in leitor)
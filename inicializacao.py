@@ -0,0 +1,96 @@
+# inicializacao.py
+# 🚀 Imports preguiçosos e relatório de tempo de inicialização (imports + primeira renderização)
+#
+# Uso:
+#   python inicializacao.py            # mostra o último relatório salvo pelo dashboard
+#   python inicializacao.py --medir    # mede o import a frio de cada dependência em processos novos
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+INICIO_PROCESSO = time.perf_counter()
+
+from fonte_dados import DIRETORIO_CACHE  # noqa: E402
+
+ARQUIVO_RELATORIO = os.path.join(DIRETORIO_CACHE, "inicializacao.json")
+DEPENDENCIAS = ["streamlit", "pandas", "numpy", "pyarrow", "requests", "plotly.express", "plotly.graph_objects", "gspread"]
+
+_importacoes = {}
+_marcos = {}
+
+
+def importar(nome):
+    """Importa um módulo na primeira vez em que é necessário, registrando quanto custou."""
+    if nome in sys.modules:
+        return sys.modules[nome]
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome)
+    _importacoes[nome] = time.perf_counter() - inicio
+    return modulo
+
+
+def marcar(nome):
+    """Registra (uma única vez por processo) o tempo desde o início até o marco `nome`."""
+    if nome not in _marcos:
+        _marcos[nome] = time.perf_counter() - INICIO_PROCESSO
+    return _marcos[nome]
+
+
+def relatorio():
+    return {
+        "pid": os.getpid(),
+        "gerado_em": time.time(),
+        "importacoes_s": dict(_importacoes),
+        "marcos_s": dict(_marcos),
+    }
+
+
+def salvar_relatorio(caminho=ARQUIVO_RELATORIO):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(relatorio(), f, ensure_ascii=False, indent=2)
+    os.replace(tmp, caminho)
+
+
+def concluir_primeira_renderizacao():
+    """Marca o fim da primeira renderização do processo e salva o relatório (só na primeira vez)."""
+    if "primeira_renderizacao" in _marcos:
+        return
+    marcar("primeira_renderizacao")
+    try:
+        salvar_relatorio()
+    except OSError:
+        pass
+
+
+def medir_importacoes_a_frio(modulos=DEPENDENCIAS):
+    """Tempo de import de cada módulo em um interpretador novo (sem nada em cache)."""
+    tempos = {}
+    for nome in modulos:
+        codigo = f"import time; t = time.perf_counter(); import {nome}; print(time.perf_counter() - t)"
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True)
+        tempos[nome] = float(saida.stdout.strip()) if saida.returncode == 0 else None
+    return tempos
+
+
+def _imprimir(titulo, tempos):
+    print(titulo)
+    for nome, segundos in sorted(tempos.items(), key=lambda i: -(i[1] or 0)):
+        print(f"  {nome:<28} {'indisponível' if segundos is None else f'{segundos * 1000:9.1f} ms'}")
+
+
+if __name__ == "__main__":
+    if "--medir" in sys.argv:
+        _imprimir("Import a frio por dependência:", medir_importacoes_a_frio())
+    elif os.path.exists(ARQUIVO_RELATORIO):
+        with open(ARQUIVO_RELATORIO, encoding="utf-8") as f:
+            dados = json.load(f)
+        _imprimir(f"Imports preguiçosos (pid {dados['pid']}):", dados["importacoes_s"])
+        _imprimir("Marcos desde o início do script:", dados["marcos_s"])
+    else:
+        print(f"Nenhum relatório em {ARQUIVO_RELATORIO}; abra o dashboard uma vez ou use --medir.")
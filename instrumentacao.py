@@ -0,0 +1,190 @@
+# instrumentacao.py
+# 🔬 Tempo, linhas e memória por etapa (carga, processamento, abas), em JSON e no formato Prometheus
+#
+# Cada rerun do dashboard é uma "execução"; as etapas medidas dentro dela (inclusive nas
+# threads de busca das planilhas, que herdam o contexto) ficam agrupadas por execução.
+# Saídas:
+#   .dashboard_cache/instrumentacao.jsonl   # uma linha JSON por etapa e por execução (rotacionado)
+#   .dashboard_cache/metricas.prom          # totais acumulados no formato texto do Prometheus
+
+import contextvars
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_EXECUCOES = 50
+_MB = 2**20
+
+_execucao_atual = contextvars.ContextVar("execucao_atual", default=None)
+_contador = itertools.count(1)
+_recentes = deque(maxlen=MAX_EXECUCOES)
+_totais = {}   # etapa -> {"execucoes", "segundos", "linhas"}
+_execucoes = {"quantidade": 0, "segundos": 0.0}
+_lock = threading.Lock()
+
+logger = logging.getLogger("dashboard.instrumentacao")
+logger.propagate = False
+
+
+def _diretorio():
+    # Import tardio: fonte_dados também é instrumentado por este módulo
+    from fonte_dados import DIRETORIO_CACHE
+    return DIRETORIO_CACHE
+
+
+def _emitir(registro):
+    """Uma linha JSON por registro (o handler em arquivo é criado na primeira emissão)."""
+    if not logger.handlers:
+        try:
+            os.makedirs(_diretorio(), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                os.path.join(_diretorio(), "instrumentacao.jsonl"), maxBytes=5 * _MB, backupCount=2, encoding="utf-8")
+        except OSError:
+            handler = logging.NullHandler()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+
+def memoria_rss():
+    """RSS atual do processo em bytes (Linux); fora dele, o pico via `resource`, ou None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+        except ImportError:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# ----------------------------
+# EXECUÇÕES (UMA POR RERUN)
+# ----------------------------
+class Execucao:
+    def __init__(self, nome):
+        self.id = next(_contador)
+        self.nome = nome
+        self.inicio = time.time()
+        self.segundos = None
+        self.etapas = []
+        self._relogio = time.perf_counter()
+
+
+def iniciar_execucao(nome="rerun"):
+    execucao = Execucao(nome)
+    _execucao_atual.set(execucao)
+    with _lock:
+        _recentes.append(execucao)
+    return execucao
+
+
+def concluir_execucao(execucao, metricas_extras=None):
+    """Fecha a execução, emite o resumo em JSON e regrava o arquivo de métricas."""
+    execucao.segundos = time.perf_counter() - execucao._relogio
+    with _lock:
+        _execucoes["quantidade"] += 1
+        _execucoes["segundos"] += execucao.segundos
+    _emitir({"tipo": "execucao", "execucao": execucao.id, "nome": execucao.nome,
+             "segundos": execucao.segundos, "etapas": len(execucao.etapas)})
+    try:
+        salvar_metricas(metricas_extras)
+    except OSError:
+        pass
+    return execucao
+
+
+def execucoes_recentes(concluidas=True):
+    with _lock:
+        return [e for e in _recentes if e.segundos is not None or not concluidas]
+
+
+# ----------------------------
+# ETAPAS
+# ----------------------------
+@contextmanager
+def etapa(nome, linhas=None):
+    """
+    Mede o bloco: tempo de parede, linhas processadas (pode ser preenchido dentro do
+    bloco via `registro["linhas"]`) e variação do RSS do processo (aproximada: inclui
+    o que outras threads alocarem no mesmo intervalo).
+    """
+    registro = {"etapa": nome, "linhas": linhas}
+    rss_inicio = memoria_rss()
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro["segundos"] = time.perf_counter() - inicio
+        rss_fim = memoria_rss()
+        registro["memoria_delta_mb"] = (rss_fim - rss_inicio) / _MB if rss_inicio is not None and rss_fim is not None else None
+        registrar(registro)
+
+
+def registrar(registro):
+    execucao = _execucao_atual.get()
+    registro = {"tipo": "etapa", "execucao": execucao.id if execucao else None,
+                "thread": threading.current_thread().name, **registro}
+    with _lock:
+        if execucao is not None:
+            execucao.etapas.append(registro)
+        total = _totais.setdefault(registro["etapa"], {"execucoes": 0, "segundos": 0.0, "linhas": 0})
+        total["execucoes"] += 1
+        total["segundos"] += registro.get("segundos") or 0.0
+        total["linhas"] += registro.get("linhas") or 0
+    _emitir(registro)
+    return registro
+
+
+def totais_por_etapa():
+    with _lock:
+        return {nome: dict(total) for nome, total in _totais.items()}
+
+
+# ----------------------------
+# FORMATO PROMETHEUS
+# ----------------------------
+def _rotulo_etapa(nome):
+    return '{etapa="%s"}' % nome.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def texto_prometheus(metricas_extras=None):
+    linhas = []
+
+    def metrica(nome, tipo, ajuda, amostras):
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for rotulos, valor in amostras:
+            linhas.append(f"{nome}{rotulos} {valor}")
+
+    totais = totais_por_etapa()
+    metrica("dashboard_etapa_segundos_total", "counter", "Tempo acumulado por etapa",
+            [(_rotulo_etapa(n), f"{t['segundos']:.6f}") for n, t in sorted(totais.items())])
+    metrica("dashboard_etapa_execucoes_total", "counter", "Vezes que cada etapa rodou",
+            [(_rotulo_etapa(n), t["execucoes"]) for n, t in sorted(totais.items())])
+    metrica("dashboard_etapa_linhas_total", "counter", "Linhas processadas por etapa",
+            [(_rotulo_etapa(n), t["linhas"]) for n, t in sorted(totais.items())])
+    with _lock:
+        execucoes = dict(_execucoes)
+    metrica("dashboard_execucoes_total", "counter", "Reruns concluídos", [("", execucoes["quantidade"])])
+    metrica("dashboard_execucao_segundos_total", "counter", "Tempo acumulado dos reruns",
+            [("", f"{execucoes['segundos']:.6f}")])
+    for nome, valor in sorted((metricas_extras or {}).items()):
+        metrica(f"dashboard_{nome}", "gauge", nome.replace("_", " "), [("", valor)])
+    return "\n".join(linhas) + "\n"
+
+
+def salvar_metricas(metricas_extras=None, caminho=None):
+    caminho = caminho or os.environ.get("DASHBOARD_METRICAS", os.path.join(_diretorio(), "metricas.prom"))
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(texto_prometheus(metricas_extras))
+    os.replace(tmp, caminho)
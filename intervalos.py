@@ -0,0 +1,102 @@
+# intervalos.py
+# 📆 Intervalos de datas quaisquer: "últimos 7 dias", semanas ISO, períodos que cruzam o ano
+#
+# O frame compartilhado fica ordenado por Data de Conclusão (nucleo.compactar_frame), então
+# qualquer intervalo é uma fatia contígua achada por busca binária (np.searchsorted), sem
+# máscara sobre as linhas. As contagens da fatia saem de um bincount dos códigos dos comerciais.
+
+import numpy as np
+import pandas as pd
+
+from ritmo import hoje
+
+_UM_DIA = np.timedelta64(1, "D")
+
+# Atalhos do seletor de intervalo: quantidade de dias até a data de referência (inclusive) ou uma semana
+ATALHOS = {
+    "Últimos 7 dias": 7,
+    "Últimos 30 dias": 30,
+    "Últimos 90 dias": 90,
+    "Semana atual": "semana_atual",
+    "Semana anterior": "semana_anterior",
+    "Personalizado": None,
+}
+
+
+def inicio_semana(dias):
+    """Segunda-feira da semana de cada dia (1970-01-01 foi uma quinta-feira)."""
+    dias = np.asarray(dias, dtype="datetime64[D]")
+    return dias - (dias.astype(np.int64) + 3) % 7
+
+
+def semana_iso(dias):
+    """Rótulos ISO 8601 ("2025-W01") de cada dia; a semana pertence ao ano da sua quinta-feira."""
+    quinta = inicio_semana(dias) + 3
+    ano = quinta.astype("datetime64[Y]")
+    numero = (quinta - ano.astype("datetime64[D]")).astype(np.int64) // 7 + 1
+    return np.char.add(np.char.add((ano.astype(np.int64) + 1970).astype(str), "-W"),
+                       np.char.zfill(numero.astype(str), 2))
+
+
+def intervalo_do_atalho(atalho, data_referencia=None):
+    """(início, fim) inclusivos do atalho; None para "Personalizado"."""
+    data_referencia = np.datetime64(data_referencia or hoje(), "D")
+    regra = ATALHOS[atalho]
+    if regra is None:
+        return None
+    if regra == "semana_atual":
+        return inicio_semana(data_referencia), data_referencia
+    if regra == "semana_anterior":
+        segunda = inicio_semana(data_referencia) - 7
+        return segunda, segunda + 6
+    return data_referencia - (regra - 1), data_referencia
+
+
+class IndiceDatas:
+    """
+    Datas (em dias) ordenadas e os códigos dos comerciais na mesma ordem. Frames fora de
+    ordem (snapshots antigos) são ordenados na construção.
+    """
+
+    def __init__(self, dias, codigos, comerciais):
+        self.dias = np.asarray(dias, dtype="datetime64[D]")
+        self.codigos = np.asarray(codigos, dtype=np.int64)
+        self.comerciais = np.asarray(comerciais, dtype=object)
+        self._indice_comercial = {c: i for i, c in enumerate(self.comerciais)}
+
+    @classmethod
+    def construir(cls, df, coluna_data="Data de Conclusão", coluna_comercial="Comercial_Padronizado"):
+        dias = df[coluna_data].to_numpy().astype("datetime64[D]")
+        codigos, comerciais = pd.factorize(df[coluna_comercial].to_numpy(), sort=True)
+        if len(dias) and (dias[1:] < dias[:-1]).any():
+            ordem = np.argsort(dias, kind="stable")
+            dias, codigos = dias[ordem], codigos[ordem]
+        return cls(dias, codigos, comerciais)
+
+    def posicoes(self, inicio, fim):
+        """(a, b) tais que as linhas de `inicio` a `fim` (dias inclusivos) são [a, b)."""
+        a = np.searchsorted(self.dias, np.datetime64(inicio, "D"), side="left")
+        b = np.searchsorted(self.dias, np.datetime64(fim, "D") + _UM_DIA, side="left")
+        return int(a), int(max(a, b))
+
+    def _mascara_comerciais(self, comerciais):
+        mascara = np.zeros(len(self.comerciais), dtype=bool)
+        if comerciais is None:
+            mascara[:] = True
+        else:
+            mascara[[self._indice_comercial[c] for c in comerciais if c in self._indice_comercial]] = True
+        return mascara
+
+    def realizado_por_comercial(self, inicio, fim):
+        a, b = self.posicoes(inicio, fim)
+        contagens = np.bincount(self.codigos[a:b], minlength=len(self.comerciais))
+        return pd.Series(contagens, index=self.comerciais, name="Realizado")
+
+    def realizado_por_dia(self, inicio, fim, comerciais=None):
+        """Conclusões de cada dia de `inicio` a `fim` (inclusive), somando os comerciais escolhidos."""
+        inicio = np.datetime64(inicio, "D")
+        n_dias = max(int((np.datetime64(fim, "D") - inicio).astype(np.int64)) + 1, 0)
+        a, b = self.posicoes(inicio, fim)
+        dentro = self._mascara_comerciais(comerciais)[self.codigos[a:b]]
+        deslocamento = (self.dias[a:b][dentro] - inicio).astype(np.int64)
+        return np.bincount(deslocamento, minlength=n_dias)
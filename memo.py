@@ -0,0 +1,128 @@
+# memo.py
+# 🧠 Memoização limitada (LRU por número de itens e por bytes) das visões do dashboard
+#
+# Cada visão (tabelas + figuras Plotly já serializadas em JSON) é guardada pela chave
+# (visão, versão dos dados, assinatura das metas, ano, meses, comerciais). Um rerun
+# com os mesmos filtros pula o pandas e a construção/validação das figuras.
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from cubo import MESES
+from inicializacao import importar
+
+MAX_ITENS_PADRAO = int(os.environ.get("DASHBOARD_MEMO_ITENS", "256"))
+MAX_BYTES_PADRAO = int(os.environ.get("DASHBOARD_MEMO_MB", "64")) * 2**20
+
+
+def tamanho_aproximado(valor):
+    """Bytes ocupados por tabelas, strings JSON e contêineres delas (aproximação)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(k) + tamanho_aproximado(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def chave_filtros(visao, versao_dados, assinatura_metas, ano=None, meses=None, comerciais=None):
+    """
+    Chave canônica do estado dos filtros. Meses vão na ordem do calendário e comerciais
+    em ordem alfabética: a ordem de seleção nos widgets não muda o resultado.
+    """
+    return (
+        visao,
+        versao_dados,
+        assinatura_metas,
+        None if ano is None else int(ano),
+        None if meses is None else tuple(sorted(meses, key=MESES.index)),
+        None if comerciais is None else tuple(sorted(map(str, comerciais))),
+    )
+
+
+# ----------------------------
+# CACHE LRU
+# ----------------------------
+class CacheLRU:
+    """
+    LRU limitado por itens e por bytes, seguro entre threads (as sessões do Streamlit
+    rodam em threads do mesmo processo). O cálculo roda fora do lock.
+    """
+
+    def __init__(self, max_itens=MAX_ITENS_PADRAO, max_bytes=MAX_BYTES_PADRAO):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()   # chave -> (valor, bytes)
+        self._lock = threading.Lock()
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def obter(self, chave, padrao=None):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return padrao
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def guardar(self, chave, valor):
+        tamanho = tamanho_aproximado(valor)
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self.bytes_usados -= anterior[1]
+            if tamanho > self.max_bytes:
+                return valor  # maior que o cache inteiro: não guarda
+            self._itens[chave] = (valor, tamanho)
+            self.bytes_usados += tamanho
+            while len(self._itens) > self.max_itens or self.bytes_usados > self.max_bytes:
+                _, (_, tamanho_despejado) = self._itens.popitem(last=False)
+                self.bytes_usados -= tamanho_despejado
+                self.despejos += 1
+        return valor
+
+    def obter_ou_calcular(self, chave, calcular):
+        faltando = object()
+        valor = self.obter(chave, faltando)
+        if valor is faltando:
+            valor = self.guardar(chave, calcular())
+        return valor
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "bytes": self.bytes_usados,
+                "max_bytes": self.max_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "despejos": self.despejos,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
+
+
+# ----------------------------
+# FIGURAS
+# ----------------------------
+def serializar_figura(fig):
+    return fig.to_json()
+
+
+def restaurar_figura(fig_json):
+    """Figura a partir do JSON guardado, sem revalidar (já foi validada ao ser construída)."""
+    go = importar("plotly.graph_objects")
+    return go.Figure(json.loads(fig_json), _validate=False)
@@ -0,0 +1,145 @@
+# metas.py
+# 🎯 Metas mensais (Ano × Mês × Comercial) carregadas de metas.json
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from cubo import _INDICE_MES, mascara_meses
+from ritmo import FERIADOS
+
+ARQUIVO_METAS = os.environ.get(
+    "DASHBOARD_METAS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "metas.json"),
+)
+VERSOES_SUPORTADAS = {1}
+
+
+class MatrizMetas:
+    """
+    Metas em um array (anos × 12 × comerciais). Anos sem entrada em `por_ano`
+    usam a matriz `padrao` (12 × comerciais).
+    """
+
+    def __init__(self, comerciais, padrao, anos=(), por_ano=None, versao=1, assinatura=None):
+        self.comerciais = np.asarray(comerciais, dtype=object)
+        self.padrao = np.asarray(padrao, dtype=np.int64)
+        self.anos = np.asarray(anos, dtype=np.int64)
+        self.por_ano = np.asarray(por_ano if por_ano is not None else np.zeros((0, 12, len(comerciais))), dtype=np.int64)
+        self.versao = versao
+        self.assinatura = assinatura  # sha256 do metas.json de origem
+        self._indice_ano = {int(a): i for i, a in enumerate(self.anos)}
+
+    @classmethod
+    def de_config(cls, config):
+        versao = config.get("versao")
+        if versao not in VERSOES_SUPORTADAS:
+            raise ValueError(f"Versão de metas não suportada: {versao!r}")
+
+        padrao_cfg = config.get("padrao", {})
+        por_ano_cfg = config.get("por_ano", {})
+        meses_cfg = list(padrao_cfg.items()) + [i for ano in por_ano_cfg.values() for i in ano.items()]
+        invalidos = sorted({mes for mes, _ in meses_cfg if mes not in _INDICE_MES})
+        if invalidos:
+            raise ValueError(f"Meses inválidos em metas: {invalidos}")
+        comerciais = sorted({nome for _, metas in meses_cfg for nome in metas})
+        indice = {c: i for i, c in enumerate(comerciais)}
+
+        def _preencher(matriz, meses):
+            for mes, metas in meses.items():
+                for nome, valor in metas.items():
+                    matriz[_INDICE_MES[mes], indice[nome]] = valor
+
+        padrao = np.zeros((12, len(comerciais)), dtype=np.int64)
+        _preencher(padrao, padrao_cfg)
+
+        anos = sorted(int(a) for a in por_ano_cfg)
+        por_ano = np.repeat(padrao[np.newaxis], len(anos), axis=0)
+        for i, ano in enumerate(anos):
+            _preencher(por_ano[i], por_ano_cfg[str(ano)])
+        return cls(comerciais, padrao, anos, por_ano, versao)
+
+    def matriz_ano(self, ano):
+        i = self._indice_ano.get(int(ano))
+        return self.padrao if i is None else self.por_ano[i]
+
+    def meta_por_comercial(self, ano, meses):
+        return pd.Series(self.matriz_ano(ano)[mascara_meses(meses)].sum(axis=0), index=self.comerciais, name="Meta")
+
+    def meta_diaria(self, inicio, fim, feriados=FERIADOS):
+        """
+        Meta de cada dia de `inicio` a `fim` (inclusive) por comercial: a meta do mês
+        dividida pelos dias úteis do mês nos dias úteis, zero nos demais.
+        Retorna (dias, array dias × comerciais).
+        """
+        dias = np.arange(np.datetime64(inicio, "D"), np.datetime64(fim, "D") + 1, dtype="datetime64[D]")
+        meses, posicao = np.unique(dias.astype("datetime64[M]"), return_inverse=True)
+        if not len(meses):
+            return dias, np.zeros((0, len(self.comerciais)))
+        uteis_mes = np.busday_count(meses.astype("datetime64[D]"), (meses + 1).astype("datetime64[D]"), holidays=feriados)
+        numeros = meses.astype(np.int64)
+        metas_mes = np.stack([self.matriz_ano(n // 12 + 1970)[n % 12] for n in numeros])
+        util = np.is_busday(dias, holidays=feriados)
+        return dias, np.where(util[:, None], metas_mes[posicao] / uteis_mes[posicao][:, None], 0.0)
+
+    def meta_proporcional(self, inicio, fim, feriados=FERIADOS):
+        """Meta do intervalo por comercial, proporcional aos dias úteis de cada mês que ele cobre."""
+        _, diaria = self.meta_diaria(inicio, fim, feriados)
+        return pd.Series(diaria.sum(axis=0), index=self.comerciais, name="Meta")
+
+
+@lru_cache(maxsize=4)
+def _carregar(caminho, _mtime):
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    metas = MatrizMetas.de_config(json.loads(conteudo))
+    metas.assinatura = hashlib.sha256(conteudo).hexdigest()
+    return metas
+
+
+def carregar_metas(caminho=ARQUIVO_METAS):
+    """Lê metas.json (recarrega automaticamente quando o arquivo muda)."""
+    return _carregar(caminho, os.path.getmtime(caminho))
+
+
+def tabela_atingimento(cubo, metas, ano, meses, comerciais=None):
+    """
+    Realizado, Meta, Atingimento (%) e Diferença por comercial, incluindo quem
+    tem meta no período mas nenhuma venda.
+    """
+    nomes = nomes_tabela(cubo.comerciais, metas, comerciais)
+    realizado = cubo.realizado_por_comercial(ano, meses, nomes, incluir_zeros=True).reindex(nomes, fill_value=0).to_numpy()
+    meta = metas.meta_por_comercial(ano, meses).reindex(nomes, fill_value=0).to_numpy()
+    return tabela_por_comercial(nomes, realizado, meta)
+
+
+def nomes_tabela(comerciais_dados, metas, comerciais=None):
+    """Comerciais com dados ou com meta, restritos ao filtro `comerciais`."""
+    nomes = np.union1d(np.asarray(comerciais_dados).astype(str), metas.comerciais.astype(str))
+    if comerciais is not None:
+        nomes = nomes[np.isin(nomes, list(comerciais))]
+    return nomes
+
+
+def atingimento(realizado, meta):
+    """Realizado / meta em %, elemento a elemento; NaN onde não há meta."""
+    realizado, meta = np.asarray(realizado, dtype=float), np.asarray(meta, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(meta > 0, realizado / meta * 100, np.nan)
+
+
+def tabela_por_comercial(nomes, realizado, meta):
+    """Tabela de atingimento a partir de realizado e meta já alinhados com `nomes`."""
+    tabela = pd.DataFrame({
+        "Comercial_Padronizado": nomes,
+        "Realizado": realizado,
+        "Meta": meta,
+        "Atingimento (%)": atingimento(realizado, meta).round(2),
+        "Diferença": realizado - meta,
+    })
+    tabela = tabela[(tabela["Realizado"] > 0) | (tabela["Meta"] > 0)]
+    return tabela.sort_values("Atingimento (%)", ascending=False, na_position="last", kind="stable").reset_index(drop=True)
@@ -0,0 +1,240 @@
+# normalizacao.py
+# 👥 Padronização dos nomes dos comerciais (aliases -> nome canônico)
+#
+# Cada string distinta passa por: igualdade com um alias → alias contido no nome →
+# distância de edição limitada até um alias (erros de digitação que nenhum alias cobre).
+# As decisões aproximadas podem ficar num arquivo JSON, para cada variante ser avaliada uma vez só;
+# nomes listados em "rejeitados" no mesmo arquivo nunca são aproximados.
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+METODOS = ["exato", "substring", "aproximado", "nao_resolvido"]
+DISTANCIA_MAXIMA = 2
+
+
+def dobrar(texto):
+    """Minúsculas, sem acentos e com espaços simples (para comparar variantes)."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    return " ".join("".join(c for c in texto if not unicodedata.combining(c)).casefold().split())
+
+
+def distancia_limitada(a, b, limite):
+    """Distância de Levenshtein entre `a` e `b`, ou `limite + 1` assim que passar do limite."""
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if min(atual) > limite:
+            return limite + 1
+        anterior = atual
+    return min(anterior[-1], limite + 1)
+
+
+def limite_distancia(alias):
+    # Nomes curtos toleram menos: "Thais" aceita 1 erro, "Danilo Neder" aceita 2
+    return min(DISTANCIA_MAXIMA, len(alias) // 4)
+
+
+# ----------------------------
+# DECISÕES APROXIMADAS EM DISCO
+# ----------------------------
+class DecisoesAproximadas:
+    """
+    {nome bruto: nome canônico ou None} já avaliados por distância de edição, num JSON
+    ligado à assinatura do mapeamento (mudou o mapeamento, as decisões antigas são ignoradas).
+
+    A lista "rejeitados" do mesmo JSON é editada à mão e vale para qualquer assinatura:
+    aproximação errada (ex.: "Natalia" → Natalie) entra nela e o nome fica sem resolver.
+    O arquivo é relido quando muda em disco.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._assinatura = None
+        self._mtime = None
+        self._decisoes = {}
+        self._novas = {}
+        self._rejeitados = frozenset()
+        self._lock = threading.Lock()
+
+    def _ler(self):
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _carregar(self, assinatura):
+        try:
+            mtime = os.stat(self.caminho).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._assinatura == assinatura and self._mtime == mtime:
+            return
+        if self._assinatura != assinatura:
+            self._novas = {}
+        self._assinatura, self._mtime = assinatura, mtime
+        salvo = self._ler()
+        self._rejeitados = frozenset(salvo.get("rejeitados", []))
+        decisoes = salvo.get("decisoes", {}) if salvo.get("assinatura") == assinatura else {}
+        self._decisoes = {**decisoes, **self._novas}
+
+    def rejeitados(self):
+        with self._lock:
+            self._carregar(self._assinatura)
+            return sorted(self._rejeitados)
+
+    def obter(self, assinatura, valor):
+        """(True, decisão) se `valor` já foi avaliado ou foi rejeitado; (False, None) caso contrário."""
+        with self._lock:
+            self._carregar(assinatura)
+            if valor in self._rejeitados:
+                return True, None
+            if valor in self._decisoes:
+                return True, self._decisoes[valor]
+            return False, None
+
+    def guardar(self, assinatura, valor, canonico):
+        with self._lock:
+            self._carregar(assinatura)
+            self._decisoes[valor] = self._novas[valor] = canonico
+
+    def salvar(self):
+        """Grava as decisões novas (somadas às que outro processo tenha gravado nesse meio tempo)."""
+        with self._lock:
+            if not self._novas:
+                return
+            salvo = self._ler()
+            decisoes = salvo.get("decisoes", {}) if salvo.get("assinatura") == self._assinatura else {}
+            decisoes.update(self._novas)
+            try:
+                os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+                tmp = f"{self.caminho}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"assinatura": self._assinatura, "decisoes": decisoes,
+                               "rejeitados": salvo.get("rejeitados", [])}, f, ensure_ascii=False, indent=1)
+                os.replace(tmp, self.caminho)
+                self._mtime = os.stat(self.caminho).st_mtime_ns
+            except OSError:
+                return
+            self._decisoes.update(decisoes)
+            self._rejeitados = frozenset(salvo.get("rejeitados", []))
+            self._novas = {}
+
+
+class ResolvedorAliases:
+    """
+    Resolve cada nome bruto para o nome canônico com a mesma regra do laço original
+    (`str.contains(alias, case=False)` para cada alias, o último alias que casa vence),
+    mas com uma única regex pré-compilada.
+
+    As alternativas ficam em ordem decrescente de prioridade dentro de um lookahead:
+    em cada posição a regex devolve o alias de maior prioridade que começa ali, e o
+    máximo entre as posições é o alias vencedor.
+    """
+
+    def __init__(self, mapeamento):
+        self.aliases = list(mapeamento.keys())
+        self.canonicos = list(mapeamento.values())
+        self.assinatura = hashlib.sha256(json.dumps(list(mapeamento.items())).encode()).hexdigest()[:16]
+        self._exatos = {dobrar(alias): canonico for alias, canonico in mapeamento.items()}
+        self._dobrados = [(dobrar(alias), canonico) for alias, canonico in mapeamento.items()]
+        self._ordem = list(range(len(self.aliases) - 1, -1, -1))
+        alternativas = "|".join(f"({re.escape(self.aliases[i])})" for i in self._ordem)
+        self._padrao = re.compile(f"(?=(?:{alternativas}))", re.IGNORECASE) if self.aliases else None
+
+    def indice_alias(self, valor):
+        """Índice do alias vencedor em `mapeamento` ou -1 se nenhum casar."""
+        if self._padrao is None or not isinstance(valor, str):
+            return -1
+        melhor = -1
+        for m in self._padrao.finditer(valor):
+            melhor = max(melhor, self._ordem[m.lastindex - 1])
+        return melhor
+
+    def aproximar(self, valor):
+        """
+        Canônico do alias mais próximo por distância de edição (comparando com o nome
+        inteiro e com cada trecho do nome com o mesmo número de palavras do alias).
+        Empate entre canônicos diferentes é ambíguo e fica sem resolver.
+        """
+        palavras = dobrar(valor).split()
+        melhor, candidatos = None, set()
+        for alias, canonico in self._dobrados:
+            limite = limite_distancia(alias)
+            if not limite:
+                continue
+            n = len(alias.split())
+            trechos = {" ".join(palavras[i:i + n]) for i in range(max(1, len(palavras) - n + 1))}
+            distancia = min(distancia_limitada(trecho, alias, limite) for trecho in trechos)
+            if distancia > limite:
+                continue
+            if melhor is None or distancia < melhor:
+                melhor, candidatos = distancia, {canonico}
+            elif distancia == melhor:
+                candidatos.add(canonico)
+        return candidatos.pop() if len(candidatos) == 1 else None
+
+    def resolver_com_metodo(self, valor, decisoes=None):
+        """(nome resolvido, método); sem resolução, o nome volta como texto bruto."""
+        if not isinstance(valor, str):
+            return str(valor), "nao_resolvido"
+        canonico = self._exatos.get(dobrar(valor))
+        if canonico is not None:
+            return canonico, "exato"
+        indice = self.indice_alias(valor)
+        if indice >= 0:
+            return self.canonicos[indice], "substring"
+
+        conhecido, canonico = decisoes.obter(self.assinatura, valor) if decisoes else (False, None)
+        if not conhecido:
+            canonico = self.aproximar(valor)
+            if decisoes:
+                decisoes.guardar(self.assinatura, valor, canonico)
+        return (canonico, "aproximado") if canonico else (valor, "nao_resolvido")
+
+    def resolver_contando(self, serie, decisoes=None):
+        """
+        Resolve cada string distinta uma única vez e devolve o resultado pelos códigos (nulos
+        viram "nan", como no `astype(str)` original). Retorna (série, linhas por método,
+        {nome bruto: canônico} das aproximações usadas).
+        """
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        resultados = [self.resolver_com_metodo(v, decisoes) for v in unicos]
+        resolvidos = np.array([nome for nome, _ in resultados] + ["nan"], dtype=object)
+        metodos = np.array([METODOS.index(metodo) for _, metodo in resultados] + [METODOS.index("nao_resolvido")])
+        por_metodo = np.bincount(metodos[codigos], minlength=len(METODOS))
+        if decisoes:
+            decisoes.salvar()
+        aproximados = {v: nome for v, (nome, metodo) in zip(unicos, resultados) if metodo == "aproximado"}
+        return (pd.Series(resolvidos[codigos], index=serie.index, name=serie.name),
+                dict(zip(METODOS, por_metodo.tolist())), aproximados)
+
+
+@lru_cache(maxsize=8)
+def _resolvedor(itens):
+    return ResolvedorAliases(dict(itens))
+
+
+def resolver_nomes(serie, mapeamento, decisoes=None):
+    """
+    Equivalente vetorizado do laço `for nome_ori, nome_pad in NOME_MAPPING.items()`, mais a
+    distância de edição; retorna (série, linhas por método, aproximações).
+    """
+    return _resolvedor(tuple(mapeamento.items())).resolver_contando(serie, decisoes)
+
+
+def somar_metodos(*contagens):
+    return {metodo: sum((c or {}).get(metodo, 0) for c in contagens) for metodo in METODOS}
@@ -0,0 +1,591 @@
+# nucleo.py
+# ⚙️ Núcleo do dashboard sem Streamlit: carga, normalização, agregação e atingimento
+#
+# Tudo aqui é função pura (ou quase: a carga faz I/O de rede/snapshot) e pode ser
+# importado por scripts, benchmarks e pelo próprio dashboard.
+
+import hashlib
+import json
+import os
+import re
+import time
+import tracemalloc
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from comparativo import ComparativoMensal
+from cubo import MESES, CuboContagens
+from datas import adicionar_periodo, converter_datas
+from fonte_dados import DIRETORIO_CACHE, SnapshotLocal, carregar_com_snapshot, carregar_planilha, carregar_varias
+from fonte_gspread import FonteGspread
+from ingestao import COLUNAS_OBRIGATORIAS, TAMANHO_BLOCO, abrir_csv, ler_cabecalho, ler_colunas, resolver_colunas
+from instrumentacao import etapa
+from intervalos import IndiceDatas, semana_iso
+from metas import atingimento, nomes_tabela, tabela_atingimento, tabela_por_comercial
+from normalizacao import DecisoesAproximadas, resolver_nomes, somar_metodos
+from ritmo import RitmoDiario
+
+# ----------------------------
+# CONFIGURAÇÃO
+# ----------------------------
+SHEET_URL = os.environ.get(
+    "DASHBOARD_SHEET_URL",
+    "https://docs.google.com/spreadsheets/d/e/2PACX-1vSlQ9u5x09qR0dAKJsMC-fXTvJWRWPzMrXpaGaojOPblRrJYbx4Q-xalzh2hmf2WtwHRoLVIBOdL_HC/pub?output=csv",
+)
+# Uma planilha por squad: fontes.json = [{"nome": "Squad A", "url": "..."}, ...]
+ARQUIVO_FONTES = os.environ.get(
+    "DASHBOARD_FONTES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fontes.json"),
+)
+FONTE_PADRAO = "Principal"
+# Tipo de fonte -> campo obrigatório em fontes.json
+TIPOS_FONTE = {"csv": "url", "gspread": "planilha"}
+
+# Planilha que só cresce no fim: processa apenas as linhas novas (DASHBOARD_INCREMENTAL=0 desliga)
+INCREMENTAL = os.environ.get("DASHBOARD_INCREMENTAL", "1") != "0"
+
+# CSV acima deste tamanho (bytes) é lido em blocos de TAMANHO_BLOCO linhas (0 = sempre em blocos)
+LIMIAR_BLOCOS = int(os.environ.get("DASHBOARD_LIMIAR_BLOCOS", str(64 * 2**20)))
+
+# Períodos pré-definidos da aba anual
+PERIODOS = {
+    "Ano Completo": MESES,
+    "1º Semestre": ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho"],
+    "2º Semestre": ["Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"],
+}
+
+# ----------------------------
+# MAPEAMENTO DE NOMES (baseado na planilha)
+# ----------------------------
+NOME_MAPPING = {
+    'Werbet': 'Werbet', 'Werker Alencar': 'Werbet', 'Werbet Alencar': 'Werbet',
+    'Pamela': 'Pamela', 'Pamela Crédita': 'Pamela', 'Pamela Cri': 'Pamela', 'Pamela Cristina': 'Pamela',
+    'Ana Clara': 'Ana Clara', 'Ana Clara Souza': 'Ana Clara',
+    'Danilo': 'Danilo', 'Danilo Neder': 'Danilo',
+    'Natalie': 'Natalie', 'Natalie Lopes': 'Natalie',
+    'Andressa': 'Andressa',
+    'Rafael': 'Rafael', 'Rafael Miguel': 'Rafael',
+    'Thaís': 'Thaís', 'Thais Mendonca': 'Thaís', 'Thais': 'Thaís', 'Thaki': 'Thaís'
+}
+# Variantes sem alias resolvidas por distância de edição (cada uma é avaliada uma vez)
+DECISOES_NOMES = DecisoesAproximadas(os.path.join(DIRETORIO_CACHE, "nomes_aproximados.json"))
+
+# Módulos cujo código decide o frame processado: mudou algum deles (ou o mapeamento de
+# nomes, ou os nomes rejeitados), os snapshots antigos deixam de ser reaproveitados e a planilha é reprocessada
+MODULOS_PROCESSAMENTO = ("nucleo.py", "datas.py", "ingestao.py", "normalizacao.py", "fonte_gspread.py")
+
+
+@lru_cache(maxsize=1)
+def _hash_codigo_processamento():
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    codigo = hashlib.sha256()
+    for modulo in MODULOS_PROCESSAMENTO:
+        with open(os.path.join(raiz, modulo), "rb") as f:
+            codigo.update(f.read())
+    return codigo.hexdigest()
+
+
+def assinatura_processamento(mapeamento=NOME_MAPPING, decisoes=DECISOES_NOMES):
+    """Código das etapas + mapeamento de nomes + nomes rejeitados; gravada junto de cada snapshot."""
+    rejeitados = decisoes.rejeitados() if decisoes else []
+    conteudo = json.dumps([_hash_codigo_processamento(), sorted(mapeamento.items()), rejeitados], ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:16]
+
+
+class PlanilhaInvalida(Exception):
+    """Planilha sem dados aproveitáveis; `nivel` é o tipo de alerta do Streamlit a exibir."""
+
+    def __init__(self, mensagem, nivel="warning"):
+        super().__init__(mensagem)
+        self.nivel = nivel
+
+
+# ----------------------------
+# ETAPAS DO PROCESSAMENTO
+# ----------------------------
+def exigir_colunas(column_mapping):
+    if len(column_mapping) != len(COLUNAS_OBRIGATORIAS):
+        raise PlanilhaInvalida("❌ Não foi possível mapear todas as colunas necessárias.", nivel="error")
+    return column_mapping
+
+
+def mapear_colunas(df, avisos):
+    """Garante as colunas obrigatórias, tentando achar colunas com nome parecido."""
+    column_mapping = exigir_colunas(resolver_colunas(df.columns, avisos))
+    renomear = {v: k for k, v in column_mapping.items() if v != k}
+    return df.rename(columns=renomear) if renomear else df
+
+
+def etapa_datas(df, avisos):
+    # Formatos conhecidos, apenas strings distintas
+    df['Data de Conclusão'], datas_invalidas = converter_datas(df['Data de Conclusão'])
+    df = df[df['Data de Conclusão'].notna()].copy()
+
+    if df.empty:
+        raise PlanilhaInvalida("⚠ Nenhuma data válida encontrada após processamento.")
+    if datas_invalidas:
+        avisos.append(aviso_datas_invalidas(datas_invalidas))
+
+    # Ano e mês (número + rótulo em português, sem depender do locale)
+    df = adicionar_periodo(df)
+    df.attrs['datas_invalidas'] = datas_invalidas
+    return df
+
+
+def aviso_datas_invalidas(quantidade):
+    return ("info", f"ℹ️ {quantidade} linha(s) com data inválida ou vazia foram descartadas.")
+
+
+def etapa_nomes(df, mapeamento=NOME_MAPPING, avisos=None, decisoes=DECISOES_NOMES):
+    # Padronizar nomes e manter apenas comerciais conhecidos
+    df['Comercial_Padronizado'], por_metodo, aproximados = resolver_nomes(df['Comercial/Capitão'], mapeamento, decisoes)
+    if avisos is not None:
+        avisos.extend(aviso_nome_aproximado(bruto, canonico) for bruto, canonico in aproximados.items())
+    df = df[df['Comercial_Padronizado'].isin(list(mapeamento.values()))]
+    # Linhas por método (exato, substring, aproximado, nao_resolvido): nomes novos aparecem aqui
+    df.attrs['resolucao_nomes'] = por_metodo
+    return df
+
+
+def aviso_nome_aproximado(bruto, canonico):
+    return ("info", f"ℹ️ Nome '{bruto}' não está no mapeamento e foi tratado como {canonico}.")
+
+
+def processar_dados(df, avisos=None):
+    """Processa o CSV bruto sem chamar o Streamlit; avisos ficam em `df.attrs['avisos']`."""
+    avisos = [] if avisos is None else avisos
+    if df.empty:
+        raise PlanilhaInvalida("⚠ A planilha está vazia ou não foi possível carregar os dados.")
+
+    with etapa("colunas", linhas=len(df)):
+        df = mapear_colunas(df, avisos)
+    with etapa("datas", linhas=len(df)):
+        df = etapa_datas(df, avisos)
+    with etapa("nomes", linhas=len(df)) as registro:
+        df = etapa_nomes(df, avisos=avisos)
+        registro["metodos"] = df.attrs['resolucao_nomes']
+    df.attrs['avisos'] = avisos
+    return df
+
+
+def ler_csv_enxuto(fluxo, avisos, tamanho_bloco=None):
+    """Resolve as colunas pelo cabeçalho e lê só elas (categorias); em blocos se `tamanho_bloco`."""
+    cabecalho = ler_cabecalho(fluxo)
+    if not cabecalho:
+        raise PlanilhaInvalida("⚠ A planilha está vazia ou não foi possível carregar os dados.")
+    column_mapping = exigir_colunas(resolver_colunas(cabecalho, avisos))
+    return ler_colunas(fluxo, cabecalho, column_mapping, tamanho_bloco)
+
+
+def processar_csv(conteudo):
+    # Só as colunas usadas entram no frame (e no cache / snapshot); as demais nem são lidas
+    if len(conteudo) > LIMIAR_BLOCOS:
+        return processar_csv_em_blocos(conteudo)
+    avisos = []
+    with etapa("leitura_csv") as registro:
+        df = ler_csv_enxuto(abrir_csv(conteudo), avisos)
+        registro["linhas"] = linhas_lidas = len(df)
+    df = processar_dados(df, avisos)
+    df.attrs['linhas_lidas'] = linhas_lidas
+    return df
+
+
+def processar_csv_em_blocos(conteudo, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Como `processar_csv`, mas lendo e normalizando um bloco por vez: o frame bruto
+    completo nunca existe, só o bloco atual e as linhas já normalizadas.
+    """
+    avisos = []
+    partes = []
+    linhas = datas_invalidas = 0
+    resolucao_nomes = somar_metodos()
+    with etapa("leitura_em_blocos") as registro:
+        for lidas, _, bloco, invalidas in normalizar_blocos(abrir_csv(conteudo), avisos, tamanho_bloco):
+            linhas += lidas
+            datas_invalidas += invalidas
+            resolucao_nomes = somar_metodos(resolucao_nomes, bloco.attrs['resolucao_nomes'])
+            partes.append(bloco)
+        registro["linhas"] = linhas
+        registro["blocos"] = len(partes)
+
+    if not linhas:
+        raise PlanilhaInvalida("⚠ A planilha está vazia ou não foi possível carregar os dados.")
+    if datas_invalidas == linhas:
+        raise PlanilhaInvalida("⚠ Nenhuma data válida encontrada após processamento.")
+    if datas_invalidas:
+        avisos.append(aviso_datas_invalidas(datas_invalidas))
+    df = concatenar_frames(*partes)
+    df.attrs = {
+        'avisos': list(dict.fromkeys(avisos)),
+        'datas_invalidas': datas_invalidas,
+        'linhas_lidas': linhas,
+        'resolucao_nomes': resolucao_nomes,
+    }
+    return df
+
+
+def concatenar_frames(*frames):
+    """Concatena mantendo como categoria as colunas categóricas com categorias diferentes."""
+    df = pd.concat(frames, ignore_index=True)
+    for coluna in df.columns:
+        tipos = [frame[coluna].dtype for frame in frames]
+        if all(isinstance(t, pd.CategoricalDtype) for t in tipos) and len(set(tipos)) > 1:
+            df[coluna] = union_categoricals([frame[coluna] for frame in frames])
+    return df
+
+
+def processar_frame(bruto):
+    """Como `processar_csv`, para linhas que já chegaram em colunas (ex.: API do Sheets)."""
+    df = processar_dados(bruto, list(bruto.attrs.get('avisos', [])))
+    df.attrs['linhas_lidas'] = len(bruto)
+    return df
+
+
+def anexar_csv(cauda, anterior):
+    """
+    Modo incremental: processa só a cauda (cabeçalho + linhas novas) e junta ao frame
+    já processado. Sem nenhuma linha nova válida, devolve o frame anterior.
+    """
+    avisos = []
+    bruto = ler_csv_enxuto(abrir_csv(cauda), avisos)
+    bruto.attrs['avisos'] = avisos
+    return anexar_frame(bruto, anterior)
+
+
+def anexar_frame(bruto, anterior):
+    """Processa as linhas novas (já em colunas) e junta ao frame anterior."""
+    with etapa("processamento_incremental") as registro:
+        avisos = list(bruto.attrs.get('avisos', []))
+        registro["linhas"] = len(bruto)
+        try:
+            novo = processar_dados(bruto, avisos)
+            invalidas_novas = novo.attrs.get('datas_invalidas', 0)
+        except PlanilhaInvalida:
+            novo = None   # só linhas vazias / sem nenhuma data válida
+            invalidas_novas = len(bruto)
+
+        df = anterior if novo is None or novo.empty else concatenar_frames(anterior, novo)
+        # Avisos repetidos aparecem uma vez; a contagem de datas inválidas é somada
+        invalidas_anteriores = anterior.attrs.get('datas_invalidas', 0)
+        separados = {aviso_datas_invalidas(invalidas_anteriores), aviso_datas_invalidas(invalidas_novas)}
+        avisos = [tuple(aviso) for aviso in anterior.attrs.get('avisos', [])] + avisos
+        avisos = [aviso for aviso in dict.fromkeys(avisos) if aviso not in separados]
+        if invalidas_anteriores + invalidas_novas:
+            avisos.append(aviso_datas_invalidas(invalidas_anteriores + invalidas_novas))
+        df.attrs = {
+            'avisos': avisos,
+            'datas_invalidas': invalidas_anteriores + invalidas_novas,
+            'linhas_lidas': anterior.attrs.get('linhas_lidas', len(anterior)) + len(bruto),
+            'resolucao_nomes': somar_metodos(anterior.attrs.get('resolucao_nomes'),
+                                             novo.attrs.get('resolucao_nomes') if novo is not None else None),
+        }
+        return df
+
+
+def normalizar_blocos(fluxo, avisos, tamanho_bloco=TAMANHO_BLOCO, mapeamento=NOME_MAPPING):
+    """(linhas lidas, bytes do bloco bruto, bloco normalizado, datas inválidas) para cada bloco do fluxo."""
+    for bloco in ler_csv_enxuto(fluxo, avisos, tamanho_bloco):
+        linhas, memoria = len(bloco), int(bloco.memory_usage(deep=True).sum())
+        bloco['Data de Conclusão'], invalidas = converter_datas(bloco['Data de Conclusão'])
+        bloco = adicionar_periodo(bloco[bloco['Data de Conclusão'].notna()].copy())
+        yield linhas, memoria, etapa_nomes(bloco, mapeamento, avisos), invalidas
+
+
+def processar_em_blocos(fonte, tamanho_bloco=TAMANHO_BLOCO, mapeamento=NOME_MAPPING, medir_memoria=False):
+    """
+    Ingestão em fluxo (bytes, arquivo ou URL) direto para o cubo de contagens: cada bloco
+    é normalizado e somado ao cubo, então o pico de memória depende do bloco, não da planilha.
+    Retorna (cubo, estatísticas).
+    """
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    avisos = []
+    fluxo = abrir_csv(fonte)
+    cubo = CuboContagens.somar([])
+    linhas = linhas_validas = datas_invalidas = blocos = pico_bloco = pico_memoria = 0
+    resolucao_nomes = somar_metodos()
+    try:
+        for lidas, memoria, bloco, invalidas in normalizar_blocos(fluxo, avisos, tamanho_bloco, mapeamento):
+            blocos += 1
+            linhas += lidas
+            pico_bloco = max(pico_bloco, memoria)
+            datas_invalidas += invalidas
+            resolucao_nomes = somar_metodos(resolucao_nomes, bloco.attrs['resolucao_nomes'])
+            linhas_validas += len(bloco)
+            cubo = CuboContagens.somar([cubo, CuboContagens.construir(bloco)])
+    finally:
+        if fluxo is not fonte:
+            fluxo.close()
+        if medir_memoria:
+            pico_memoria = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if not linhas_validas:
+        raise PlanilhaInvalida("⚠ Nenhuma data válida encontrada após processamento.")
+    if datas_invalidas:
+        avisos.append(aviso_datas_invalidas(datas_invalidas))
+    estatisticas = {
+        "linhas": linhas,
+        "linhas_validas": linhas_validas,
+        "blocos": blocos,
+        "tamanho_bloco": tamanho_bloco,
+        "pico_bloco_mb": pico_bloco / 2**20,
+        "resolucao_nomes": resolucao_nomes,
+        "segundos": time.perf_counter() - inicio,
+        "avisos": list(dict.fromkeys(avisos)),
+    }
+    if medir_memoria:
+        estatisticas["pico_memoria_mb"] = pico_memoria / 2**20
+    return cubo, estatisticas
+
+
+def carregar(url=SHEET_URL, snapshot=None, partida_rapida=True):
+    """
+    Busca condicional + processamento; retorna (df, origem).
+    Com `partida_rapida=False` (modo batch) nunca serve o snapshot sem revalidar antes.
+    """
+    snapshot = snapshot or SnapshotLocal(DIRETORIO_CACHE, assinatura=assinatura_processamento())
+    if partida_rapida:
+        return carregar_planilha(url, processar_csv, snapshot, anexar=anexar_csv if INCREMENTAL else None)
+    return carregar_com_snapshot(url, processar_csv, snapshot, anexar=anexar_csv if INCREMENTAL else None)
+
+
+# ----------------------------
+# VÁRIAS FONTES
+# ----------------------------
+def carregar_config_fontes(caminho=ARQUIVO_FONTES):
+    """
+    Lista de {"nome", "url"} (CSV publicado) ou {"nome", "tipo": "gspread", "planilha", "aba",
+    "credenciais"} (API do Sheets); sem fontes.json, apenas a planilha principal (SHEET_URL).
+    """
+    if not os.path.exists(caminho):
+        return [{"nome": FONTE_PADRAO, "url": SHEET_URL}]
+    with open(caminho, encoding="utf-8") as f:
+        fontes = json.load(f)
+    nomes = [fonte.get("nome") for fonte in fontes]
+    if not fontes or any(not fonte.get("nome") for fonte in fontes):
+        raise ValueError(f"{caminho}: cada fonte precisa de 'nome'")
+    for fonte in fontes:
+        tipo = fonte.get("tipo", "csv")
+        if tipo not in TIPOS_FONTE:
+            raise ValueError(f"{caminho}: tipo de fonte desconhecido em {fonte['nome']!r}: {tipo!r}")
+        if not fonte.get(TIPOS_FONTE[tipo]):
+            raise ValueError(f"{caminho}: a fonte {fonte['nome']!r} ({tipo}) precisa de '{TIPOS_FONTE[tipo]}'")
+    if len(set(nomes)) != len(nomes):
+        raise ValueError(f"{caminho}: nomes de fonte repetidos")
+    return fontes
+
+
+def origem_da_fonte(fonte):
+    """URL do CSV ou, para a API do Sheets, o carregador `f(snapshot) -> (df, origem)`."""
+    if fonte.get("tipo", "csv") == "csv":
+        return fonte["url"]
+    gspread = FonteGspread.de_config(fonte)
+    return lambda snapshot: gspread.carregar(processar_frame, snapshot, anexar_frame if INCREMENTAL else None)
+
+
+def snapshot_da_fonte(nome):
+    assinatura = assinatura_processamento()
+    if nome == FONTE_PADRAO:
+        return SnapshotLocal(DIRETORIO_CACHE, assinatura=assinatura)
+    slug = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode().lower()
+    return SnapshotLocal(DIRETORIO_CACHE, "planilha_" + re.sub(r"[^a-z0-9]+", "_", slug).strip("_"), assinatura)
+
+
+def carregar_fontes(fontes=None, partida_rapida=True):
+    """
+    Busca todas as fontes em paralelo e concatena os resultados numa coluna `Fonte`.
+    Retorna (df, resultados por fonte). Só falha se nenhuma fonte tiver dados nem snapshot.
+    """
+    fontes = fontes or carregar_config_fontes()
+    resultados = carregar_varias(
+        [(f["nome"], origem_da_fonte(f), snapshot_da_fonte(f["nome"])) for f in fontes], processar_csv, partida_rapida,
+        anexar=anexar_csv if INCREMENTAL else None)
+    validos = [r for r in resultados if r.df is not None]
+    if not validos:
+        raise resultados[0].erro
+
+    df = pd.concat([r.df.assign(Fonte=r.nome) for r in validos], ignore_index=True)
+    df['Fonte'] = pd.Categorical(df['Fonte'], categories=[r.nome for r in validos])
+    prefixar = len(fontes) > 1
+    df.attrs['avisos'] = [(nivel, f"[{r.nome}] {msg}" if prefixar else msg)
+                          for r in validos for nivel, msg in r.df.attrs.get('avisos', [])]
+    versoes = "|".join(f"{r.nome}:{r.df.attrs.get('versao_dados')}" for r in validos)
+    df.attrs['versao_dados'] = hashlib.sha256(versoes.encode()).hexdigest()
+    # Momentos da fonte mais antiga: download do conteúdo atual e última verificação na rede
+    for atributo in ('buscado_em', 'verificado_em'):
+        momentos = [r.df.attrs.get(atributo) for r in validos if r.df.attrs.get(atributo)]
+        df.attrs[atributo] = min(momentos) if momentos else None
+    return df, resultados
+
+
+def atualizar_dados(fontes=None):
+    """
+    Carga completa para o cache compartilhado: (df, cubo), com os avisos de status de cada
+    fonte em `df.attrs['avisos']`. Usada pelo dashboard e pela API.
+    """
+    with etapa("carga_dados"):
+        # Busca condicional (ETag / Last-Modified) de todas as fontes em paralelo;
+        # só reprocessa as planilhas que mudaram
+        df, resultados = carregar_fontes(fontes)
+
+        avisos = list(df.attrs.get('avisos', []))
+        for resultado in resultados:
+            if resultado.origem == "snapshot_offline":
+                avisos.append(("warning", f"⚠ Planilha {resultado.nome} indisponível no momento. Exibindo o último snapshot salvo."))
+            elif resultado.df is None:
+                avisos.append(("error", f"❌ Erro ao carregar a planilha {resultado.nome}: {resultado.erro}"))
+        avisos.append(("success", f"✅ Dados carregados com sucesso! {len(df)} registros encontrados."))
+        df.attrs['avisos'] = avisos
+        df = compactar_frame(df)
+        # O cubo de contagens é montado uma vez por carga e serve todas as abas
+        return df, montar_cubo(df)
+
+
+def create_sample_data():
+    """Criar dados de exemplo baseado na estrutura da planilha real"""
+    sample_data = {
+        'Data de Conclusão': pd.to_datetime([
+            '2025-01-15', '2025-01-20', '2025-02-10', '2025-02-25', '2025-03-05',
+            '2025-03-15', '2025-04-10', '2025-04-20', '2025-05-05', '2025-05-25'
+        ]),
+        'Comercial/Capitão': [
+            'Andressa', 'Rafael', 'Thaís', 'Ana Clara', 'Danilo',
+            'Pamela', 'Natalie', 'Werbet', 'Andressa', 'Rafael'
+        ]
+    }
+    df_exemplo = adicionar_periodo(pd.DataFrame(sample_data))
+    df_exemplo['Comercial_Padronizado'] = df_exemplo['Comercial/Capitão']
+    return df_exemplo
+
+
+# ----------------------------
+# FRAME COMPARTILHADO
+# ----------------------------
+# Só o que as abas usam; o frame fica imutável e é o mesmo objeto para todas as sessões
+COLUNAS_COMPARTILHADAS = ['Data de Conclusão', 'Comercial/Capitão', 'Comercial_Padronizado', 'Ano', 'Mês_Num', 'Mês', 'Fonte']
+
+
+def compactar_frame(df):
+    """
+    Colunas usadas, nomes e meses como categorias, ano em int16 e datas em datetime64,
+    ordenado por data (intervalos viram fatias por busca binária, ver intervalos.py).
+    """
+    with etapa("compactacao", linhas=len(df)):
+        compacto = df[[c for c in COLUNAS_COMPARTILHADAS if c in df]].copy()
+        compacto['Data de Conclusão'] = compacto['Data de Conclusão'].astype('datetime64[ns]')
+        compacto = compacto.sort_values('Data de Conclusão', kind='stable', ignore_index=True)
+        compacto['Ano'] = compacto['Ano'].astype(np.int16)
+        for coluna in ('Comercial/Capitão', 'Comercial_Padronizado', 'Fonte'):
+            if coluna in compacto and not isinstance(compacto[coluna].dtype, pd.CategoricalDtype):
+                compacto[coluna] = compacto[coluna].astype('category')
+        compacto.attrs = dict(df.attrs)
+        return compacto
+
+
+# ----------------------------
+# AGREGAÇÃO E ATINGIMENTO
+# ----------------------------
+def montar_cubo(df):
+    with etapa("cubo", linhas=len(df)):
+        return CuboContagens.construir(df)
+
+
+def montar_ritmo(df):
+    with etapa("ritmo", linhas=len(df)):
+        return RitmoDiario.construir(df)
+
+
+def montar_comparativo(cubo, metas):
+    with etapa("comparativo"):
+        return ComparativoMensal.construir(cubo, metas)
+
+
+def montar_indice_datas(df):
+    with etapa("indice_datas", linhas=len(df)):
+        return IndiceDatas.construir(df)
+
+
+def calcular_atingimento(cubo, metas, ano, meses, comerciais=None):
+    """Tabela por comercial + totais (realizado, meta, atingimento geral em %)."""
+    with etapa("atingimento") as registro:
+        tabela = tabela_atingimento(cubo, metas, ano, meses, comerciais)
+        registro["linhas"] = len(tabela)
+    return tabela, totais_atingimento(tabela)
+
+
+def totais_atingimento(tabela):
+    total_realizado = int(tabela['Realizado'].sum())
+    total_meta = int(tabela['Meta'].sum())
+    atingimento = (total_realizado / total_meta * 100) if total_meta > 0 else 0
+    return {"realizado": total_realizado, "meta": total_meta, "atingimento": atingimento}
+
+
+def projetar_atingimento(tabela, ritmo, ano, meses, data_referencia=None):
+    """Acrescenta à tabela de atingimento a projeção do fechamento e o atingimento projetado."""
+    with etapa("projecao", linhas=len(tabela)):
+        projetado = ritmo.projecao_por_comercial(ano, meses, data_referencia)
+        projetado = projetado.reindex(tabela['Comercial_Padronizado'], fill_value=0).to_numpy()
+        tabela = tabela.copy()
+        posicao = tabela.columns.get_loc('Atingimento (%)') + 1
+        tabela.insert(posicao, 'Projeção', projetado.round())
+        tabela.insert(posicao + 1, 'Atingimento Projetado (%)', atingimento(projetado, tabela['Meta']).round(2))
+        return tabela
+
+
+# ----------------------------
+# INTERVALOS DE DATAS
+# ----------------------------
+def calcular_atingimento_intervalo(indice, metas, inicio, fim, comerciais=None):
+    """
+    Como calcular_atingimento, para um intervalo de datas qualquer (inclusive): a meta de
+    cada mês entra proporcional aos dias úteis do mês dentro do intervalo.
+    """
+    with etapa("atingimento_intervalo") as registro:
+        nomes = nomes_tabela(indice.comerciais, metas, comerciais)
+        realizado = indice.realizado_por_comercial(inicio, fim).reindex(nomes, fill_value=0).to_numpy()
+        meta = metas.meta_proporcional(inicio, fim).reindex(nomes, fill_value=0).to_numpy().round(1)
+        tabela = tabela_por_comercial(nomes, realizado, meta)
+        registro["linhas"] = len(tabela)
+    return tabela, totais_atingimento(tabela)
+
+
+def semanas_iso(indice, metas, inicio, fim, comerciais=None):
+    """
+    Realizado e meta proporcional por semana ISO dentro do intervalo, somando os comerciais
+    escolhidos, com a variação do realizado em relação à semana anterior. Semanas cortadas
+    pelo intervalo (menos de 7 dias) ficam sem variação, dos dois lados da comparação.
+    """
+    with etapa("semanas_iso"):
+        realizado = indice.realizado_por_dia(inicio, fim, comerciais)
+        dias, meta_diaria = metas.meta_diaria(inicio, fim)
+        if comerciais is not None:
+            meta_diaria = meta_diaria[:, np.isin(metas.comerciais, list(comerciais))]
+        # Dias em ordem e rótulos "AAAA-Wnn" ordenáveis: cada semana é um trecho contíguo
+        semanas, posicao = np.unique(semana_iso(dias), return_inverse=True)
+        primeiro_dia = dias[np.searchsorted(posicao, np.arange(len(semanas)))]
+
+        realizado_semana = np.bincount(posicao, weights=realizado, minlength=len(semanas)).astype(np.int64)
+        meta_semana = np.bincount(posicao, weights=meta_diaria.sum(axis=1), minlength=len(semanas)).round(1)
+        dias_semana = np.bincount(posicao, minlength=len(semanas))
+        completa = dias_semana == 7
+        anterior = np.concatenate([[np.nan], realizado_semana[:-1]]) if len(semanas) else np.zeros(0)
+        comparavel = completa & np.roll(completa, 1)
+        comparavel[:1] = False
+        anterior[~comparavel] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variacao = np.where(anterior > 0, (realizado_semana / anterior - 1) * 100, np.nan).round(1)
+        return pd.DataFrame({
+            "Semana": semanas,
+            "Início": primeiro_dia.astype("datetime64[ns]"),
+            "Dias": dias_semana,
+            "Realizado": realizado_semana,
+            "Meta": meta_semana,
+            "Atingimento (%)": atingimento(realizado_semana, meta_semana).round(2),
+            "Variação Semanal (%)": variacao,
+        })
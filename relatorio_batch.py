@@ -0,0 +1,189 @@
+# relatorio_batch.py
+# 🗂️ Modo batch (sem navegador): pré-calcula todas as abas para todos os anos e períodos
+#
+# Uso:
+#   python relatorio_batch.py                       # grava em .dashboard_cache/relatorio/
+#   python relatorio_batch.py --saida relatorios/   # outro diretório
+#
+# Gera Parquet + CSV de cada tabela, um relatorio.html estático e um manifest.json.
+# O dashboard usa esses artefatos quando foram gerados a partir da mesma versão da
+# planilha e das metas que ele acabou de carregar.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from cubo import MESES
+from fonte_dados import DIRETORIO_CACHE
+from metas import atingimento, carregar_metas
+from nucleo import FONTE_PADRAO, PERIODOS, carregar_config_fontes, carregar_fontes, montar_cubo
+from tabelas import faixas_atingimento
+
+DIRETORIO_RELATORIO = os.environ.get("DASHBOARD_RELATORIO_DIR", os.path.join(DIRETORIO_CACHE, "relatorio"))
+PERIODOS_BATCH = {**PERIODOS, **{mes: [mes] for mes in MESES}}
+TABELAS = ("atingimento", "totais_periodo", "totais_ano", "totais_comercial", "totais_mes")
+VERSAO_FORMATO = 1
+
+
+# ----------------------------
+# CÁLCULO
+# ----------------------------
+def calcular_atingimento_todos_periodos(cubo, metas, periodos=PERIODOS_BATCH):
+    """
+    Uma passada por ano: matrizes mensais (12 × comerciais) de realizado e meta
+    multiplicadas pela matriz de períodos (períodos × 12).
+    """
+    nomes = np.union1d(cubo.comerciais.astype(str), metas.comerciais.astype(str))
+    pos_cubo = np.searchsorted(nomes, cubo.comerciais.astype(str))
+    pos_metas = np.searchsorted(nomes, metas.comerciais.astype(str))
+    mascaras = np.array([[mes in meses for mes in MESES] for meses in periodos.values()], dtype=np.int64)
+
+    blocos = []
+    for i, ano in enumerate(cubo.anos):
+        realizado_mes = np.zeros((12, len(nomes)), dtype=np.int64)
+        realizado_mes[:, pos_cubo] = cubo.contagens[i]
+        meta_mes = np.zeros((12, len(nomes)), dtype=np.int64)
+        meta_mes[:, pos_metas] = metas.matriz_ano(ano)
+
+        realizado = mascaras @ realizado_mes   # períodos × comerciais
+        meta = mascaras @ meta_mes
+        blocos.append(pd.DataFrame({
+            "Ano": int(ano),
+            "Período": np.repeat(list(periodos), len(nomes)),
+            "Comercial_Padronizado": np.tile(nomes, len(periodos)),
+            "Realizado": realizado.ravel(),
+            "Meta": meta.ravel(),
+        }))
+
+    tabela = pd.concat(blocos, ignore_index=True) if blocos else pd.DataFrame(
+        columns=["Ano", "Período", "Comercial_Padronizado", "Realizado", "Meta"])
+    tabela = tabela[(tabela["Realizado"] > 0) | (tabela["Meta"] > 0)].copy()
+    tabela["Atingimento (%)"] = atingimento(tabela["Realizado"], tabela["Meta"]).round(2)
+    tabela["Diferença"] = tabela["Realizado"] - tabela["Meta"]
+    tabela["Período"] = pd.Categorical(tabela["Período"], categories=list(periodos), ordered=True)
+    return tabela.sort_values(["Ano", "Período", "Atingimento (%)"], ascending=[True, True, False],
+                              na_position="last", kind="stable").reset_index(drop=True)
+
+
+def gerar_relatorio(cubo, metas):
+    atingimento = calcular_atingimento_todos_periodos(cubo, metas)
+    totais_periodo = atingimento.groupby(["Ano", "Período"], observed=True)[["Realizado", "Meta"]].sum().reset_index()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        totais_periodo["Atingimento (%)"] = np.where(
+            totais_periodo["Meta"] > 0, totais_periodo["Realizado"] / totais_periodo["Meta"] * 100, 0).round(2)
+    return {
+        "atingimento": atingimento,
+        "totais_periodo": totais_periodo,
+        "totais_ano": cubo.realizado_por_ano().reset_index(),
+        "totais_comercial": cubo.realizado_por_comercial().sort_values(ascending=False).reset_index(),
+        "totais_mes": cubo.realizado_por_mes().reset_index(),
+    }
+
+
+# ----------------------------
+# GRAVAÇÃO / LEITURA
+# ----------------------------
+def _html(tabelas, manifest):
+    partes = [
+        "<html><head><meta charset='utf-8'><title>Relatório de Performance Comercial</title>",
+        "<style>body{font-family:sans-serif;margin:2em} table{border-collapse:collapse;margin-bottom:2em}"
+        "td,th{border:1px solid #ddd;padding:4px 8px} .ok{background:#28a745;color:#fff}"
+        ".quase{background:#ffc107} .baixo{background:#dc3545;color:#fff}</style></head><body>",
+        "<h1>📊 Relatório de Performance Comercial</h1>",
+        f"<p>Gerado em {pd.Timestamp(manifest['gerado_em'], unit='s'):%d/%m/%Y %H:%M} UTC · "
+        f"versão dos dados {str(manifest['versao_dados'])[:12]}</p>",
+    ]
+    atingimento = tabelas["atingimento"]
+    for (ano, periodo), grupo in atingimento.groupby(["Ano", "Período"], observed=True, sort=True):
+        faixa = faixas_atingimento(grupo["Atingimento (%)"])
+        linhas = "".join(
+            f"<tr><td>{c}</td><td>{r}</td><td>{m}</td><td class='{f}'>{a:.2f}%</td><td>{d}</td></tr>"
+            for c, r, m, a, d, f in zip(grupo["Comercial_Padronizado"], grupo["Realizado"], grupo["Meta"],
+                                        grupo["Atingimento (%)"].fillna(0), grupo["Diferença"], faixa))
+        partes.append(f"<h2>{ano} · {periodo}</h2><table><tr><th>Comercial</th><th>Realizado</th>"
+                      f"<th>Meta</th><th>Atingimento</th><th>Diferença</th></tr>{linhas}</table>")
+    for nome in ("totais_ano", "totais_comercial", "totais_mes"):
+        partes.append(f"<h2>{nome.replace('_', ' ').title()}</h2>{tabelas[nome].to_html(index=False)}")
+    partes.append("</body></html>")
+    return "\n".join(partes)
+
+
+def salvar_relatorio(tabelas, manifest, diretorio=DIRETORIO_RELATORIO):
+    os.makedirs(diretorio, exist_ok=True)
+    for nome, tabela in tabelas.items():
+        tabela.to_parquet(os.path.join(diretorio, f"{nome}.parquet"), index=False)
+        tabela.to_csv(os.path.join(diretorio, f"{nome}.csv"), index=False)
+    with open(os.path.join(diretorio, "relatorio.html"), "w", encoding="utf-8") as f:
+        f.write(_html(tabelas, manifest))
+    # O manifest é gravado por último: só aponta para artefatos completos
+    tmp = os.path.join(diretorio, f"manifest.json.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, os.path.join(diretorio, "manifest.json"))
+
+
+def ler_manifest(diretorio=DIRETORIO_RELATORIO):
+    try:
+        with open(os.path.join(diretorio, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def carregar_relatorio(versao_dados, assinatura_metas, diretorio=DIRETORIO_RELATORIO):
+    """Tabelas pré-calculadas, ou None se não existirem ou forem de outra versão dos dados/metas."""
+    manifest = ler_manifest(diretorio)
+    if (not manifest or versao_dados is None or manifest.get("formato") != VERSAO_FORMATO
+            or manifest.get("versao_dados") != versao_dados or manifest.get("assinatura_metas") != assinatura_metas):
+        return None
+    try:
+        return {nome: pd.read_parquet(os.path.join(diretorio, f"{nome}.parquet")) for nome in TABELAS}
+    except OSError:
+        return None
+
+
+def tabela_pre_calculada(relatorio, ano, periodo):
+    """Tabela de atingimento de (ano, período) no formato de `tabela_atingimento`."""
+    tabela = relatorio["atingimento"]
+    selecao = tabela[(tabela["Ano"] == int(ano)) & (tabela["Período"] == periodo)]
+    return selecao.drop(columns=["Ano", "Período"]).reset_index(drop=True)
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-calcula todas as abas do dashboard")
+    parser.add_argument("--saida", default=DIRETORIO_RELATORIO, help="diretório dos artefatos")
+    parser.add_argument("--url", help="CSV publicado de uma única planilha (padrão: fontes.json / SHEET_URL)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    fontes = [{"nome": FONTE_PADRAO, "url": args.url}] if args.url else carregar_config_fontes()
+    df, resultados = carregar_fontes(fontes, partida_rapida=False)
+    metas = carregar_metas()
+    cubo = montar_cubo(df)
+    tabelas = gerar_relatorio(cubo, metas)
+    manifest = {
+        "formato": VERSAO_FORMATO,
+        "gerado_em": time.time(),
+        "versao_dados": df.attrs.get("versao_dados"),
+        "buscado_em": df.attrs.get("buscado_em"),
+        "assinatura_metas": metas.assinatura,
+        "origens": {r.nome: r.origem for r in resultados},
+        "linhas": len(df),
+        "tabelas": list(tabelas),
+    }
+    salvar_relatorio(tabelas, manifest, args.saida)
+    print(f"✅ {len(tabelas['atingimento']):,} linhas de atingimento ({len(cubo.anos)} ano(s) × "
+          f"{len(PERIODOS_BATCH)} períodos) em {time.perf_counter() - inicio:.2f} s -> {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
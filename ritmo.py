@@ -0,0 +1,135 @@
+# ritmo.py
+# 🏁 Ritmo diário: conclusões por comercial por dia, acumulados no mês e projeção do fechamento
+#
+# As contagens diárias saem de um único bincount (dia × comercial). A projeção do mês usa
+# dias úteis: realizado até hoje ÷ dias úteis decorridos × dias úteis do mês, calculada
+# para todos os anos, meses e comerciais de uma vez.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from cubo import _INDICE_MES, mascara_meses
+
+# Feriados fora do calendário de dias úteis: DASHBOARD_FERIADOS=2025-04-18,2025-04-21,...
+FERIADOS = tuple(d.strip() for d in os.environ.get("DASHBOARD_FERIADOS", "").split(",") if d.strip())
+
+
+def hoje():
+    return np.datetime64("today", "D")
+
+
+class RitmoDiario:
+    """
+    Contagens (dias × comerciais) de 1º de janeiro do primeiro ano a 31 de dezembro do
+    último, mais os acumulados que recomeçam a cada mês.
+    """
+
+    def __init__(self, inicio, comerciais, diarias, feriados=FERIADOS):
+        self.inicio = np.datetime64(inicio, "D")
+        self.comerciais = np.asarray(comerciais, dtype=object)
+        self.diarias = np.asarray(diarias, dtype=np.int64)
+        self.feriados = np.asarray(feriados, dtype="datetime64[D]")
+        self.dias = self.inicio + np.arange(len(self.diarias))
+        self.anos = np.unique(self.dias.astype("datetime64[Y]").astype(int) + 1970)
+        self._indice_comercial = {c: i for i, c in enumerate(self.comerciais)}
+
+        # Acumulado no mês = acumulado total − acumulado até a véspera do dia 1º do mês
+        total = np.cumsum(self.diarias, axis=0)
+        primeiro_do_mes = (self.dias.astype("datetime64[M]").astype("datetime64[D]") - self.inicio).astype(np.int64)
+        base = np.vstack([np.zeros((1, len(self.comerciais)), dtype=np.int64), total])[primeiro_do_mes]
+        self.acumuladas = total - base
+
+    @classmethod
+    def construir(cls, df, coluna_data="Data de Conclusão", coluna_comercial="Comercial_Padronizado", feriados=FERIADOS):
+        datas = pd.to_datetime(df[coluna_data]).to_numpy().astype("datetime64[D]")
+        validas = ~np.isnat(datas)
+        datas = datas[validas]
+        codigos, comerciais = pd.factorize(df[coluna_comercial].to_numpy()[validas], sort=True)
+        if not len(datas):
+            return cls(hoje().astype("datetime64[Y]"), comerciais, np.zeros((0, len(comerciais))), feriados)
+
+        inicio = datas.min().astype("datetime64[Y]").astype("datetime64[D]")
+        fim = (datas.max().astype("datetime64[Y]") + 1).astype("datetime64[D]")
+        n_dias = int((fim - inicio).astype(np.int64))
+        plano = (datas - inicio).astype(np.int64) * len(comerciais) + codigos
+        diarias = np.bincount(plano, minlength=n_dias * len(comerciais)).reshape(n_dias, len(comerciais))
+        return cls(inicio, comerciais, diarias, feriados)
+
+    # ----------------------------
+    # CALENDÁRIO
+    # ----------------------------
+    def _meses(self, anos):
+        """Primeiro dia de cada mês e primeiro dia do mês seguinte (anos × 12)."""
+        anos = np.asarray(anos, dtype=np.int64)
+        inicio = ((anos[:, None] - 1970) * 12 + np.arange(12)).astype("datetime64[M]")
+        return inicio.astype("datetime64[D]"), (inicio + 1).astype("datetime64[D]")
+
+    def dias_uteis(self, inicio, fim):
+        return np.busday_count(inicio, fim, holidays=self.feriados)
+
+    # ----------------------------
+    # PROJEÇÃO
+    # ----------------------------
+    def projecao(self, anos=None, data_referencia=None):
+        """
+        (realizado até a data, projeção do fechamento), ambos anos × 12 × comerciais.
+        Meses encerrados projetam o próprio realizado; meses futuros, zero.
+        """
+        anos = self.anos if anos is None else np.asarray(anos, dtype=np.int64)
+        data_referencia = np.datetime64(data_referencia or hoje(), "D")
+        inicio_mes, fim_mes = self._meses(anos)
+
+        # Realizado até a data: acumulado do mês no dia min(data, último dia do mês)
+        corte = np.minimum(fim_mes - 1, data_referencia)
+        posicao = (corte - self.inicio).astype(np.int64)
+        valido = (corte >= inicio_mes) & (posicao >= 0) & (posicao < len(self.dias))
+        realizado = np.zeros((len(anos), 12, len(self.comerciais)), dtype=np.int64)
+        if len(self.dias):
+            realizado[valido] = self.acumuladas[posicao[valido]]
+
+        total = self.dias_uteis(inicio_mes, fim_mes)
+        decorridos = self.dias_uteis(inicio_mes, np.clip(data_referencia + 1, inicio_mes, fim_mes))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fator = np.where(decorridos > 0, total / decorridos, 1.0)
+        return realizado, realizado * fator[:, :, None]
+
+    def projecao_por_comercial(self, ano, meses, data_referencia=None):
+        """Projeção somada nos meses escolhidos, por comercial."""
+        _, projetado = self.projecao([ano], data_referencia)
+        return pd.Series(projetado[0][mascara_meses(meses)].sum(axis=0), index=self.comerciais, name="Projeção")
+
+    # ----------------------------
+    # BURN-UP
+    # ----------------------------
+    def burnup(self, ano, mes, metas_mes, data_referencia=None, comerciais=None):
+        """
+        Formato longo (Dia, Comercial, Acumulado (%)) do acumulado no mês sobre a meta de
+        cada comercial até a data de referência, mais a linha "Ritmo ideal" (fração dos
+        dias úteis já decorridos). `metas_mes` é uma Series meta por comercial.
+        """
+        data_referencia = np.datetime64(data_referencia or hoje(), "D")
+        inicio_mes, fim_mes = (d[0, _INDICE_MES[mes]] for d in self._meses([ano]))
+        dias = np.arange(inicio_mes, min(fim_mes, data_referencia + 1), dtype="datetime64[D]")
+        vazio = pd.DataFrame({"Dia": pd.Series(dtype="datetime64[ns]"), "Comercial": pd.Series(dtype=object),
+                              "Acumulado (%)": pd.Series(dtype=float)})
+        if not len(dias):
+            return vazio
+
+        nomes = self.comerciais if comerciais is None else self.comerciais[np.isin(self.comerciais, list(comerciais))]
+        metas_mes = metas_mes.reindex(nomes).to_numpy(dtype=float)
+        nomes, metas_mes = nomes[metas_mes > 0], metas_mes[metas_mes > 0]
+
+        posicao = (dias - self.inicio).astype(np.int64)
+        dentro = (posicao >= 0) & (posicao < len(self.dias))
+        colunas = [self._indice_comercial[n] for n in nomes]
+        acumulado = np.zeros((len(dias), len(nomes)), dtype=np.int64)
+        acumulado[dentro] = self.acumuladas[np.ix_(posicao[dentro], colunas)]
+        ideal = self.dias_uteis(inicio_mes, dias + 1) / max(self.dias_uteis(inicio_mes, fim_mes), 1) * 100
+
+        return pd.DataFrame({
+            "Dia": np.concatenate([np.repeat(dias, len(nomes)), dias]).astype("datetime64[ns]"),
+            "Comercial": np.concatenate([np.tile(nomes, len(dias)), np.full(len(dias), "Ritmo ideal", dtype=object)]),
+            "Acumulado (%)": np.concatenate([(acumulado / metas_mes * 100).ravel(), ideal]).round(1),
+        })
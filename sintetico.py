@@ -0,0 +1,57 @@
+# sintetico.py
+# 🧪 Planilha sintética no formato da real (mesma estrutura de create_sample_data, de 10 mil a 10 milhões de linhas)
+
+import numpy as np
+import pandas as pd
+
+from nucleo import NOME_MAPPING
+
+# Ruído típico da planilha: variações de caixa, espaços, sufixos e nomes fora do mapeamento
+_SUFIXOS = ["", " ", "  ", " - Squad", " (Capitã)", " / Time"]
+_DESCONHECIDOS = ["Fulano", "Ciclano", "Estagiário", "Suporte"]
+_FORMATOS_DATA = [("%d/%m/%Y", 0.75), ("%d/%m/%Y %H:%M:%S", 0.15), ("%Y-%m-%d", 0.10)]
+
+
+def _variantes_nomes():
+    variantes = []
+    for alias in NOME_MAPPING:
+        for sufixo in _SUFIXOS:
+            variantes += [alias + sufixo, alias.upper() + sufixo, alias.lower() + sufixo]
+    return variantes
+
+
+def gerar_planilha(n_linhas, anos=(2023, 2024, 2025), seed=0, fracao_invalidas=0.001, fracao_desconhecidos=0.01):
+    """
+    Linhas brutas como as que `pd.read_csv(SHEET_URL)` devolve (tudo texto):
+    datas em vários formatos, aliases com ruído, nomes desconhecidos e datas inválidas.
+    """
+    rng = np.random.default_rng(seed)
+
+    inicio = pd.Timestamp(f"{min(anos)}-01-01")
+    dias = (pd.Timestamp(f"{max(anos)}-12-31") - inicio).days + 1
+    # Pool de datas distintas (uma por dia × formato); as linhas sorteiam do pool
+    base = inicio + pd.to_timedelta(np.arange(dias), unit="D") + pd.Timedelta(hours=10)
+    pool_datas, pesos = [], []
+    for formato, peso in _FORMATOS_DATA:
+        pool_datas.append(np.asarray(base.strftime(formato), dtype=object))
+        pesos.append(np.full(dias, peso / dias))
+    pool_datas, pesos = np.concatenate(pool_datas), np.concatenate(pesos)
+    datas = pool_datas[rng.choice(len(pool_datas), size=n_linhas, p=pesos / pesos.sum())]
+    datas[rng.random(n_linhas) < fracao_invalidas] = "sem data"
+
+    variantes = np.asarray(_variantes_nomes(), dtype=object)
+    nomes = variantes[rng.integers(len(variantes), size=n_linhas)]
+    desconhecidos = rng.random(n_linhas) < fracao_desconhecidos
+    nomes[desconhecidos] = np.asarray(_DESCONHECIDOS, dtype=object)[rng.integers(len(_DESCONHECIDOS), size=desconhecidos.sum())]
+
+    return pd.DataFrame({
+        'Card': np.char.add("CARD-", np.arange(n_linhas).astype(str)).astype(object),
+        'Data de Conclusão': datas,
+        'Comercial/Capitão': nomes,
+        'Cliente': np.char.add("Cliente ", rng.integers(5000, size=n_linhas).astype(str)).astype(object),
+    })
+
+
+def gerar_csv(n_linhas, **kwargs):
+    """Mesma planilha serializada como o CSV publicado pelo Google Sheets."""
+    return gerar_planilha(n_linhas, **kwargs).to_csv(index=False).encode("utf-8")
@@ -0,0 +1,58 @@
+# tabelas.py
+# 🧾 Tabelas grandes: faixas de atingimento vetorizadas e paginação feita no servidor
+#
+# O Styler só recebe uma chamada por coluna (não uma por célula) e o visualizador de
+# dados brutos envia ao navegador apenas a página visível.
+
+import numpy as np
+
+# Faixas de atingimento: ≥100% verde, ≥80% amarelo, o resto (inclusive sem meta) vermelho
+ESTILOS_FAIXA = {
+    "ok": 'background-color: #28a745; color: white; font-weight: bold',
+    "quase": 'background-color: #ffc107; color: black; font-weight: bold',
+    "baixo": 'background-color: #dc3545; color: white; font-weight: bold',
+}
+TAMANHOS_PAGINA = [10, 25, 50, 100, 500]
+
+
+# ----------------------------
+# FAIXAS DE ATINGIMENTO
+# ----------------------------
+def faixas_atingimento(valores):
+    """Faixa ("ok", "quase", "baixo") de cada valor numa única passada."""
+    valores = np.asarray(valores, dtype=float)
+    return np.select([valores >= 100, valores >= 80], ["ok", "quase"], "baixo")
+
+
+def estilos_atingimento(coluna):
+    """Para `Styler.apply(..., axis=0)`: o CSS da coluna inteira de uma vez."""
+    faixas = faixas_atingimento(coluna)
+    return np.select([faixas == "ok", faixas == "quase"], [ESTILOS_FAIXA["ok"], ESTILOS_FAIXA["quase"]],
+                     ESTILOS_FAIXA["baixo"])
+
+
+# ----------------------------
+# PAGINAÇÃO NO SERVIDOR
+# ----------------------------
+def ordem_linhas(df, coluna=None, crescente=True):
+    """
+    Posições das linhas ordenadas por `coluna` (ordenação estável, vazios no fim); None = ordem
+    do frame (por data, ver nucleo.compactar_frame), invertida quando decrescente.
+    """
+    if coluna is None:
+        posicoes = np.arange(len(df))
+        return posicoes if crescente else posicoes[::-1]
+    serie = df[coluna].reset_index(drop=True)
+    return serie.sort_values(ascending=crescente, kind="stable", na_position="last").index.to_numpy()
+
+
+def numero_paginas(n_linhas, tamanho):
+    return max(1, -(-n_linhas // tamanho))
+
+
+def fatiar_pagina(df, ordem, pagina, tamanho):
+    """Linhas da página `pagina` (a partir de 1) na ordem dada; retorna (recorte, início, fim)."""
+    pagina = min(max(1, int(pagina)), numero_paginas(len(ordem), tamanho))
+    inicio = (pagina - 1) * tamanho
+    fim = min(inicio + tamanho, len(ordem))
+    return df.iloc[ordem[inicio:fim]], inicio, fim
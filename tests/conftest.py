@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# Módulos do dashboard ficam na raiz do repositório; caches e decisões de nomes, num diretório temporário
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DASHBOARD_CACHE_DIR", tempfile.mkdtemp(prefix="dashboard_testes_"))
@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_compartilhado
+from cache_compartilhado import CacheCompartilhado, TravaArquivo
+from cubo import CuboContagens
+
+
+def montar(comerciais):
+    df = pd.DataFrame({
+        "Data de Conclusão": pd.to_datetime(["2025-01-10"] * len(comerciais)),
+        "Ano": 2025,
+        "Mês_Num": 1,
+        "Comercial_Padronizado": comerciais,
+    })
+    df.attrs["versao_dados"] = "-".join(comerciais)
+    return df, CuboContagens.construir(df)
+
+
+def falhar():
+    raise ConnectionError("planilha fora do ar")
+
+
+def envelhecer(cache, segundos):
+    """Recua os carimbos do manifest, como se `segundos` tivessem passado."""
+    manifest = cache.manifest()
+    for chave in ("atualizado_em", "tentativa_em"):
+        if chave in manifest:
+            manifest[chave] -= segundos
+    with open(cache.caminho_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_falha_na_renovacao_serve_a_versao_anterior(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path), ttl=60)
+    df, cubo = cache.obter(lambda: montar(["Werbet", "Pamela"]))
+    assert len(df) == 2 and cubo.total() == 2
+
+    envelhecer(cache, 120)
+    df, cubo = cache.obter(falhar)   # o processo que tentou também segue na versão atual
+    assert df.attrs["versao_dados"] == "Werbet-Pamela"
+    assert cache.manifest()["versao"] == 1
+    assert "fora do ar" in cache.manifest()["erro"]
+
+    # A falha conta como tentativa: ninguém tenta de novo antes de outro TTL
+    chamadas = []
+    cache.obter(lambda: chamadas.append(1) or montar(["Danilo"]))
+    assert chamadas == []
+
+
+def test_primeira_carga_com_falha_tenta_de_novo_antes_do_ttl(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path), ttl=300)
+    with pytest.raises(ConnectionError):
+        cache.obter(falhar)
+
+    # Outro processo, logo em seguida: não há o que servir
+    outro = CacheCompartilhado(str(tmp_path), ttl=300)
+    with pytest.raises(RuntimeError, match="fora do ar"):
+        outro.obter(lambda: montar(["Danilo"]))
+
+    # Passado NOVA_TENTATIVA (bem menos que o TTL), a carga é tentada de novo
+    envelhecer(outro, cache_compartilhado.NOVA_TENTATIVA)
+    df, _ = outro.obter(lambda: montar(["Danilo"]))
+    assert df["Comercial_Padronizado"].tolist() == ["Danilo"]
+    assert cache.obter(falhar)[0].attrs["versao_dados"] == "Danilo"
+
+
+def test_primeira_carga_grava_e_outros_processos_so_leem(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path), ttl=60)
+    original, cubo_original = montar(["Werbet", "Pamela", "Werbet"])
+    original.attrs["avisos"] = [("info", "ℹ️ aviso")]
+    df, cubo = cache.obter(lambda: (original, cubo_original))
+
+    manifest = cache.manifest()
+    assert manifest["versao"] == 1 and manifest["pid"] > 0
+    assert (tmp_path / "frame_1.arrow").exists() and (tmp_path / "cubo_1.npz").exists()
+    pd.testing.assert_frame_equal(df, original)
+    assert df.attrs["avisos"] == [("info", "ℹ️ aviso")]   # tuplas de volta, não listas do JSON
+    assert np.array_equal(cubo.contagens, cubo_original.contagens) and list(cubo.comerciais) == ["Pamela", "Werbet"]
+
+    # Dentro do TTL ninguém chama `atualizar`; o mesmo processo não relê o arquivo
+    chamadas = []
+    outro = CacheCompartilhado(str(tmp_path), ttl=60)
+    assert outro.obter(lambda: chamadas.append(1))[0].attrs["versao_dados"] == "Werbet-Pamela-Werbet"
+    assert cache.obter(lambda: chamadas.append(1))[0] is df
+    assert chamadas == [] and cache.leituras == 1 and cache.atualizacoes == 1
+
+
+def test_versao_vencida_com_trava_ocupada_segue_na_atual(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path), ttl=60)
+    cache.obter(lambda: montar(["Werbet"]))
+    envelhecer(cache, 120)
+
+    trava = TravaArquivo(cache.trava)   # outro processo atualizando
+    assert trava.adquirir()
+    try:
+        chamadas = []
+        df, _ = CacheCompartilhado(str(tmp_path), ttl=60).obter(lambda: chamadas.append(1))
+        assert chamadas == [] and df.attrs["versao_dados"] == "Werbet"
+        assert cache.renovar(lambda: montar(["Danilo"])) is False
+    finally:
+        trava.liberar()
+
+    df, _ = cache.obter(lambda: montar(["Danilo"]))
+    assert df.attrs["versao_dados"] == "Danilo" and cache.manifest()["versao"] == 2
+
+
+def test_renovar_respeita_a_antecedencia_e_limpa_versoes_antigas(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path), ttl=60)
+    cache.obter(lambda: montar(["v1"]))
+    assert cache.renovar(lambda: montar(["cedo"]), antecedencia=10) is False   # vence só daqui a 60 s
+    for i in range(2, 6):
+        assert cache.renovar(lambda: montar([f"v{i}"]), antecedencia=60) is True
+
+    assert cache.manifest()["versao"] == 5
+    assert cache.obter(falhar)[0].attrs["versao_dados"] == "v5"
+    mantidas = sorted(p.name for p in tmp_path.glob("frame_*.arrow"))
+    assert mantidas == [f"frame_{v}.arrow" for v in range(5 - cache_compartilhado.VERSOES_MANTIDAS + 1, 6)]
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from comparativo import ComparativoMensal
+from cubo import MESES, CuboContagens
+from datas import adicionar_periodo
+from metas import MatrizMetas
+
+# Werbet vende mas não tem meta; Thaís tem meta mas não vende; 2024 fica sem nenhuma venda
+VENDEDORES = ["Ana Clara", "Danilo", "Werbet"]
+METAS_CFG = {
+    "versao": 1,
+    "padrao": {mes: {"Ana Clara": 5, "Danilo": 4, "Thaís": 3} for mes in MESES},
+    "por_ano": {"2025": {"Março": {"Ana Clara": 0, "Danilo": 6}}},
+}
+
+
+def frame(n=500, seed=3):
+    rng = np.random.default_rng(seed)
+    dias = np.concatenate([pd.date_range("2023-01-01", "2023-12-31"), pd.date_range("2025-01-01", "2025-06-30")])
+    df = pd.DataFrame({
+        "Data de Conclusão": dias[rng.integers(0, len(dias), n)],
+        "Comercial_Padronizado": np.array(VENDEDORES, dtype=object)[rng.integers(0, len(VENDEDORES), n)],
+    })
+    return adicionar_periodo(df)
+
+
+def referencia(df, metas):
+    """Realizado e meta por (ano, mês, comercial) num frame longo, via groupby."""
+    contagens = df.groupby(["Ano", "Mês_Num", "Comercial_Padronizado"]).size()
+    linhas = []
+    for ano in range(2023, 2026):
+        for mes in range(1, 13):
+            for comercial in sorted(set(VENDEDORES) | set(metas.comerciais)):
+                meta = metas.matriz_ano(ano)[mes - 1]
+                i = np.flatnonzero(metas.comerciais == comercial)
+                linhas.append({"Ano": ano, "Mês_Num": mes, "Comercial": comercial,
+                               "Realizado": contagens.get((ano, mes, comercial), 0),
+                               "Meta": meta[i[0]] if len(i) else 0})
+    return pd.DataFrame(linhas)
+
+
+def anterior(longo, ano, mes, comercial, meses):
+    indice = (ano * 12 + mes - 1) - meses
+    linha = longo[(longo["Ano"] == indice // 12) & (longo["Mês_Num"] == indice % 12 + 1) & (longo["Comercial"] == comercial)]
+    return float(linha["Realizado"].iloc[0]) if len(linha) else np.nan
+
+
+def test_tabela_igual_a_referencia():
+    df = frame()
+    metas = MatrizMetas.de_config(METAS_CFG)
+    comparativo = ComparativoMensal.construir(CuboContagens.construir(df), metas)
+    longo = referencia(df, metas)
+
+    for ano, mes in [(2023, 1), (2023, 7), (2024, 1), (2025, 1), (2025, 3), (2025, 6)]:
+        tabela = comparativo.tabela(ano, MESES[mes - 1]).set_index("Comercial_Padronizado")
+        do_mes = longo[(longo["Ano"] == ano) & (longo["Mês_Num"] == mes)].set_index("Comercial")
+        ativos = do_mes[(do_mes["Realizado"] > 0) | (do_mes["Meta"] > 0)]
+        assert sorted(tabela.index) == sorted(ativos.index)
+
+        posicao = ativos["Realizado"].rank(method="min", ascending=False)
+        percentil = ativos["Realizado"].rank(method="max", pct=True) * 100
+        for comercial, linha in ativos.iterrows():
+            obtido = tabela.loc[comercial]
+            mes_anterior = anterior(longo, ano, mes, comercial, 1)
+            ano_anterior = anterior(longo, ano, mes, comercial, 12)
+            assert obtido["Realizado"] == linha["Realizado"]
+            np.testing.assert_equal(obtido["Mês Anterior"], mes_anterior)
+            np.testing.assert_equal(obtido["Ano Anterior"], ano_anterior)
+            np.testing.assert_equal(obtido["Δ Ano"], linha["Realizado"] - ano_anterior)
+            esperado_yoy = round((linha["Realizado"] / ano_anterior - 1) * 100, 2) if ano_anterior > 0 else np.nan
+            np.testing.assert_equal(obtido["Δ Ano (%)"], esperado_yoy)
+            esperado_ating = round(linha["Realizado"] / linha["Meta"] * 100, 2) if linha["Meta"] > 0 else np.nan
+            np.testing.assert_equal(obtido["Atingimento (%)"], esperado_ating)
+            assert obtido["Posição"] == posicao[comercial]
+            assert obtido["Percentil"] == round(percentil[comercial], 2)
+
+        # Ordenada pela posição
+        assert tabela["Posição"].is_monotonic_increasing
+
+
+def test_delta_posicao_e_filtro_de_comerciais():
+    df = frame()
+    comparativo = ComparativoMensal.construir(CuboContagens.construir(df), MatrizMetas.de_config(METAS_CFG))
+    fevereiro = comparativo.tabela(2025, "Fevereiro").set_index("Comercial_Padronizado")
+    marco = comparativo.tabela(2025, "Março", comerciais=["Danilo", "Werbet"]).set_index("Comercial_Padronizado")
+    assert list(marco.index.sort_values()) == ["Danilo", "Werbet"]
+    for comercial in marco.index:
+        assert marco.loc[comercial, "Δ Posição"] == fevereiro.loc[comercial, "Posição"] - \
+            comparativo.tabela(2025, "Março").set_index("Comercial_Padronizado").loc[comercial, "Posição"]
+
+    # Fora da linha do tempo: tabela vazia com as mesmas colunas
+    assert comparativo.tabela(2030, "Janeiro").empty
+
+
+def test_evolucao_tem_a_posicao_de_cada_mes():
+    df = frame()
+    comparativo = ComparativoMensal.construir(CuboContagens.construir(df), MatrizMetas.de_config(METAS_CFG))
+    evolucao = comparativo.evolucao(2025, ["Ana Clara", "Thaís"])
+    for mes in MESES:
+        tabela = comparativo.tabela(2025, mes).set_index("Comercial_Padronizado")
+        do_mes = evolucao[evolucao["Mês"] == mes].set_index("Comercial")
+        assert sorted(do_mes.index) == sorted(set(tabela.index) & {"Ana Clara", "Thaís"})
+        for comercial in do_mes.index:
+            assert do_mes.loc[comercial, "Posição"] == tabela.loc[comercial, "Posição"]
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from cubo import MESES, CuboContagens
+from datas import adicionar_periodo
+
+COMERCIAIS = ["Ana Clara", "Danilo", "Thaís", "Werbet"]
+
+
+def frame(n=800, seed=4):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Data de Conclusão": pd.Timestamp("2023-03-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D"),
+        "Comercial_Padronizado": np.array(COMERCIAIS, dtype=object)[rng.integers(0, len(COMERCIAIS), n)],
+    })
+    return adicionar_periodo(df)
+
+
+def filtrar(df, anos=None, meses=None, comerciais=None):
+    mascara = np.ones(len(df), dtype=bool)
+    if anos is not None:
+        mascara &= df["Ano"].isin(np.atleast_1d(anos))
+    if meses is not None:
+        mascara &= df["Mês"].isin(meses)
+    if comerciais is not None:
+        mascara &= df["Comercial_Padronizado"].isin(comerciais)
+    return df[mascara]
+
+
+def test_contagens_iguais_ao_groupby():
+    df = frame()
+    cubo = CuboContagens.construir(df)
+    esperado = df.groupby(["Ano", "Mês_Num", "Comercial_Padronizado"]).size()
+    assert list(cubo.anos) == [2023, 2024, 2025] and list(cubo.comerciais) == COMERCIAIS
+    for (ano, mes, comercial), quantidade in esperado.items():
+        assert cubo.contagens[list(cubo.anos).index(ano), mes - 1, COMERCIAIS.index(comercial)] == quantidade
+    assert cubo.total() == len(df)
+
+    # Sem Mês_Num, o rótulo do mês dá o mesmo cubo
+    sem_numero = CuboContagens.construir(df.drop(columns="Mês_Num"))
+    assert np.array_equal(sem_numero.contagens, cubo.contagens)
+
+
+def test_agregados_iguais_ao_groupby():
+    df = frame()
+    cubo = CuboContagens.construir(df)
+    filtros = [
+        {},
+        {"anos": 2024},
+        {"anos": [2023, 2025], "meses": ["Dezembro", "Março", "Fevereiro"]},
+        {"anos": 2024, "meses": ["Julho"], "comerciais": ["Danilo", "Werbet", "Desconhecido"]},
+        {"anos": 1999},
+    ]
+    for filtro in filtros:
+        dentro = filtrar(df, **filtro)
+        por_comercial = dentro.groupby("Comercial_Padronizado").size()
+        assert cubo.realizado_por_comercial(**filtro).to_dict() == por_comercial[por_comercial > 0].to_dict()
+
+        por_mes = cubo.realizado_por_mes(**filtro)
+        esperado_mes = dentro.groupby("Mês", observed=True).size()
+        assert por_mes.to_dict() == esperado_mes[esperado_mes > 0].to_dict()
+        # Meses em ordem de calendário
+        assert list(por_mes.index) == [m for m in MESES if m in por_mes.index]
+
+    assert cubo.realizado_por_ano().to_dict() == df.groupby("Ano").size().to_dict()
+    assert cubo.meses_com_dados() == [m for m in MESES if m in set(df["Mês"])]
+    assert cubo.top("Comercial") == df["Comercial_Padronizado"].value_counts().idxmax()
+    assert cubo.top("Ano") == df["Ano"].value_counts().idxmax()
+
+
+def test_somar_blocos_igual_ao_cubo_inteiro():
+    df = frame()
+    partes = [CuboContagens.construir(df.iloc[i:i + 150]) for i in range(0, len(df), 150)]
+    partes.append(CuboContagens.construir(df.iloc[:0]))
+    somado = CuboContagens.somar(partes)
+    inteiro = CuboContagens.construir(df)
+    assert list(somado.anos) == list(inteiro.anos) and list(somado.comerciais) == list(inteiro.comerciais)
+    assert np.array_equal(somado.contagens, inteiro.contagens)
@@ -0,0 +1,175 @@
+import hashlib
+
+import pandas as pd
+import pytest
+import requests
+
+from fonte_dados import SnapshotLocal, carregar_com_snapshot
+
+CSV = b"Data de Conclusao,Comercial\n01/01/2025,Andressa\n02/01/2025,Rafael\n"
+ETAG = '"v1"'
+
+
+class Resposta:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(self.status_code)
+
+
+class SessaoFalsa:
+    """Responde como a planilha publicada: 304 quando o ETag confere (se `respeitar_etag`)."""
+
+    def __init__(self, conteudo=CSV, etag=ETAG, respeitar_etag=True, falhar=False):
+        self.conteudo = conteudo
+        self.etag = etag
+        self.respeitar_etag = respeitar_etag
+        self.falhar = falhar
+        self.pedidos = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.pedidos.append(dict(headers or {}))
+        if self.falhar:
+            raise requests.ConnectionError("sem rede")
+        if self.respeitar_etag and (headers or {}).get("If-None-Match") == self.etag:
+            return Resposta(304, headers={"ETag": self.etag})
+        return Resposta(200, self.conteudo, {"ETag": self.etag})
+
+
+class Processador:
+    def __init__(self):
+        self.chamadas = 0
+
+    def __call__(self, conteudo):
+        self.chamadas += 1
+        return pd.DataFrame({"linha": conteudo.decode().splitlines()[1:]})
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return SnapshotLocal(str(tmp_path), assinatura="proc-1")
+
+
+def primeira_carga(snapshot, processar):
+    df, origem = carregar_com_snapshot("http://planilha", processar, snapshot, sessao=SessaoFalsa())
+    assert origem == "rede" and processar.chamadas == 1
+    return df
+
+
+def test_primeira_carga_processa_e_grava_snapshot(snapshot):
+    processar = Processador()
+    df = primeira_carga(snapshot, processar)
+    estado = snapshot.carregar_estado()
+    assert snapshot.existe() and estado["etag"] == ETAG and estado["assinatura"] == "proc-1"
+    assert df.attrs["versao_dados"] == f"{hashlib.sha256(CSV).hexdigest()}:proc-1"
+
+
+def test_304_reaproveita_snapshot_sem_processar(snapshot):
+    processar = Processador()
+    primeira_carga(snapshot, processar)
+    sessao = SessaoFalsa()
+
+    df, origem = carregar_com_snapshot("http://planilha", processar, snapshot, sessao=sessao)
+
+    assert origem == "snapshot" and processar.chamadas == 1
+    assert sessao.pedidos[-1]["If-None-Match"] == ETAG
+    assert list(df["linha"]) == ["01/01/2025,Andressa", "02/01/2025,Rafael"]
+    assert snapshot.carregar_estado()["verificado_em"] >= snapshot.carregar_estado()["buscado_em"]
+
+
+def test_mesmo_hash_reaproveita_snapshot(snapshot):
+    processar = Processador()
+    primeira_carga(snapshot, processar)
+    # Servidor sem suporte a ETag: 200 com o mesmo conteúdo
+    sessao = SessaoFalsa(etag='"outro"', respeitar_etag=False)
+
+    _, origem = carregar_com_snapshot("http://planilha", processar, snapshot, sessao=sessao)
+
+    assert origem == "snapshot" and processar.chamadas == 1
+
+
+def test_conteudo_novo_reprocessa(snapshot):
+    processar = Processador()
+    primeira_carga(snapshot, processar)
+    sessao = SessaoFalsa(CSV.replace(b"Rafael", b"Thais"), etag='"v2"')
+
+    df, origem = carregar_com_snapshot("http://planilha", processar, snapshot, sessao=sessao)
+
+    assert origem == "rede" and processar.chamadas == 2
+    assert df["linha"].iloc[-1] == "02/01/2025,Thais"
+
+
+def test_sem_rede_usa_snapshot(snapshot):
+    processar = Processador()
+    primeira_carga(snapshot, processar)
+
+    df, origem = carregar_com_snapshot("http://planilha", processar, snapshot, sessao=SessaoFalsa(falhar=True))
+
+    assert origem == "snapshot_offline" and processar.chamadas == 1 and len(df) == 2
+
+
+def test_sem_rede_e_sem_snapshot_propaga_erro(snapshot):
+    with pytest.raises(requests.ConnectionError):
+        carregar_com_snapshot("http://planilha", Processador(), snapshot, sessao=SessaoFalsa(falhar=True))
+
+
+def test_outra_assinatura_reprocessa_mesmo_com_304(tmp_path):
+    processar = Processador()
+    primeira_carga(SnapshotLocal(str(tmp_path), assinatura="proc-1"), processar)
+    novo = SnapshotLocal(str(tmp_path), assinatura="proc-2")
+    sessao = SessaoFalsa()
+
+    df, origem = carregar_com_snapshot("http://planilha", processar, novo, sessao=sessao)
+
+    assert origem == "rede" and processar.chamadas == 2
+    assert "If-None-Match" not in sessao.pedidos[-1]
+    assert novo.carregar_estado()["assinatura"] == "proc-2"
+    assert df.attrs["versao_dados"].endswith(":proc-2")
+
+
+def test_outra_assinatura_ainda_serve_de_reserva_offline(tmp_path):
+    primeira_carga(SnapshotLocal(str(tmp_path), assinatura="proc-1"), Processador())
+    novo = SnapshotLocal(str(tmp_path), assinatura="proc-2")
+
+    _, origem = carregar_com_snapshot("http://planilha", Processador(), novo, sessao=SessaoFalsa(falhar=True))
+
+    assert origem == "snapshot_offline"
+
+
+class Anexador:
+    def __init__(self):
+        self.caudas = []
+
+    def __call__(self, cauda, anterior):
+        self.caudas.append(cauda)
+        novo = pd.DataFrame({"linha": cauda.decode().splitlines()[1:]})
+        return pd.concat([anterior, novo], ignore_index=True)
+
+
+def test_linhas_novas_no_fim_processam_so_a_cauda(snapshot):
+    processar, anexar = Processador(), Anexador()
+    carregar_com_snapshot("http://planilha", processar, snapshot, sessao=SessaoFalsa(), anexar=anexar)
+    sessao = SessaoFalsa(CSV + b"03/01/2025,Thais\n", etag='"v2"')
+
+    df, origem = carregar_com_snapshot("http://planilha", processar, snapshot, sessao=sessao, anexar=anexar)
+
+    assert origem == "rede" and processar.chamadas == 1
+    assert anexar.caudas == [b"Data de Conclusao,Comercial\n03/01/2025,Thais\n"]
+    assert len(df) == 3 and snapshot.carregar_estado()["modo"] == "incremental"
+
+
+def test_outra_assinatura_reprocessa_tudo_em_vez_da_cauda(tmp_path):
+    processar, anexar = Processador(), Anexador()
+    carregar_com_snapshot("http://planilha", processar, SnapshotLocal(str(tmp_path), assinatura="proc-1"),
+                          sessao=SessaoFalsa(), anexar=anexar)
+    novo = SnapshotLocal(str(tmp_path), assinatura="proc-2")
+    sessao = SessaoFalsa(CSV + b"03/01/2025,Thais\n", etag='"v2"')
+
+    df, _ = carregar_com_snapshot("http://planilha", processar, novo, sessao=sessao, anexar=anexar)
+
+    assert processar.chamadas == 2 and anexar.caudas == []
+    assert len(df) == 3 and novo.carregar_estado()["modo"] == "completo"
@@ -0,0 +1,186 @@
+import re
+
+import pandas as pd
+import pytest
+
+from fonte_dados import SnapshotLocal
+import fonte_gspread
+from fonte_gspread import FonteGspread, _hash_linhas, letra_coluna
+from nucleo import anexar_frame, processar_frame
+
+CABECALHO = ["Card", "Data de Conclusão", "Observação", "Comercial/Capitão"]
+LINHAS = [
+    ["C-1", "06/01/2025", "", "Andressa"],
+    ["C-2", "07/01/2025", "urgente", "Rafael"],
+    ["C-3", "08/01/2025", "", "Thais Mendonca"],
+]
+
+
+class AbaFalsa:
+    """Aba com `row_values` e `batch_get(..., major_dimension="COLUMNS")` como a do gspread."""
+
+    def __init__(self, linhas):
+        self.linhas = [CABECALHO] + [list(linha) for linha in linhas]
+        self.pedidos = []
+
+    def row_values(self, numero):
+        return self.linhas[numero - 1]
+
+    def batch_get(self, intervalos, major_dimension="ROWS"):
+        assert major_dimension == "COLUMNS"
+        self.pedidos.append(list(intervalos))
+        blocos = []
+        for intervalo in intervalos:
+            letra, inicio = re.match(r"([A-Z]+)(\d+):", intervalo).groups()
+            coluna = ord(letra) - ord("A")
+            valores = [linha[coluna] if coluna < len(linha) else "" for linha in self.linhas[int(inicio) - 1:]]
+            while valores and valores[-1] == "":   # a API omite as células vazias do fim
+                valores.pop()
+            blocos.append([valores] if valores else [])
+        return blocos
+
+
+class ClienteFalso:
+    def __init__(self, aba):
+        self.aba = aba
+
+    def open_by_key(self, chave):
+        aba = self.aba
+
+        class Planilha:
+            sheet1 = aba
+
+            def worksheet(self, nome):
+                return aba
+
+        return Planilha()
+
+
+class Contador:
+    def __init__(self, funcao):
+        self.funcao = funcao
+        self.chamadas = []
+
+    def __call__(self, bruto, *args):
+        self.chamadas.append(len(bruto))
+        return self.funcao(bruto, *args)
+
+
+@pytest.fixture
+def aba():
+    return AbaFalsa(LINHAS)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return SnapshotLocal(str(tmp_path), "squad", assinatura="proc-1")
+
+
+def carregar(aba, snapshot, processar=None, anexar=None):
+    fonte = FonteGspread("ID", "Cards", cliente=ClienteFalso(aba))
+    processar = processar or Contador(processar_frame)
+    anexar = anexar or Contador(anexar_frame)
+    df, origem = fonte.carregar(processar, snapshot, anexar)
+    return df, origem, processar, anexar
+
+
+def test_letra_coluna():
+    assert [letra_coluna(n) for n in (1, 26, 27, 52, 703)] == ["A", "Z", "AA", "AZ", "AAA"]
+
+
+def test_leitura_completa_busca_so_as_colunas_obrigatorias(aba, snapshot):
+    df, origem, processar, anexar = carregar(aba, snapshot)
+
+    assert origem == "rede"
+    assert aba.pedidos == [["B2:B", "D2:D"]]
+    assert processar.chamadas == [3] and anexar.chamadas == []
+    assert list(df["Comercial_Padronizado"]) == ["Andressa", "Rafael", "Thaís"]
+    estado = snapshot.carregar_estado()
+    assert estado["linhas"] == 3 and estado["modo"] == "completo" and estado["ultima_linha"] == ["08/01/2025", "Thais Mendonca"]
+    assert df.attrs["versao_dados"] == f"{estado['hash']}:proc-1"
+
+
+def test_planilha_sem_mudanca_usa_snapshot(aba, snapshot):
+    carregar(aba, snapshot)
+
+    df, origem, processar, anexar = carregar(aba, snapshot)
+
+    assert origem == "snapshot"
+    assert processar.chamadas == [] and anexar.chamadas == []
+    # Só a última linha conhecida foi pedida, para conferir o histórico
+    assert aba.pedidos[-1] == ["B4:B", "D4:D"]
+    assert len(df) == 3
+
+
+def test_planilha_sem_mudanca_em_leitura_completa_usa_snapshot(aba, snapshot):
+    fonte = FonteGspread("ID", "Cards", cliente=ClienteFalso(aba))
+    fonte.carregar(processar_frame, snapshot)
+    processar = Contador(processar_frame)
+
+    _, origem = fonte.carregar(processar, snapshot)   # sem `anexar`: sempre lê tudo
+
+    assert origem == "snapshot" and processar.chamadas == []
+
+
+def test_linhas_novas_leem_e_processam_so_a_cauda(aba, snapshot):
+    carregar(aba, snapshot)
+    aba.linhas += [["C-4", "09/01/2025", "", "Danilo Neder"], ["C-5", "10/01/2025", "", "Pamela"]]
+
+    df, origem, processar, anexar = carregar(aba, snapshot)
+
+    assert origem == "rede"
+    assert aba.pedidos[-1] == ["B4:B", "D4:D"]
+    assert processar.chamadas == [] and anexar.chamadas == [2]
+    assert list(df["Comercial_Padronizado"]) == ["Andressa", "Rafael", "Thaís", "Danilo", "Pamela"]
+    estado = snapshot.carregar_estado()
+    assert estado["linhas"] == 5 and estado["modo"] == "incremental"
+
+    # Igual a uma leitura completa da mesma aba
+    completo, _, _, _ = carregar(AbaFalsa(aba.linhas[1:]), SnapshotLocal(snapshot.diretorio, "outra", "proc-1"))
+    pd.testing.assert_frame_equal(df[completo.columns].astype(str), completo.astype(str))
+
+
+def test_hash_incremental_igual_ao_completo():
+    bruto = pd.DataFrame(LINHAS, columns=CABECALHO)
+    parcial = _hash_linhas(bruto.iloc[:2])
+    assert _hash_linhas(bruto.iloc[2:].reset_index(drop=True), 2, parcial) == _hash_linhas(bruto)
+    # Ordem e conteúdo entram no hash
+    assert _hash_linhas(bruto.iloc[[1, 0, 2]]) != _hash_linhas(bruto)
+    assert _hash_linhas(bruto.replace("Rafael", "Rafaela")) != _hash_linhas(bruto)
+
+
+def test_releitura_completa_apos_incremental_sem_mudanca_usa_snapshot(aba, snapshot, monkeypatch):
+    carregar(aba, snapshot)
+    aba.linhas.append(["C-4", "09/01/2025", "", "Danilo Neder"])
+    _, origem, _, anexar = carregar(aba, snapshot)
+    assert origem == "rede" and anexar.chamadas == [1]
+
+    # Vence o prazo da releitura completa: a aba inteira é lida, mas nada mudou
+    monkeypatch.setattr(fonte_gspread, "RELEITURA_COMPLETA", -1)
+    df, origem, processar, anexar = carregar(aba, snapshot)
+
+    assert aba.pedidos[-1] == ["B2:B", "D2:D"]
+    assert origem == "snapshot" and processar.chamadas == [] and anexar.chamadas == []
+    assert len(df) == 4
+
+
+def test_historico_editado_rele_tudo(aba, snapshot):
+    carregar(aba, snapshot)
+    aba.linhas[3][3] = "Natalie"   # última linha conhecida mudou
+    aba.linhas.append(["C-4", "09/01/2025", "", "Danilo"])
+
+    df, origem, processar, anexar = carregar(aba, snapshot)
+
+    assert origem == "rede" and processar.chamadas == [4] and anexar.chamadas == []
+    assert aba.pedidos[-1] == ["B2:B", "D2:D"]
+    assert list(df["Comercial_Padronizado"]) == ["Andressa", "Rafael", "Natalie", "Danilo"]
+
+
+def test_outra_assinatura_reprocessa_tudo(aba, snapshot):
+    carregar(aba, snapshot)
+    novo = SnapshotLocal(snapshot.diretorio, "squad", assinatura="proc-2")
+
+    _, origem, processar, anexar = carregar(aba, novo)
+
+    assert origem == "rede" and processar.chamadas == [3] and anexar.chamadas == []
+    assert novo.carregar_estado()["assinatura"] == "proc-2"
@@ -0,0 +1,51 @@
+from ingestao import resolver_colunas
+
+
+def test_colunas_exatas():
+    avisos = []
+    assert resolver_colunas(["Card", "Data de Conclusão", "Comercial/Capitão"], avisos) == {
+        "Data de Conclusão": "Data de Conclusão", "Comercial/Capitão": "Comercial/Capitão"}
+    assert avisos == []
+
+
+def test_cabecalho_vazio_nao_casa_com_nenhuma_coluna():
+    mapeamento = resolver_colunas(["Card", "", "Data de Conclusão", "Comercial"], [])
+    assert mapeamento == {"Data de Conclusão": "Data de Conclusão", "Comercial/Capitão": "Comercial"}
+
+    assert resolver_colunas(["", "  ", "Data de Conclusão"], []) == {"Data de Conclusão": "Data de Conclusão"}
+
+
+def test_exata_tem_prioridade_sobre_parecida():
+    # "Data" casaria com "Data de Conclusão" por substring, mas a coluna exata existe
+    mapeamento = resolver_colunas(["Data", "Data de Conclusão", "Comercial"], [])
+    assert mapeamento["Data de Conclusão"] == "Data de Conclusão"
+
+
+def test_uma_coluna_real_para_cada_obrigatoria():
+    # A coluna contém os nomes das duas obrigatórias, mas só pode ser usada por uma delas
+    mapeamento = resolver_colunas(["Comercial/Capitão/Data de Conclusão"], [])
+    assert list(mapeamento.values()) == ["Comercial/Capitão/Data de Conclusão"]
+
+
+def test_leitura_em_blocos_igual_a_completa(monkeypatch):
+    import pandas as pd
+
+    import nucleo
+    from sintetico import gerar_csv
+
+    conteudo = gerar_csv(3000)
+    completo = nucleo.processar_csv(conteudo)
+    em_blocos = nucleo.processar_csv_em_blocos(conteudo, tamanho_bloco=250)
+
+    pd.testing.assert_frame_equal(nucleo.compactar_frame(completo), nucleo.compactar_frame(em_blocos),
+                                  check_categorical=False)
+    for chave in ("linhas_lidas", "datas_invalidas", "resolucao_nomes"):
+        assert em_blocos.attrs[chave] == completo.attrs[chave]
+    assert set(em_blocos.attrs["avisos"]) == set(map(tuple, completo.attrs["avisos"]))
+
+    # Acima do limiar, processar_csv segue pelo caminho em blocos
+    chamadas = []
+    monkeypatch.setattr(nucleo, "LIMIAR_BLOCOS", len(conteudo) - 1)
+    monkeypatch.setattr(nucleo, "processar_csv_em_blocos", lambda c: chamadas.append(c) or completo)
+    nucleo.processar_csv(conteudo)
+    assert chamadas == [conteudo]
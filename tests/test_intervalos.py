@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from intervalos import IndiceDatas, intervalo_do_atalho, semana_iso
+from metas import MatrizMetas
+from nucleo import semanas_iso
+
+COMERCIAIS = ["Ana Clara", "Danilo", "Werbet"]
+
+
+def frame(n=400, seed=1, ordenado=True):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Data de Conclusão": pd.Timestamp("2024-12-01") + pd.to_timedelta(rng.integers(0, 120, n), unit="D"),
+        "Comercial_Padronizado": np.array(COMERCIAIS, dtype=object)[rng.integers(0, len(COMERCIAIS), n)],
+    })
+    return df.sort_values("Data de Conclusão", kind="stable", ignore_index=True) if ordenado else df
+
+
+def test_realizado_por_comercial_igual_ao_filtro_por_mascara():
+    for ordenado in (True, False):
+        df = frame(ordenado=ordenado)
+        indice = IndiceDatas.construir(df)
+        for inicio, fim in [("2024-12-01", "2025-03-30"), ("2024-12-30", "2025-01-05"), ("2025-02-10", "2025-02-10"),
+                            ("2023-01-01", "2023-12-31"), ("2025-02-10", "2025-02-01")]:
+            dentro = df[df["Data de Conclusão"].between(inicio, fim)]
+            esperado = dentro.groupby("Comercial_Padronizado").size().reindex(COMERCIAIS, fill_value=0)
+            obtido = indice.realizado_por_comercial(inicio, fim)
+            assert obtido.to_dict() == esperado.to_dict()
+
+
+def test_realizado_por_dia_igual_ao_groupby():
+    df = frame()
+    indice = IndiceDatas.construir(df)
+    inicio, fim = "2025-01-06", "2025-02-16"
+    dias = pd.date_range(inicio, fim)
+    for comerciais in (None, ["Danilo"], ["Werbet", "Ana Clara", "Desconhecido"]):
+        dentro = df if comerciais is None else df[df["Comercial_Padronizado"].isin(comerciais)]
+        esperado = dentro.groupby("Data de Conclusão").size().reindex(dias, fill_value=0).to_numpy()
+        assert np.array_equal(indice.realizado_por_dia(inicio, fim, comerciais), esperado)
+
+
+def test_semana_iso_igual_ao_isocalendar():
+    dias = pd.date_range("2020-12-25", "2027-01-10")
+    calendario = dias.isocalendar()
+    esperado = [f"{a}-W{s:02d}" for a, s in zip(calendario["year"], calendario["week"])]
+    assert semana_iso(dias.to_numpy().astype("datetime64[D]")).tolist() == esperado
+
+
+def test_atalhos_de_semana():
+    quarta = np.datetime64("2025-01-08")
+    assert intervalo_do_atalho("Semana atual", quarta) == (np.datetime64("2025-01-06"), quarta)
+    assert intervalo_do_atalho("Semana anterior", quarta) == (np.datetime64("2024-12-30"), np.datetime64("2025-01-05"))
+    assert intervalo_do_atalho("Últimos 7 dias", quarta)[0] == np.datetime64("2025-01-02")
+    assert intervalo_do_atalho("Personalizado", quarta) is None
+
+
+def test_semanas_iso_sem_variacao_em_semanas_parciais():
+    df = frame(2000)
+    indice = IndiceDatas.construir(df)
+    padrao = np.full((12, len(COMERCIAIS)), 20)
+    metas = MatrizMetas(COMERCIAIS, padrao)
+    # Quinta-feira a terça-feira: a primeira e a última semana ficam cortadas
+    inicio, fim = "2025-01-02", "2025-02-11"
+    semanas = semanas_iso(indice, metas, inicio, fim)
+
+    dentro = df[df["Data de Conclusão"].between(inicio, fim)]
+    calendario = dentro["Data de Conclusão"].dt.isocalendar()
+    rotulos = calendario["year"].astype(str) + "-W" + calendario["week"].map("{:02d}".format)
+    esperado = dentro.groupby(rotulos).size()
+    assert semanas.set_index("Semana")["Realizado"].to_dict() == esperado.to_dict()
+    assert semanas["Dias"].tolist() == [4, 7, 7, 7, 7, 7, 2]
+
+    variacao = semanas["Variação Semanal (%)"]
+    assert variacao.iloc[[0, 1, -1]].isna().all()   # parcial, depois de parcial, parcial
+    realizado = semanas["Realizado"].to_numpy()
+    for i in range(2, len(semanas) - 1):
+        assert variacao.iloc[i] == round((realizado[i] / realizado[i - 1] - 1) * 100, 1)
+
+    # Meta semanal = soma das metas diárias (arredondada a 0,1 por semana)
+    assert abs(semanas["Meta"].sum() - metas.meta_diaria(inicio, fim)[1].sum()) <= 0.05 * len(semanas)
+
+
+def test_semanas_iso_intervalo_vazio():
+    indice = IndiceDatas.construir(frame())
+    metas = MatrizMetas(COMERCIAIS, np.zeros((12, len(COMERCIAIS))))
+    assert semanas_iso(indice, metas, "2025-02-10", "2025-02-01").empty
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cubo import MESES, CuboContagens
+from datas import adicionar_periodo
+from metas import MatrizMetas, tabela_atingimento
+
+CONFIG = {
+    "versao": 1,
+    "padrao": {"Janeiro": {"Ana Clara": 10, "Danilo": 8}, "Fevereiro": {"Ana Clara": 12}},
+    "por_ano": {"2025": {"Janeiro": {"Danilo": 20, "Thaís": 5}}},
+}
+
+
+def meta_laco(config, ano, mes, comercial):
+    """Regra do metas.json sem arrays: o ano sobrescreve o padrão mês a mês, comercial a comercial."""
+    valor = config["padrao"].get(mes, {}).get(comercial, 0)
+    return config["por_ano"].get(str(ano), {}).get(mes, {}).get(comercial, valor)
+
+
+def test_matriz_igual_ao_laco_sobre_a_config():
+    metas = MatrizMetas.de_config(CONFIG)
+    assert list(metas.comerciais) == ["Ana Clara", "Danilo", "Thaís"]
+    for ano in (2024, 2025):
+        matriz = metas.matriz_ano(ano)
+        assert matriz.shape == (12, 3)
+        for i, mes in enumerate(MESES):
+            for j, comercial in enumerate(metas.comerciais):
+                assert matriz[i, j] == meta_laco(CONFIG, ano, mes, comercial)
+
+    serie = metas.meta_por_comercial(2025, ["Janeiro", "Fevereiro", "Inexistente"])
+    assert serie.to_dict() == {"Ana Clara": 22, "Danilo": 20, "Thaís": 5}
+
+
+def test_config_invalida():
+    with pytest.raises(ValueError, match="Versão"):
+        MatrizMetas.de_config({"versao": 9})
+    with pytest.raises(ValueError, match="Meses inválidos"):
+        MatrizMetas.de_config({"versao": 1, "padrao": {"Janeiroo": {"Danilo": 1}}})
+
+
+def test_meta_diaria_reparte_pelos_dias_uteis():
+    metas = MatrizMetas.de_config(CONFIG)
+    feriados = ("2025-01-01",)
+    dias, diaria = metas.meta_diaria("2024-12-30", "2025-02-28", feriados)
+    assert len(dias) == len(diaria) == 61
+    for d, linha in zip(pd.DatetimeIndex(dias), diaria):
+        inicio = np.datetime64(d.strftime("%Y-%m-01"))
+        fim = (inicio.astype("datetime64[M]") + 1).astype("datetime64[D]")
+        uteis = np.busday_count(inicio, fim, holidays=feriados)
+        util = np.is_busday(np.datetime64(d.date()), holidays=feriados)
+        for j, comercial in enumerate(metas.comerciais):
+            esperado = meta_laco(CONFIG, d.year, MESES[d.month - 1], comercial) / uteis if util else 0.0
+            assert np.isclose(linha[j], esperado)
+
+    # O mês inteiro devolve a meta cheia
+    proporcional = metas.meta_proporcional("2025-01-01", "2025-01-31", feriados)
+    assert np.allclose(proporcional.to_numpy(), metas.matriz_ano(2025)[0])
+
+
+def test_tabela_atingimento_igual_ao_groupby():
+    metas = MatrizMetas.de_config(CONFIG)
+    df = adicionar_periodo(pd.DataFrame({
+        "Data de Conclusão": pd.to_datetime(["2025-01-05", "2025-01-06", "2025-02-01", "2025-01-09", "2024-01-03"]),
+        "Comercial_Padronizado": ["Ana Clara", "Ana Clara", "Ana Clara", "Werbet", "Danilo"],
+    }))
+    tabela = tabela_atingimento(CuboContagens.construir(df), metas, 2025, ["Janeiro"]).set_index("Comercial_Padronizado")
+
+    realizado = df[(df["Ano"] == 2025) & (df["Mês"] == "Janeiro")].groupby("Comercial_Padronizado").size()
+    for comercial in ["Ana Clara", "Danilo", "Thaís", "Werbet"]:
+        r, m = realizado.get(comercial, 0), meta_laco(CONFIG, 2025, "Janeiro", comercial)
+        assert tabela.loc[comercial, "Realizado"] == r and tabela.loc[comercial, "Meta"] == m
+        assert tabela.loc[comercial, "Diferença"] == r - m
+        np.testing.assert_equal(tabela.loc[comercial, "Atingimento (%)"], round(r / m * 100, 2) if m else np.nan)
+    # Maior atingimento primeiro, sem meta (NaN) no fim
+    assert list(tabela.index) == ["Ana Clara", "Danilo", "Thaís", "Werbet"]
+    filtrada = tabela_atingimento(CuboContagens.construir(df), metas, 2025, ["Janeiro"], ["Werbet"])
+    assert filtrada["Comercial_Padronizado"].tolist() == ["Werbet"]
@@ -0,0 +1,56 @@
+import json
+import os
+
+import pandas as pd
+
+from normalizacao import DecisoesAproximadas, resolver_nomes
+
+MAPEAMENTO = {"Natalie": "Natalie", "Danilo Neder": "Danilo"}
+
+
+def editar(caminho, **campos):
+    with open(caminho, encoding="utf-8") as f:
+        salvo = json.load(f)
+    salvo.update(campos)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(salvo, f)
+    # Garante mtime diferente mesmo em sistemas de arquivos com pouca resolução
+    os.utime(caminho, ns=(os.stat(caminho).st_atime_ns, os.stat(caminho).st_mtime_ns + 10**9))
+
+
+def test_aproximacao_rejeitada_fica_sem_resolver(tmp_path):
+    caminho = str(tmp_path / "nomes_aproximados.json")
+    decisoes = DecisoesAproximadas(caminho)
+    serie = pd.Series(["Natalia", "Danillo Neder", "Natalie"])
+
+    nomes, por_metodo, aproximados = resolver_nomes(serie, MAPEAMENTO, decisoes)
+    assert aproximados == {"Natalia": "Natalie", "Danillo Neder": "Danilo"}
+    assert por_metodo["aproximado"] == 2
+
+    editar(caminho, rejeitados=["Natalia"])
+    nomes, por_metodo, aproximados = resolver_nomes(serie, MAPEAMENTO, decisoes)
+    assert nomes.tolist() == ["Natalia", "Danilo", "Natalie"]
+    assert aproximados == {"Danillo Neder": "Danilo"}
+    assert por_metodo["nao_resolvido"] == 1
+
+    # Outro processo (instância nova) também respeita a rejeição, e gravar decisões novas a preserva
+    outro = DecisoesAproximadas(caminho)
+    resolver_nomes(pd.Series(["Natalia", "Natali"]), MAPEAMENTO, outro)
+    with open(caminho, encoding="utf-8") as f:
+        salvo = json.load(f)
+    assert salvo["rejeitados"] == ["Natalia"]
+    assert salvo["decisoes"]["Natali"] == "Natalie"
+    assert "Natalia" in salvo["decisoes"]   # a decisão antiga continua lá, mas a rejeição vence
+
+
+def test_rejeitados_entram_na_assinatura_do_processamento(tmp_path):
+    from nucleo import assinatura_processamento
+
+    caminho = str(tmp_path / "nomes_aproximados.json")
+    decisoes = DecisoesAproximadas(caminho)
+    resolver_nomes(pd.Series(["Natalia"]), MAPEAMENTO, decisoes)
+    antes = assinatura_processamento(MAPEAMENTO, decisoes)
+    assert assinatura_processamento(MAPEAMENTO, decisoes) == antes
+
+    editar(caminho, rejeitados=["Natalia"])
+    assert assinatura_processamento(MAPEAMENTO, decisoes) != antes
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from ritmo import RitmoDiario
+
+COMERCIAIS = ["Ana Clara", "Danilo", "Werbet"]
+FERIADOS = ("2025-03-03", "2025-03-04")
+REFERENCIA = np.datetime64("2025-03-12")
+
+
+def frame(n=600, seed=2):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Data de Conclusão": pd.Timestamp("2024-11-15") + pd.to_timedelta(rng.integers(0, 140, n), unit="D"),
+        "Comercial_Padronizado": np.array(COMERCIAIS, dtype=object)[rng.integers(0, len(COMERCIAIS), n)],
+    })
+
+
+def referencia_projecao(df, ano, mes, comercial, data_referencia, feriados=FERIADOS):
+    """Laço direto: conclusões no mês até a data e regra de três pelos dias úteis."""
+    inicio = np.datetime64(f"{ano}-{mes:02d}-01")
+    fim = (inicio.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    datas = df.loc[df["Comercial_Padronizado"] == comercial, "Data de Conclusão"].to_numpy().astype("datetime64[D]")
+    realizado = int(((datas >= inicio) & (datas < fim) & (datas <= data_referencia)).sum())
+    total = np.busday_count(inicio, fim, holidays=feriados)
+    decorridos = np.busday_count(inicio, min(max(data_referencia + 1, inicio), fim), holidays=feriados)
+    return realizado, realizado * total / decorridos if decorridos else float(realizado)
+
+
+def test_acumulado_no_mes_igual_ao_groupby():
+    df = frame()
+    ritmo = RitmoDiario.construir(df, feriados=FERIADOS)
+    diarias = (df.groupby(["Data de Conclusão", "Comercial_Padronizado"]).size().unstack(fill_value=0)
+               .reindex(index=pd.DatetimeIndex(ritmo.dias), columns=COMERCIAIS, fill_value=0))
+    esperado = diarias.groupby(diarias.index.to_period("M")).cumsum()
+    assert ritmo.dias[0] == np.datetime64("2024-01-01") and ritmo.dias[-1] == np.datetime64("2025-12-31")
+    assert np.array_equal(ritmo.diarias, diarias.to_numpy())
+    assert np.array_equal(ritmo.acumuladas, esperado.to_numpy())
+
+
+def test_projecao_igual_ao_laco():
+    df = frame()
+    ritmo = RitmoDiario.construir(df, feriados=FERIADOS)
+    realizado, projetado = ritmo.projecao([2024, 2025], REFERENCIA)
+    for i, ano in enumerate([2024, 2025]):
+        for mes in range(1, 13):
+            for j, comercial in enumerate(ritmo.comerciais):
+                esperado_realizado, esperado_projetado = referencia_projecao(df, ano, mes, comercial, REFERENCIA)
+                assert realizado[i, mes - 1, j] == esperado_realizado
+                assert np.isclose(projetado[i, mes - 1, j], esperado_projetado)
+
+    # Feriados reduzem os dias úteis decorridos de março e, com isso, aumentam a projeção
+    _, sem_feriados = RitmoDiario.construir(df, feriados=()).projecao([2025], REFERENCIA)
+    assert (projetado[1, 2] >= sem_feriados[0, 2]).all() and (projetado[1, 2] > sem_feriados[0, 2]).any()
+
+
+def test_projecao_por_comercial_soma_os_meses():
+    df = frame()
+    ritmo = RitmoDiario.construir(df, feriados=FERIADOS)
+    serie = ritmo.projecao_por_comercial(2025, ["Fevereiro", "Março"], REFERENCIA)
+    for comercial in COMERCIAIS:
+        esperado = sum(referencia_projecao(df, 2025, mes, comercial, REFERENCIA)[1] for mes in (2, 3))
+        assert np.isclose(serie[comercial], esperado)
+
+
+def test_burnup_igual_ao_acumulado_sobre_a_meta():
+    df = frame()
+    ritmo = RitmoDiario.construir(df, feriados=FERIADOS)
+    metas = pd.Series({"Ana Clara": 20, "Danilo": 0, "Werbet": 10})
+    longo = ritmo.burnup(2025, "Março", metas, REFERENCIA)
+
+    # Danilo (meta zero) fica de fora; um ponto por dia até a data de referência
+    assert set(longo["Comercial"]) == {"Ana Clara", "Werbet", "Ritmo ideal"}
+    marco = df[(df["Data de Conclusão"] >= "2025-03-01") & (df["Data de Conclusão"] <= "2025-03-12")]
+    for comercial in ("Ana Clara", "Werbet"):
+        diario = (marco[marco["Comercial_Padronizado"] == comercial].groupby("Data de Conclusão").size()
+                  .reindex(pd.date_range("2025-03-01", "2025-03-12"), fill_value=0))
+        obtido = longo[longo["Comercial"] == comercial].set_index("Dia")["Acumulado (%)"]
+        assert np.allclose(obtido.to_numpy(), (diario.cumsum() / metas[comercial] * 100).round(1).to_numpy())
+
+    ideal = longo[longo["Comercial"] == "Ritmo ideal"]["Acumulado (%)"].to_numpy()
+    uteis_marco = np.busday_count("2025-03-01", "2025-04-01", holidays=FERIADOS)
+    assert ideal[-1] == round(np.busday_count("2025-03-01", "2025-03-13", holidays=FERIADOS) / uteis_marco * 100, 1)
+    assert ritmo.burnup(2025, "Abril", metas, REFERENCIA).empty
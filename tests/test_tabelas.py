@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from tabelas import fatiar_pagina, ordem_linhas
+
+DF = pd.DataFrame({
+    "Data de Conclusão": pd.to_datetime(["2025-01-02", "2025-01-05", "2025-01-05", "2025-02-01"]),
+    "Comercial_Padronizado": ["Werbet", "Pamela", None, "Ana Clara"],
+})
+
+
+def test_ordem_por_data_nos_dois_sentidos():
+    assert ordem_linhas(DF).tolist() == [0, 1, 2, 3]
+    assert ordem_linhas(DF, crescente=False).tolist() == [3, 2, 1, 0]
+    recorte, _, _ = fatiar_pagina(DF, ordem_linhas(DF, crescente=False), 1, 2)
+    assert recorte["Data de Conclusão"].iloc[0] == DF["Data de Conclusão"].max()
+
+
+def test_ordem_por_coluna_igual_ao_sort_values():
+    for crescente in (True, False):
+        esperado = DF.reset_index(drop=True).sort_values(
+            "Comercial_Padronizado", ascending=crescente, kind="stable", na_position="last").index
+        assert np.array_equal(ordem_linhas(DF, "Comercial_Padronizado", crescente), esperado)
+    # Vazios no fim nos dois sentidos
+    assert ordem_linhas(DF, "Comercial_Padronizado", False)[-1] == 2